@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência (p50/p99) de pedidos leves no servidor XML-RPC enquanto decorrem conversões CSV pesadas
+Uso: python bench_concurrency.py [--url URL] [--duration S] [--clients N] [--heavy H] [--csv-rows R]
+
+Comparar o servidor single-threaded (XMLRPC_WORKERS=0) com o servidor concorrente
+(XMLRPC_WORKERS=16, opcionalmente com CPU_POOL_WORKERS=4).
+"""
+
+import argparse
+import random
+import threading
+import time
+import xmlrpc.client
+
+
+def make_csv(rows):
+    """Gera um CSV de teste com o formato do dataset Sales"""
+    lines = ["date,country,product,quantity,revenue"]
+    for i in range(rows):
+        lines.append(f"2024-01-{i % 28 + 1:02d},Country{i % 7},Product {i % 50},{i % 9 + 1},{i * 1.25:.2f}")
+    return "\n".join(lines)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def heavy_worker(url, csv_content, stop, counters, lock):
+    """Converte CSV para XML continuamente (pedido pesado)"""
+    server = xmlrpc.client.ServerProxy(url)
+    while not stop.is_set():
+        try:
+            server.convert_csv_to_xml(csv_content)
+            with lock:
+                counters['heavy'] += 1
+        except Exception:
+            with lock:
+                counters['errors'] += 1
+
+
+def light_worker(url, xml_id, stop, latencies, counters, lock):
+    """Executa pedidos leves (ping, listagem, XPath) e regista a latência de cada um"""
+    server = xmlrpc.client.ServerProxy(url)
+    calls = {
+        'ping': lambda: server.ping(),
+        'list_xml_files': lambda: server.list_xml_files({'page_size': 20}),
+        'query_xml_xpath': lambda: server.query_xml_xpath(xml_id, "//record[1]/name/text()")
+    }
+    while not stop.is_set():
+        name = random.choice(list(calls))
+        start = time.perf_counter()
+        try:
+            calls[name]()
+        except Exception:
+            with lock:
+                counters['errors'] += 1
+            continue
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.setdefault(name, []).append(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência do servidor XML-RPC")
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--heavy', type=int, default=2)
+    parser.add_argument('--csv-rows', type=int, default=50000)
+    args = parser.parse_args()
+    
+    server = xmlrpc.client.ServerProxy(args.url)
+    status = server.get_server_status()
+    xml_id = server.store_xml(
+        "bench_concurrency.xml",
+        "<dataset>" + "".join(f"<record><name>item {i}</name></record>" for i in range(100)) + "</dataset>"
+    )['xml_id']
+    csv_content = make_csv(args.csv_rows)
+    
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies = {}
+    counters = {'heavy': 0, 'errors': 0}
+    
+    threads = [
+        threading.Thread(target=heavy_worker, args=(args.url, csv_content, stop, counters, lock))
+        for _ in range(args.heavy)
+    ] + [
+        threading.Thread(target=light_worker, args=(args.url, xml_id, stop, latencies, counters, lock))
+        for _ in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    print(f"Servidor: {args.url} | Armazenamento: {status.get('storage')}")
+    print(f"Duração: {args.duration:.0f}s | Clientes leves: {args.clients} | Conversões CSV em paralelo: {args.heavy} ({args.csv_rows} linhas)")
+    print(f"{'Método':<18}{'pedidos':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    
+    all_latencies = []
+    for name, values in sorted(latencies.items()):
+        all_latencies.extend(values)
+        print(f"{name:<18}{len(values):>10}{percentile(values, 0.5) * 1000:>12.1f}{percentile(values, 0.99) * 1000:>12.1f}")
+    print(f"{'total':<18}{len(all_latencies):>10}{percentile(all_latencies, 0.5) * 1000:>12.1f}{percentile(all_latencies, 0.99) * 1000:>12.1f}")
+    print(f"Conversões CSV concluídas: {counters['heavy']} | Erros: {counters['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tempo e memória por pedido do XMLConverter consoante o tipo de entrada
+Uso: python bench_converter_inputs.py [--records R] [--repeat N] [--methods validate_xml,xml_to_json,...]
+
+O documento é gravado num ficheiro temporário e entregue ao conversor como:
+- str: lido como texto (como antes, o chamador materializava o documento inteiro)
+- bytes: lido em binário
+- mmap: ficheiro mapeado em memória (backend filesystem, cache local de GridFS)
+- stream: ficheiro aberto, lido pelo lxml em blocos (como um GridOut)
+- chunks: iterador de blocos de 1MB entregues ao XMLParser.feed
+
+A memória é o pico de alocações Python (tracemalloc) durante o pedido, ou seja, as
+cópias do conteúdo; a árvore do lxml é igual em todos os casos e não entra na medição.
+"""
+
+import argparse
+import mmap
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Adicionar pasta server ao path para importar o conversor
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+import logging
+logging.disable(logging.INFO)
+
+from xml_converter import XMLConverter
+from bench_grpc_cores import make_document
+
+CHUNK_SIZE = 1024 * 1024  # 1MB em bytes
+
+METHOD_ARGS = {
+    'validate_xml': (),
+    'xml_to_json': (),
+    'query_xml_xpath': ("sum(//record[country='Country3']/revenue)",),
+    'generate_xsd_from_xml': ()
+}
+
+
+def open_input(kind, path, resources):
+    """Abre o documento no formato pedido (os recursos abertos ficam em resources para fechar no fim)"""
+    if kind == 'str':
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    if kind == 'bytes':
+        with open(path, 'rb') as f:
+            return f.read()
+    f = open(path, 'rb')
+    resources.append(f)
+    if kind == 'mmap':
+        source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        resources.append(source)
+        return source
+    if kind == 'stream':
+        return f
+    return iter(lambda: f.read(CHUNK_SIZE), b'')
+
+
+def measure(converter, method, kind, path, repeat):
+    """Devolve (mediana do tempo em ms, pico de memória em MB) de abrir + converter"""
+    times = []
+    peaks = []
+    for _ in range(repeat):
+        resources = []
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            source = open_input(kind, path, resources)
+            success, result = getattr(converter, method)(source, *METHOD_ARGS[method])
+            if not success:
+                raise RuntimeError(result)
+            times.append(time.perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+            for resource in reversed(resources):
+                resource.close()
+    return statistics.median(times) * 1000, max(peaks) / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do XMLConverter com entradas str, bytes, mmap e streams")
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--methods', default='validate_xml,query_xml_xpath,generate_xsd_from_xml')
+    parser.add_argument('--kinds', default='str,bytes,mmap,stream,chunks')
+    args = parser.parse_args()
+    
+    converter = XMLConverter()
+    with tempfile.NamedTemporaryFile('w', suffix='.xml', encoding='utf-8', delete=False) as f:
+        f.write(make_document(args.records))
+        path = f.name
+    
+    try:
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"Documento: {args.records} registos ({size_mb:.1f} MB) | Repetições: {args.repeat}")
+        print(f"{'método':>22}{'entrada':>9}{'tempo (ms)':>13}{'memória (MB)':>15}")
+        for method in args.methods.split(','):
+            for kind in args.kinds.split(','):
+                elapsed, peak = measure(converter, method, kind, path, args.repeat)
+                print(f"{method:>22}{kind:>9}{elapsed:>13.1f}{peak:>15.1f}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: throughput do servidor gRPC em operações CPU (XPath, JSON, validação) vs número de processos
+Uso: python bench_grpc_cores.py [--mode pool|prefork|both] [--processes 0,1,2,4] [--clients N] [--duration S] [--records R]
+
+Para cada valor arranca um servidor gRPC próprio (porta --port, backend filesystem):
+- pool: um servidor com CPU_POOL_WORKERS=<valor> (pool de processos para as conversões)
+- prefork: grpc_server.py --workers <valor> (vários servidores na mesma porta com SO_REUSEPORT)
+Em ambos os modos 0 corresponde ao servidor só com threads.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server')
+
+# Adicionar pasta server ao path para importar protobuf
+sys.path.insert(0, SERVER_DIR)
+
+import grpc
+import xml_service_pb2 as pb2
+import xml_service_pb2_grpc as pb2_grpc
+
+
+def make_document(records):
+    """Gera um documento XML com o formato do dataset Sales"""
+    rows = "".join(
+        f"<record><country>Country{i % 7}</country><product>Product {i % 50}</product>"
+        f"<quantity>{i % 9 + 1}</quantity><revenue>{i * 1.25:.2f}</revenue></record>"
+        for i in range(records)
+    )
+    return f"<dataset>{rows}</dataset>"
+
+
+def start_server(port, storage_path, env_overrides, workers=1, script='grpc_server.py'):
+    env = dict(
+        os.environ,
+        STORAGE_BACKEND='filesystem',
+        STORAGE_PATH=storage_path,
+        GRPC_PORT=str(port),
+        XML_CACHE_ENABLED='false',
+        **env_overrides
+    )
+    process = subprocess.Popen(
+        [sys.executable, script] + (['--workers', str(workers)] if workers > 1 else []),
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    channel = grpc.insecure_channel(f'localhost:{port}')
+    grpc.channel_ready_future(channel).result(timeout=60)
+    if workers > 1:
+        # O primeiro processo já aceita conexões; dá tempo aos restantes para fazerem bind
+        time.sleep(2)
+    return process, channel
+
+
+def stop_server(process, channel):
+    channel.close()
+    process.send_signal(signal.SIGTERM)
+    process.wait(timeout=30)
+
+
+def run_load(port, xml_id, clients, duration):
+    """Clientes em paralelo alternam XPath, conversão para JSON e validação - devolve pedidos/s
+    
+    Cada cliente abre a sua própria conexão, para que o kernel a possa atribuir a
+    qualquer um dos processos no modo prefork.
+    """
+    requests = [
+        ('QueryXPath', pb2.XPathRequest(xml_id=xml_id, expression="sum(//record[country='Country3']/revenue)")),
+        ('ConvertToJSON', pb2.ConvertToJSONRequest(xml_id=xml_id)),
+        ('ValidateXML', pb2.ValidateXMLRequest(xml_id=xml_id))
+    ]
+    stop = threading.Event()
+    completed = [0] * clients
+    
+    def client(index):
+        channel = grpc.insecure_channel(f'localhost:{port}', options=[('grpc.use_local_subchannel_pool', 1)])
+        stub = pb2_grpc.XMLServiceStub(channel)
+        try:
+            while not stop.is_set():
+                method, request = requests[(completed[index] + index) % len(requests)]
+                response = getattr(stub, method)(request)
+                if not response.success:
+                    raise RuntimeError(response.message)
+                completed[index] += 1
+        finally:
+            channel.close()
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(completed) / duration
+
+
+def main():
+    default_processes = sorted({0, 1, 2, 4, os.cpu_count() or 1})
+    parser = argparse.ArgumentParser(description="Benchmark de throughput gRPC vs número de processos")
+    parser.add_argument('--mode', choices=('pool', 'prefork', 'both'), default='both')
+    parser.add_argument('--processes', default=','.join(str(n) for n in default_processes))
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--port', type=int, default=50061)
+    args = parser.parse_args()
+    
+    storage_path = tempfile.mkdtemp(prefix='bench_grpc_')
+    document = make_document(args.records)
+    modes = ('pool', 'prefork') if args.mode == 'both' else (args.mode,)
+    xml_id = None
+    baseline = None
+    
+    print(f"CPUs: {os.cpu_count()} | Clientes: {args.clients} | Duração: {args.duration:.0f}s | Registos: {args.records}")
+    print(f"{'modo':>8}{'processos':>11}{'pedidos/s':>12}{'speedup':>10}")
+    
+    for mode in modes:
+        for processes in (int(value) for value in args.processes.split(',')):
+            if mode == 'pool':
+                env_overrides, workers = {'CPU_POOL_WORKERS': str(processes)}, 1
+            else:
+                env_overrides, workers = {'CPU_POOL_WORKERS': '0'}, max(processes, 1)
+            env_overrides['GRPC_WORKERS'] = str(args.clients)
+            
+            process, channel = start_server(args.port, storage_path, env_overrides, workers)
+            try:
+                if xml_id is None:
+                    # O backend filesystem mantém o documento entre servidores
+                    stub = pb2_grpc.XMLServiceStub(channel)
+                    xml_id = stub.StoreXML(pb2.StoreXMLRequest(filename='bench.xml', xml_content=document)).xml_id
+                throughput = run_load(args.port, xml_id, args.clients, args.duration)
+            finally:
+                stop_server(process, channel)
+            
+            # A referência (speedup 1x) é o servidor só com threads da primeira medição
+            baseline = baseline or throughput
+            print(f"{mode:>8}{processes:>11}{throughput:>12.1f}{throughput / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência de Ping nos servidores gRPC síncrono e asyncio enquanto muitos clientes enviam XML lentamente
+Uso: python bench_grpc_slow_clients.py [--server sync|aio|both] [--clients N] [--chunks C] [--delay S] [--duration S]
+
+Cada cliente lento faz StoreXMLStream com --chunks blocos separados por --delay segundos.
+O servidor síncrono ocupa uma thread por upload em curso; o servidor asyncio
+(grpc_aio_server.py) só ocupa uma thread depois de o upload terminar.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import grpc
+
+from bench_grpc_cores import start_server, stop_server, pb2, pb2_grpc
+
+SERVERS = {
+    'sync': 'grpc_server.py',
+    'aio': 'grpc_aio_server.py'
+}
+
+# Clientes lentos por conexão
+CLIENTS_PER_CHANNEL = 100
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def slow_upload(stub, index, chunks, delay, stop, counters):
+    """Envia um documento pequeno em blocos, esperando entre cada um"""
+    async def request_chunks():
+        yield pb2.XMLChunk(filename=f'slow_{index}.xml', data=b'<dataset>')
+        for i in range(chunks):
+            await asyncio.sleep(delay)
+            yield pb2.XMLChunk(data=f'<record><id>{i}</id></record>'.encode())
+        yield pb2.XMLChunk(data=b'</dataset>')
+    
+    while not stop.is_set():
+        try:
+            response = await stub.StoreXMLStream(request_chunks())
+            counters['uploads' if response.success else 'errors'] += 1
+        except grpc.aio.AioRpcError:
+            counters['errors'] += 1
+
+
+async def ping_loop(stub, stop, latencies, counters, interval=0.05):
+    """Mede a latência de Ping enquanto decorrem os uploads"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await stub.Ping(pb2.Empty(), timeout=30)
+            latencies.append(time.perf_counter() - start)
+        except grpc.aio.AioRpcError:
+            counters['ping_errors'] += 1
+        await asyncio.sleep(interval)
+
+
+async def run_load(port, clients, chunks, delay, duration):
+    target = f'localhost:{port}'
+    options = [('grpc.use_local_subchannel_pool', 1)]
+    channels = [
+        grpc.aio.insecure_channel(target, options=options)
+        for _ in range(max(1, -(-clients // CLIENTS_PER_CHANNEL)))
+    ]
+    ping_channel = grpc.aio.insecure_channel(target, options=options)
+    stop = asyncio.Event()
+    latencies = []
+    counters = {'uploads': 0, 'errors': 0, 'ping_errors': 0}
+    
+    tasks = [
+        asyncio.create_task(slow_upload(
+            pb2_grpc.XMLServiceStub(channels[i // CLIENTS_PER_CHANNEL]), i, chunks, delay, stop, counters
+        ))
+        for i in range(clients)
+    ]
+    # Os uploads arrancam antes de começar a medir
+    await asyncio.sleep(delay)
+    tasks.append(asyncio.create_task(ping_loop(pb2_grpc.XMLServiceStub(ping_channel), stop, latencies, counters)))
+    
+    await asyncio.sleep(duration)
+    stop.set()
+    for channel in channels + [ping_channel]:
+        await channel.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return latencies, counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de clientes lentos: servidor gRPC síncrono vs asyncio")
+    parser.add_argument('--server', choices=('sync', 'aio', 'both'), default='both')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--chunks', type=int, default=5)
+    parser.add_argument('--delay', type=float, default=1.0)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--port', type=int, default=50062)
+    args = parser.parse_args()
+    
+    storage_path = tempfile.mkdtemp(prefix='bench_grpc_slow_')
+    servers = ('sync', 'aio') if args.server == 'both' else (args.server,)
+    
+    print(f"Clientes lentos: {args.clients} | Blocos: {args.chunks} a cada {args.delay:.1f}s | Duração: {args.duration:.0f}s")
+    print(f"{'servidor':>10}{'uploads':>10}{'pings':>8}{'p50 (ms)':>12}{'p99 (ms)':>12}{'erros':>8}")
+    
+    for name in servers:
+        process, channel = start_server(args.port, storage_path, {}, script=SERVERS[name])
+        try:
+            latencies, counters = asyncio.run(run_load(args.port, args.clients, args.chunks, args.delay, args.duration))
+        finally:
+            stop_server(process, channel)
+        
+        errors = counters['errors'] + counters['ping_errors']
+        print(f"{name:>10}{counters['uploads']:>10}{len(latencies):>8}"
+              f"{percentile(latencies, 0.5) * 1000:>12.1f}{percentile(latencies, 0.99) * 1000:>12.1f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
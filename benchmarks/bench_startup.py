@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: arranque a frio dos servidores (tempo de import e tempo até aceitarem pedidos)
+Uso: python bench_startup.py [--storage mongo|memory|filesystem] [--repeat N] [--ready-timeout S]
+
+- Import: tempo de import de cada módulo num interpretador novo (mediana de --repeat)
+- Servidores: tempo desde o arranque do processo até ao primeiro Ping/ping (vivo)
+  e até Ready/ready indicar o armazenamento ligado (pronto)
+
+Com --storage mongo e sem MongoDB acessível o servidor fica vivo mas não pronto;
+antes da ligação em segundo plano o arranque bloqueava até 50s (10 tentativas x 5s).
+"""
+
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xmlrpc.client
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server')
+
+# Adicionar pasta server ao path para importar protobuf
+sys.path.insert(0, SERVER_DIR)
+
+import grpc
+import xml_service_pb2 as pb2
+import xml_service_pb2_grpc as pb2_grpc
+
+MODULES = ('pandas', 'xml_converter', 'grpc_server', 'xmlrpc_server')
+
+# Intervalo entre verificações enquanto o servidor arranca
+POLL_INTERVAL = 0.01
+
+
+def import_time(module, env):
+    """Tempo (ms) de import do módulo num interpretador novo"""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=SERVER_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def grpc_probes(port):
+    # Reconexão a cada 10ms enquanto a porta está fechada (por omissão o backoff começa em 1s)
+    channel = grpc.insecure_channel(f'localhost:{port}', options=[
+        ('grpc.initial_reconnect_backoff_ms', 10),
+        ('grpc.min_reconnect_backoff_ms', 10),
+        ('grpc.max_reconnect_backoff_ms', 10)
+    ])
+    stub = pb2_grpc.XMLServiceStub(channel)
+    
+    def live():
+        # wait_for_ready: o pedido espera pela conexão em vez de falhar de imediato
+        return stub.Ping(pb2.Empty(), timeout=1, wait_for_ready=True).message == 'pong'
+    
+    def ready():
+        return stub.Ready(pb2.Empty(), timeout=1).ready
+    
+    return live, ready, channel.close
+
+
+def xmlrpc_probes(port):
+    server = xmlrpc.client.ServerProxy(f'http://localhost:{port}')
+    
+    def live():
+        return server.ping() == 'pong'
+    
+    def ready():
+        return server.ready()['ready']
+    
+    return live, ready, lambda: None
+
+
+def wait_for(check, started, timeout):
+    """Segundos desde started até check() ser verdadeiro (None se excedeu timeout)"""
+    while time.perf_counter() - started < timeout:
+        try:
+            if check():
+                return time.perf_counter() - started
+        except (grpc.RpcError, OSError, xmlrpc.client.Error):
+            pass
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def measure_server(script, probes, port, env, ready_timeout):
+    """Arranca o servidor e devolve (segundos até vivo, segundos até pronto)"""
+    live, ready, close = probes(port)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, script], cwd=SERVER_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        live_after = wait_for(live, started, 60)
+        ready_after = wait_for(ready, started, ready_timeout) if live_after is not None else None
+        return live_after, ready_after
+    finally:
+        close()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def format_seconds(value):
+    return f"{value * 1000:.0f}" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque a frio dos servidores")
+    parser.add_argument('--storage', choices=('mongo', 'memory', 'filesystem'), default='memory')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--ready-timeout', type=float, default=10)
+    parser.add_argument('--grpc-port', type=int, default=50063)
+    parser.add_argument('--xmlrpc-port', type=int, default=8003)
+    args = parser.parse_args()
+    
+    env = dict(
+        os.environ,
+        STORAGE_BACKEND=args.storage,
+        STORAGE_PATH=tempfile.mkdtemp(prefix='bench_startup_'),
+        GRPC_PORT=str(args.grpc_port),
+        XMLRPC_PORT=str(args.xmlrpc_port)
+    )
+    
+    print(f"Armazenamento: {args.storage} | Repetições: {args.repeat}")
+    print(f"{'módulo':>16}{'import (ms)':>14}")
+    for module in MODULES:
+        times = [import_time(module, env) for _ in range(args.repeat)]
+        print(f"{module:>16}{statistics.median(times):>14.1f}")
+    
+    print(f"\n{'servidor':>16}{'vivo (ms)':>14}{'pronto (ms)':>14}")
+    servers = (
+        ('grpc', 'grpc_server.py', grpc_probes, args.grpc_port),
+        ('xmlrpc', 'xmlrpc_server.py', xmlrpc_probes, args.xmlrpc_port)
+    )
+    for name, script, probes, port in servers:
+        results = [measure_server(script, probes, port, env, args.ready_timeout) for _ in range(args.repeat)]
+        live = [live_after for live_after, _ in results if live_after is not None]
+        ready = [ready_after for _, ready_after in results if ready_after is not None]
+        print(f"{name:>16}{format_seconds(statistics.median(live) if live else None):>14}"
+              f"{format_seconds(statistics.median(ready) if ready else None):>14}")
+
+
+if __name__ == '__main__':
+    main()
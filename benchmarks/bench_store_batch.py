@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: armazenamento individual (StoreXML/store_xml) vs em lote (StoreXMLBatch/store_xml_batch)
+Uso: python bench_store_batch.py [--protocol xmlrpc|grpc] [--docs N] [--batch-size B]
+"""
+
+import argparse
+import os
+import sys
+import time
+import xmlrpc.client
+
+# Adicionar pasta server ao path para importar protobuf
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+
+
+def make_documents(count):
+    """Gera documentos XML pequenos de teste"""
+    return [
+        (f"bench_{i}.xml", f"<record id=\"{i}\"><name>item {i}</name><value>{i * 1.5}</value></record>")
+        for i in range(count)
+    ]
+
+
+def bench_xmlrpc(documents, batch_size):
+    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    
+    start = time.perf_counter()
+    for filename, content in documents:
+        server.store_xml(filename, content)
+    single = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for i in range(0, len(documents), batch_size):
+        batch = [
+            {"filename": filename, "xml_content": content}
+            for filename, content in documents[i:i + batch_size]
+        ]
+        server.store_xml_batch(batch)
+    batched = time.perf_counter() - start
+    
+    return single, batched
+
+
+def bench_grpc(documents, batch_size):
+    import grpc
+    import xml_service_pb2 as pb2
+    import xml_service_pb2_grpc as pb2_grpc
+    
+    channel = grpc.insecure_channel('localhost:50051')
+    stub = pb2_grpc.XMLServiceStub(channel)
+    
+    start = time.perf_counter()
+    for filename, content in documents:
+        stub.StoreXML(pb2.StoreXMLRequest(filename=filename, xml_content=content))
+    single = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for i in range(0, len(documents), batch_size):
+        batch = [
+            pb2.StoreXMLRequest(filename=filename, xml_content=content)
+            for filename, content in documents[i:i + batch_size]
+        ]
+        stub.StoreXMLBatch(pb2.StoreXMLBatchRequest(documents=batch))
+    batched = time.perf_counter() - start
+    
+    channel.close()
+    return single, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inserção individual vs em lote")
+    parser.add_argument('--protocol', choices=['xmlrpc', 'grpc'], default='grpc')
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+    
+    documents = make_documents(args.docs)
+    
+    if args.protocol == 'grpc':
+        single, batched = bench_grpc(documents, args.batch_size)
+    else:
+        single, batched = bench_xmlrpc(documents, args.batch_size)
+    
+    print(f"Protocolo: {args.protocol} | Documentos: {args.docs} | Lote: {args.batch_size}")
+    print(f"Individual: {single:.2f}s ({args.docs / single:.0f} docs/s)")
+    print(f"Em lote:    {batched:.2f}s ({args.docs / batched:.0f} docs/s)")
+    print(f"Speedup:    {single / batched:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
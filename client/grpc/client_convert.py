@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Cliente gRPC para conversão de CSV para XML
+Cliente gRPC para conversão de CSV para XML (envio em blocos; XML e XSD armazenados no servidor)
 Uso: python client_convert.py <caminho_csv> [--generate-schema]
 """
 
@@ -14,6 +14,24 @@ import grpc
 import xml_service_pb2 as pb2
 import xml_service_pb2_grpc as pb2_grpc
 
+# Tamanho dos blocos enviados (1MB)
+CHUNK_SIZE = 1024 * 1024
+
+def read_chunks(csv_path, filename):
+    """Lê o CSV em blocos, indicando os elementos e o ficheiro de destino apenas no primeiro"""
+    first = pb2.CSVChunk(root_element='dataset', row_element='record', filename=filename)
+    with open(csv_path, 'rb') as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            if first:
+                first.data = data
+                yield first
+                first = None
+            else:
+                yield pb2.CSVChunk(data=data)
+
 def main():
     if len(sys.argv) < 2:
         print("Uso: python client_convert.py <caminho_csv> [--generate-schema]")
@@ -30,47 +48,31 @@ def main():
     channel = grpc.insecure_channel('localhost:50051')
     stub = pb2_grpc.XMLServiceStub(channel)
     
-    # Ler ficheiro CSV
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        csv_data = f.read()
-    
-    # Converter CSV para XML (usando XML-RPC temporariamente para conversão)
-    import xmlrpc.client
-    xmlrpc_server = xmlrpc.client.ServerProxy('http://localhost:8000')
-    
+    # Converter, armazenar, gerar XSD e validar no servidor (o XML não volta ao cliente)
     filename = os.path.basename(csv_path).replace('.csv', '.xml')
-    xml_result = xmlrpc_server.convert_csv_to_xml(csv_data, 'dataset', 'record')
-    
-    if not xml_result.get('success'):
-        print(f"Erro na conversão: {xml_result.get('error')}")
-        sys.exit(1)
-    
-    xml_content = xml_result['xml_content']
-    
-    # Armazenar via gRPC
-    response = stub.StoreXML(pb2.StoreXMLRequest(
-        filename=filename,
-        xml_content=xml_content
-    ))
+    response = stub.IngestCSV(read_chunks(csv_path, filename))
     
     if not response.success:
-        print(f"Erro ao armazenar: {response.message}")
+        print(f"Erro na conversão: {response.message}")
         sys.exit(1)
     
     print(f"XML ID: {response.xml_id}")
+    print(f"Registos: {response.records} | Válido: {response.is_valid}")
     
-    # Gerar schema XSD se solicitado
+    # Guardar localmente o schema XSD gerado, se solicitado
     if generate_schema:
-        xsd_result = xmlrpc_server.generate_xsd_schema(response.xml_id)
+        xsd_response = stub.GetXML(pb2.GetXMLRequest(xml_id=response.schema_id))
         
-        if xsd_result.get('success'):
+        if xsd_response.success:
             xsd_filename = f"data/xml_schemas/{os.path.basename(csv_path).replace('.csv', '.xsd')}"
             os.makedirs('data/xml_schemas', exist_ok=True)
             
             with open(xsd_filename, 'w', encoding='utf-8') as f:
-                f.write(xsd_result['xsd_content'])
+                f.write(xsd_response.xml_content)
             
             print(f"XSD Schema: {xsd_filename}")
+        else:
+            print(f"Erro ao obter XSD: {xsd_response.message}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Cliente gRPC para descrever a estrutura de um XML armazenado
+Uso: python client_describe.py <xml_id>
+"""
+
+import sys
+import os
+
+# Adicionar pasta server ao path para importar protobuf
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'server'))
+
+import grpc
+import xml_service_pb2 as pb2
+import xml_service_pb2_grpc as pb2_grpc
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python client_describe.py <xml_id>")
+        sys.exit(1)
+    
+    xml_id = sys.argv[1]
+    
+    # Conectar ao servidor gRPC
+    channel = grpc.insecure_channel('localhost:50051')
+    stub = pb2_grpc.XMLServiceStub(channel)
+    
+    # Obter resumo estrutural (não lê o conteúdo do documento)
+    response = stub.DescribeXML(pb2.GetXMLRequest(xml_id=xml_id))
+    
+    if not response.success:
+        print(f"Erro: {response.message}")
+        sys.exit(1)
+    
+    print(f"Nome: {response.filename}")
+    print(f"Tamanho: {response.size} bytes")
+    print(f"Elementos: {response.element_count} (profundidade máxima {response.max_depth})")
+    if response.truncated:
+        print("Aviso: resumo truncado (demasiados caminhos distintos)")
+    print("-" * 60)
+    
+    for info in response.paths:
+        attributes = f"  @{', @'.join(info.attributes)}" if info.attributes else ""
+        print(f"{info.count:>8}  {info.path}{attributes}")
+
+if __name__ == '__main__':
+    main()
@@ -26,26 +26,34 @@ def main():
     channel = grpc.insecure_channel('localhost:50051')
     stub = pb2_grpc.XMLServiceStub(channel)
     
-    # Recuperar XML
-    response = stub.GetXML(pb2.GetXMLRequest(xml_id=xml_id))
+    # Recuperar XML em blocos (suporta documentos maiores que 4MB)
+    chunks = stub.GetXMLStream(pb2.GetXMLRequest(xml_id=xml_id))
     
-    if not response.success:
-        print(f"Erro: {response.message}")
+    try:
+        # Guardar em ficheiro ou mostrar
+        if output_file:
+            with open(output_file, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk.data)
+            print(f"XML guardado em: {output_file}")
+        else:
+            filename = ""
+            size = 0
+            preview = b""
+            for chunk in chunks:
+                filename = filename or chunk.filename
+                size += len(chunk.data)
+                if len(preview) < 500:
+                    preview += chunk.data[:500 - len(preview)]
+            
+            preview = preview.decode('utf-8', errors='ignore')
+            print(f"Filename: {filename}")
+            print(f"Size: {size} bytes")
+            print("\nConteúdo:")
+            print(preview + "..." if size > 500 else preview)
+    except grpc.RpcError as e:
+        print(f"Erro: {e.details()}")
         sys.exit(1)
-    
-    xml_content = response.xml_content
-    filename = response.filename
-    
-    # Guardar em ficheiro ou mostrar
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
-        print(f"XML guardado em: {output_file}")
-    else:
-        print(f"Filename: {filename}")
-        print(f"Size: {len(xml_content)} bytes")
-        print("\nConteúdo:")
-        print(xml_content[:500] + "..." if len(xml_content) > 500 else xml_content)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cliente gRPC para trabalhos assíncronos (conversão CSV para XML e validação em lote)
+Uso: python client_job.py csv <caminho_csv> [--no-wait]
+     python client_job.py validate <xml_id> [<xml_id> ...] [--schema <caminho_xsd>] [--no-wait]
+     python client_job.py status <job_id>
+     python client_job.py watch <job_id>
+"""
+
+import sys
+import os
+
+# Adicionar pasta server ao path para importar protobuf
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'server'))
+
+import grpc
+import xml_service_pb2 as pb2
+import xml_service_pb2_grpc as pb2_grpc
+
+# Tamanho dos blocos enviados (1MB)
+CHUNK_SIZE = 1024 * 1024
+
+def read_chunks(csv_path, filename):
+    """Lê o CSV em blocos, indicando o tipo de trabalho e o ficheiro de destino apenas no primeiro"""
+    first = pb2.JobChunk(type='csv_to_xml', filename=filename)
+    with open(csv_path, 'rb') as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            if first:
+                first.data = data
+                yield first
+                first = None
+            else:
+                yield pb2.JobChunk(data=data)
+
+def print_status(status):
+    """Mostra o estado de um trabalho numa linha (mais o resultado quando termina)"""
+    progress = f"{status.processed}/{status.total}" if status.total else f"{status.processed}"
+    eta = f" | ETA {status.eta_seconds:.0f}s" if status.eta_seconds > 0 else ""
+    phase = f" ({status.phase})" if status.phase and status.status == 'running' else ""
+    print(f"[{status.status}{phase}] {progress}{eta}")
+    
+    if status.status == 'done':
+        if status.xml_id:
+            print(f"XML ID: {status.xml_id}")
+        print(f"Resultado: {status.result_json}")
+    elif status.status == 'failed':
+        print(f"Erro: {status.error}")
+
+def watch(stub, job_id):
+    for status in stub.WatchJob(pb2.JobRequest(job_id=job_id)):
+        if not status.success:
+            print(f"Erro: {status.message}")
+            sys.exit(1)
+        print_status(status)
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('csv', 'validate', 'status', 'watch'):
+        print(__doc__.strip().split('\n', 1)[1])
+        sys.exit(1)
+    
+    command = sys.argv[1]
+    args = [arg for arg in sys.argv[2:] if arg != '--no-wait']
+    wait = '--no-wait' not in sys.argv
+    
+    # Conectar ao servidor gRPC
+    channel = grpc.insecure_channel('localhost:50051')
+    stub = pb2_grpc.XMLServiceStub(channel)
+    
+    if command in ('status', 'watch'):
+        if command == 'watch':
+            watch(stub, args[0])
+            return
+        status = stub.GetJobStatus(pb2.JobRequest(job_id=args[0]))
+        if not status.success:
+            print(f"Erro: {status.message}")
+            sys.exit(1)
+        print_status(status)
+        return
+    
+    if command == 'csv':
+        csv_path = args[0]
+        if not os.path.exists(csv_path):
+            print(f"Erro: Ficheiro {csv_path} não encontrado")
+            sys.exit(1)
+        filename = os.path.basename(csv_path).replace('.csv', '.xml')
+        response = stub.SubmitJob(read_chunks(csv_path, filename))
+    else:
+        schema_path = ""
+        if '--schema' in args:
+            index = args.index('--schema')
+            schema_path = args[index + 1]
+            del args[index:index + 2]
+        response = stub.SubmitJob(iter([pb2.JobChunk(type='validate_xml', xml_ids=args, schema_path=schema_path)]))
+    
+    if not response.success:
+        print(f"Erro: {response.message}")
+        sys.exit(1)
+    
+    print(f"Job ID: {response.job_id}")
+    
+    # O trabalho continua no servidor mesmo que o cliente termine
+    if wait:
+        watch(stub, response.job_id)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Cliente gRPC para listar XMLs armazenados
-Uso: python client_list.py
+Uso: python client_list.py [prefixo_filename]
 """
 
 import sys
@@ -15,21 +15,27 @@ import xml_service_pb2 as pb2
 import xml_service_pb2_grpc as pb2_grpc
 
 def main():
+    filename_prefix = sys.argv[1] if len(sys.argv) > 1 else ""
+    
     # Conectar ao servidor gRPC
     channel = grpc.insecure_channel('localhost:50051')
     stub = pb2_grpc.XMLServiceStub(channel)
     
-    # Listar XMLs
-    response = stub.ListXMLs(pb2.Empty())
-    
-    print(f"Total: {response.count} ficheiro(s)")
-    print()
+    # Listar XMLs em streaming (sem limite de tamanho da resposta)
+    request = pb2.ListXMLsRequest(filename_prefix=filename_prefix)
+    count = 0
     
-    for file_info in response.files:
+    for file_info in stub.ListXMLsStream(request):
         print(f"ID: {file_info.xml_id}")
         print(f"Nome: {file_info.filename}")
         print(f"Data: {file_info.created_at}")
+        print(f"Tamanho: {file_info.size} bytes")
+        print(f"Armazenamento: {file_info.storage}")
         print("-" * 60)
+        count += 1
+    
+    print()
+    print(f"Total: {count} ficheiro(s)")
 
 if __name__ == '__main__':
     main()
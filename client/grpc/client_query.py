@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-Cliente gRPC para consultas XPath
-Uso: python client_query.py <xml_id> <xpath_expression>
+Cliente gRPC para consultas XPath (ou XQuery com --xquery)
+Uso: python client_query.py <xml_id> <expression> [--xquery]
 """
 
 import sys
@@ -15,26 +15,36 @@ import xml_service_pb2 as pb2
 import xml_service_pb2_grpc as pb2_grpc
 
 def main():
-    if len(sys.argv) < 3:
-        print("Uso: python client_query.py <xml_id> <xpath_expression>")
+    args = [arg for arg in sys.argv[1:] if arg != '--xquery']
+    use_xquery = '--xquery' in sys.argv
+    
+    if len(args) < 2:
+        print("Uso: python client_query.py <xml_id> <expression> [--xquery]")
         print("\nExemplos:")
         print('  python client_query.py 692358... "count(//record)"')
         print('  python client_query.py 692358... "//record[1]/date/text()"')
         print('  python client_query.py 692358... "sum(//record/total)"')
+        print('  python client_query.py 692358... "for $r in //record return $r" --xquery')
         sys.exit(1)
     
-    xml_id = sys.argv[1]
-    xpath_expression = sys.argv[2]
+    xml_id = args[0]
+    expression = args[1]
     
     # Conectar ao servidor gRPC
     channel = grpc.insecure_channel('localhost:50051')
     stub = pb2_grpc.XMLServiceStub(channel)
     
-    # Executar consulta XPath
-    response = stub.QueryXPath(pb2.XPathRequest(
-        xml_id=xml_id,
-        expression=xpath_expression
-    ))
+    # Executar consulta XPath ou XQuery
+    if use_xquery:
+        response = stub.QueryXQuery(pb2.XQueryRequest(
+            xml_id=xml_id,
+            expression=expression
+        ))
+    else:
+        response = stub.QueryXPath(pb2.XPathRequest(
+            xml_id=xml_id,
+            expression=expression
+        ))
     
     if not response.success:
         print(f"Erro: {response.message}")
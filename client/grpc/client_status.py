@@ -24,7 +24,14 @@ def main():
         response = stub.Ping(pb2.Empty())
         print(f"Ping: {response.message}")
         
-        print("\n✓ Servidor gRPC operacional")
+        # Prontidão (armazenamento ligado)
+        ready = stub.Ready(pb2.Empty())
+        print(f"Pronto: {'sim' if ready.ready else 'não'} - {ready.message}")
+        
+        if ready.ready:
+            print("\n✓ Servidor gRPC operacional")
+        else:
+            print("\n… Servidor gRPC ativo, a aguardar o armazenamento")
         
     except Exception as e:
         print(f"✗ Erro ao conectar ao servidor: {e}")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Cliente gRPC para armazenar um ficheiro XML local (envio em blocos)
+Uso: python client_store.py <caminho_xml>
+"""
+
+import sys
+import os
+
+# Adicionar pasta server ao path para importar protobuf
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'server'))
+
+import grpc
+import xml_service_pb2 as pb2
+import xml_service_pb2_grpc as pb2_grpc
+
+# Tamanho dos blocos enviados (1MB)
+CHUNK_SIZE = 1024 * 1024
+
+def read_chunks(xml_path):
+    """Lê o ficheiro em blocos, indicando o nome apenas no primeiro"""
+    filename = os.path.basename(xml_path)
+    with open(xml_path, 'rb') as f:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            if not data:
+                break
+            yield pb2.XMLChunk(filename=filename, data=data)
+            filename = ""
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python client_store.py <caminho_xml>")
+        sys.exit(1)
+    
+    xml_path = sys.argv[1]
+    
+    if not os.path.exists(xml_path):
+        print(f"Erro: Ficheiro {xml_path} não encontrado")
+        sys.exit(1)
+    
+    # Conectar ao servidor gRPC
+    channel = grpc.insecure_channel('localhost:50051')
+    stub = pb2_grpc.XMLServiceStub(channel)
+    
+    # Enviar XML em streaming
+    response = stub.StoreXMLStream(read_chunks(xml_path))
+    
+    if not response.success:
+        print(f"Erro ao armazenar: {response.message}")
+        sys.exit(1)
+    
+    print(f"XML ID: {response.xml_id}")
+
+if __name__ == '__main__':
+    main()
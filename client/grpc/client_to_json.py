@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'server')
 
 import grpc
 import xml_service_pb2 as pb2
-import xml_service_pb2_grpc as pb2_grpc
+import xml_service_v2_pb2_grpc as pb2_v2_grpc
 
 def main():
     if len(sys.argv) < 2:
@@ -24,9 +24,9 @@ def main():
     
     # Conectar ao servidor gRPC
     channel = grpc.insecure_channel('localhost:50051')
-    stub = pb2_grpc.XMLServiceStub(channel)
+    stub = pb2_v2_grpc.XMLServiceStub(channel)
     
-    # Converter para JSON
+    # Converter para JSON (xmlservice.v2: conteúdo em bytes)
     response = stub.ConvertToJSON(pb2.ConvertToJSONRequest(xml_id=xml_id))
     
     if not response.success:
@@ -37,11 +37,11 @@ def main():
     
     # Guardar em ficheiro ou mostrar
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with open(output_file, 'wb') as f:
             f.write(json_content)
         print(f"JSON guardado em: {output_file}")
     else:
-        print(json_content)
+        print(json_content.decode('utf-8'))
 
 if __name__ == '__main__':
     main()
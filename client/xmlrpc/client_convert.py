@@ -5,9 +5,10 @@ Uso: python client_convert.py <caminho_csv> [--generate-schema]
 """
 
 import sys
-import xmlrpc.client
 import os
 
+from rpc_client import connect, encode_payload, decode_payload, TRANSFER
+
 def main():
     if len(sys.argv) < 2:
         print("Uso: python client_convert.py <caminho_csv> [--generate-schema]")
@@ -21,46 +22,37 @@ def main():
         sys.exit(1)
     
     # Conectar ao servidor XML-RPC
-    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    server = connect()
     
     # Ler ficheiro CSV
     with open(csv_path, 'r', encoding='utf-8') as f:
         csv_data = f.read()
     
-    # Converter CSV para XML
+    # Converter, armazenar, gerar XSD e validar no servidor (o XML não volta ao cliente)
     filename = os.path.basename(csv_path).replace('.csv', '.xml')
-    result = server.convert_csv_to_xml(csv_data, 'dataset', 'record')
+    result = server.ingest_csv(encode_payload(csv_data), filename, 'dataset', 'record', TRANSFER)
     
     if not result.get('success'):
         print(f"Erro na conversão: {result.get('error')}")
         sys.exit(1)
     
-    xml_content = result['xml_content']
-    
-    # Armazenar no MongoDB
-    store_result = server.store_xml(filename, xml_content)
-    
-    if not store_result.get('success'):
-        print(f"Erro ao armazenar: {store_result.get('error')}")
-        sys.exit(1)
-    
-    xml_id = store_result['xml_id']
-    print(f"XML ID: {xml_id}")
+    print(f"XML ID: {result['xml_id']}")
+    print(f"Registos: {result['records']} | Válido: {result['is_valid']}")
     
-    # Gerar schema XSD se solicitado
+    # Guardar localmente o schema XSD gerado, se solicitado
     if generate_schema:
-        xsd_result = server.generate_xsd_schema(xml_id)
+        xsd_result = server.retrieve_xml(result['schema_id'], TRANSFER)
         
         if xsd_result.get('success'):
             xsd_filename = f"data/xml_schemas/{os.path.basename(csv_path).replace('.csv', '.xsd')}"
             os.makedirs('data/xml_schemas', exist_ok=True)
             
             with open(xsd_filename, 'w', encoding='utf-8') as f:
-                f.write(xsd_result['xsd_content'])
+                f.write(decode_payload(xsd_result['data']['content']))
             
             print(f"XSD Schema: {xsd_filename}")
         else:
-            print(f"Aviso: Erro ao gerar XSD: {xsd_result.get('error')}")
+            print(f"Aviso: Erro ao obter XSD: {xsd_result.get('error')}")
 
 if __name__ == '__main__':
     main()
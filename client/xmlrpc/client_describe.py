@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Cliente para descrever a estrutura de um XML armazenado via XML-RPC
+Uso: python client_describe.py <xml_id>
+"""
+
+import sys
+from rpc_client import connect
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python client_describe.py <xml_id>")
+        sys.exit(1)
+    
+    xml_id = sys.argv[1]
+    
+    # Conectar ao servidor XML-RPC
+    server = connect()
+    
+    # Obter resumo estrutural (não lê o conteúdo do documento)
+    result = server.describe_xml(xml_id)
+    
+    if not result.get('success'):
+        print(f"Erro: {result.get('error')}")
+        sys.exit(1)
+    
+    data = result['data']
+    print(f"Nome: {data['filename']}")
+    print(f"Tamanho: {data['size']} bytes")
+    print(f"Elementos: {data['element_count']} (profundidade máxima {data['max_depth']})")
+    if data['truncated']:
+        print("Aviso: resumo truncado (demasiados caminhos distintos)")
+    print("-" * 60)
+    
+    for info in data['paths']:
+        attributes = f"  @{', @'.join(info['attributes'])}" if info['attributes'] else ""
+        print(f"{info['count']:>8}  {info['path']}{attributes}")
+
+if __name__ == '__main__':
+    main()
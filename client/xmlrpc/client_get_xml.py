@@ -5,7 +5,7 @@ Uso: python client_get_xml.py <xml_id> [output_file.xml]
 """
 
 import sys
-import xmlrpc.client
+from rpc_client import connect, decode_payload, TRANSFER
 
 def main():
     if len(sys.argv) < 2:
@@ -16,16 +16,16 @@ def main():
     output_file = sys.argv[2] if len(sys.argv) > 2 else None
     
     # Conectar ao servidor XML-RPC
-    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    server = connect()
     
     # Recuperar XML
-    result = server.retrieve_xml(xml_id)
+    result = server.retrieve_xml(xml_id, TRANSFER)
     
     if not result.get('success'):
         print(f"Erro: {result.get('error')}")
         sys.exit(1)
     
-    xml_content = result['data']['content']
+    xml_content = decode_payload(result['data']['content'])
     filename = result['data']['filename']
     
     # Guardar em ficheiro ou mostrar
@@ -1,35 +1,50 @@
 #!/usr/bin/env python3
 """
 Cliente para listar XMLs armazenados via XML-RPC
-Uso: python client_list.py
+Uso: python client_list.py [prefixo_filename]
 """
 
-import xmlrpc.client
+import sys
+from rpc_client import connect
+
+# Ficheiros por página pedidos ao servidor
+PAGE_SIZE = 100
 
 def main():
+    filename_prefix = sys.argv[1] if len(sys.argv) > 1 else None
+    
     # Conectar ao servidor XML-RPC
-    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    server = connect()
     
-    # Listar XMLs
-    result = server.list_xml_files()
+    # Listar XMLs página a página
+    options = {"filename_prefix": filename_prefix, "page_size": PAGE_SIZE, "include_count": True}
+    result = server.list_xml_files(options)
     
     if not result.get('success'):
         print(f"Erro: {result.get('error')}")
         return
     
-    count = result['count']
-    files = result['files']
-    
-    print(f"Total: {count} ficheiro(s)")
+    print(f"Total: {result['count']} ficheiro(s)")
     print()
     
-    for file_info in files:
-        print(f"ID: {file_info['_id']}")
-        print(f"Nome: {file_info['filename']}")
-        print(f"Data: {file_info.get('created_at', 'N/A')}")
-        print(f"Tamanho: {file_info.get('size', 0)} bytes")
-        print(f"Armazenamento: {file_info.get('storage', 'N/A')}")
-        print("-" * 60)
+    while True:
+        for file_info in result['files']:
+            print(f"ID: {file_info['_id']}")
+            print(f"Nome: {file_info['filename']}")
+            print(f"Data: {file_info.get('created_at', 'N/A')}")
+            print(f"Tamanho: {file_info.get('size', 0)} bytes")
+            print(f"Armazenamento: {file_info.get('storage', 'N/A')}")
+            print("-" * 60)
+        
+        if not result.get('has_more'):
+            break
+        
+        options = {"filename_prefix": filename_prefix, "page_size": PAGE_SIZE, "cursor": result['next_cursor']}
+        result = server.list_xml_files(options)
+        
+        if not result.get('success'):
+            print(f"Erro: {result.get('error')}")
+            return
 
 if __name__ == '__main__':
     main()
@@ -1,43 +1,58 @@
 #!/usr/bin/env python3
 """
 Cliente para consultas XPath via XML-RPC
-Uso: python client_query.py <xml_id> <xpath_expression>
+Uso: python client_query.py <xml_id> <xpath_expression> [<xpath_expression> ...]
 """
 
 import sys
-import xmlrpc.client
+from rpc_client import connect, multicall
+
+def print_results(results):
+    if len(results) == 1:
+        print(results[0])
+    else:
+        for i, item in enumerate(results, 1):
+            print(f"{i}. {item}")
 
 def main():
     if len(sys.argv) < 3:
-        print("Uso: python client_query.py <xml_id> <xpath_expression>")
+        print("Uso: python client_query.py <xml_id> <xpath_expression> [<xpath_expression> ...]")
         print("\nExemplos:")
         print('  python client_query.py 692358... "count(//record)"')
         print('  python client_query.py 692358... "//record[1]/date/text()"')
         print('  python client_query.py 692358... "sum(//record/total)"')
+        print('  python client_query.py 692358... "count(//record)" "sum(//record/total)"')
         sys.exit(1)
     
     xml_id = sys.argv[1]
-    xpath_expression = sys.argv[2]
+    xpath_expressions = sys.argv[2:]
     
     # Conectar ao servidor XML-RPC
-    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    server = connect()
     
-    # Executar consulta XPath
-    result = server.query_xml_xpath(xml_id, xpath_expression)
-    
-    if not result.get('success'):
-        print(f"Erro: {result.get('error')}")
-        sys.exit(1)
+    # Executar consultas XPath (várias expressões seguem num só pedido)
+    if len(xpath_expressions) == 1:
+        results = [server.query_xml_xpath(xml_id, xpath_expressions[0])]
+    else:
+        results = multicall(server, [
+            ("query_xml_xpath", (xml_id, expression)) for expression in xpath_expressions
+        ])
     
-    query_result = result['query_result']
-    results = query_result['results']
+    failed = False
+    for expression, result in zip(xpath_expressions, results):
+        if len(xpath_expressions) > 1:
+            print(f"== {expression}")
+        
+        if not result.get('success'):
+            print(f"Erro: {result.get('error')}")
+            failed = True
+            continue
+        
+        # Mostrar resultados
+        print_results(result['query_result']['results'])
     
-    # Mostrar resultados
-    if len(results) == 1:
-        print(results[0])
-    else:
-        for i, item in enumerate(results, 1):
-            print(f"{i}. {item}")
+    if failed:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
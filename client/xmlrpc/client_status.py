@@ -4,23 +4,28 @@ Cliente para verificar status do servidor XML-RPC
 Uso: python client_status.py
 """
 
-import xmlrpc.client
+from rpc_client import connect, multicall
 
 def main():
     try:
         # Conectar ao servidor XML-RPC
-        server = xmlrpc.client.ServerProxy('http://localhost:8000')
+        server = connect()
         
-        # Ping
-        ping_result = server.ping()
+        # Ping, status e prontidão num só pedido (system.multicall)
+        ping_result, status_result, ready_result = multicall(server, [
+            ("ping", ()),
+            ("get_server_status", ()),
+            ("ready", ())
+        ])
         print(f"Ping: {ping_result}")
-        
-        # Status
-        status_result = server.get_server_status()
         print(f"Status: {status_result['status']}")
         print(f"Database: {status_result['database']}")
+        print(f"Pronto: {'sim' if ready_result['ready'] else 'não'} - {ready_result['message']}")
         
-        print("\n✓ Servidor XML-RPC operacional")
+        if ready_result['ready']:
+            print("\n✓ Servidor XML-RPC operacional")
+        else:
+            print("\n… Servidor XML-RPC ativo, a aguardar o armazenamento")
         
     except Exception as e:
         print(f"✗ Erro ao conectar ao servidor: {e}")
@@ -5,7 +5,7 @@ Uso: python client_to_json.py <xml_id> [output_file.json]
 """
 
 import sys
-import xmlrpc.client
+from rpc_client import connect, decode_payload, TRANSFER
 
 def main():
     if len(sys.argv) < 2:
@@ -16,16 +16,16 @@ def main():
     output_file = sys.argv[2] if len(sys.argv) > 2 else None
     
     # Conectar ao servidor XML-RPC
-    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    server = connect()
     
     # Converter para JSON
-    result = server.convert_xml_to_json(xml_id)
+    result = server.convert_xml_to_json(xml_id, TRANSFER)
     
     if not result.get('success'):
         print(f"Erro: {result.get('error')}")
         sys.exit(1)
     
-    json_content = result['json_content']
+    json_content = decode_payload(result['json_content'])
     
     # Guardar em ficheiro ou mostrar
     if output_file:
@@ -5,7 +5,7 @@ Uso: python client_validate.py <xml_id> [schema.xsd]
 """
 
 import sys
-import xmlrpc.client
+from rpc_client import connect
 
 def main():
     if len(sys.argv) < 2:
@@ -16,7 +16,7 @@ def main():
     schema_file = sys.argv[2] if len(sys.argv) > 2 else None
     
     # Conectar ao servidor XML-RPC
-    server = xmlrpc.client.ServerProxy('http://localhost:8000')
+    server = connect()
     
     # Validar XML
     result = server.validate_xml_content(xml_id, schema_file)
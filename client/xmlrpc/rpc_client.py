@@ -0,0 +1,52 @@
+"""
+Ligação partilhada pelos clientes XML-RPC
+Pedidos acima de GZIP_THRESHOLD bytes são enviados comprimidos com gzip (as respostas
+grandes já chegam comprimidas) e multicall() agrupa várias chamadas num só pedido HTTP.
+Os conteúdos XML/CSV seguem como Binary comprimido com zlib (parâmetro transfer).
+"""
+
+import zlib
+import xmlrpc.client
+
+SERVER_URL = 'http://localhost:8000'
+
+# Corpo mínimo (bytes) para comprimir o pedido
+GZIP_THRESHOLD = 1400
+
+# Formato dos conteúdos XML/CSV: string, binary ou zlib
+TRANSFER = 'zlib'
+
+
+class GzipTransport(xmlrpc.client.Transport):
+    encode_threshold = GZIP_THRESHOLD
+
+
+def connect(url=SERVER_URL):
+    """Cria o proxy XML-RPC com compressão gzip"""
+    return xmlrpc.client.ServerProxy(url, transport=GzipTransport(), allow_none=True)
+
+
+def multicall(server, calls):
+    """Executa [(método, (args...)), ...] com system.multicall - devolve a lista de resultados"""
+    batch = xmlrpc.client.MultiCall(server)
+    for method, args in calls:
+        getattr(batch, method)(*args)
+    return list(batch())
+
+
+def encode_payload(content, transfer=TRANSFER):
+    """Prepara conteúdo XML/CSV (str) para envio no formato transfer"""
+    if transfer == 'string':
+        return content
+    data = content.encode('utf-8')
+    if transfer == 'zlib':
+        data = zlib.compress(data)
+    return xmlrpc.client.Binary(data)
+
+
+def decode_payload(value, transfer=TRANSFER):
+    """Converte conteúdo recebido (str ou Binary) para str"""
+    if not isinstance(value, xmlrpc.client.Binary):
+        return value
+    data = zlib.decompress(value.data) if transfer == 'zlib' else value.data
+    return data.decode('utf-8')
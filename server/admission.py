@@ -0,0 +1,163 @@
+import os
+import time
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+
+from metrics import metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Controlo de admissão nos servidores (false = pedidos aceites sem limite, como antes)
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+
+# Pedidos em simultâneo por classe de método (0 = sem limite)
+ADMISSION_LIMITS = {
+    'cpu': int(os.getenv('ADMISSION_CPU_LIMIT', 2 * (os.cpu_count() or 2))),  # conversões, consultas, validação
+    'write': int(os.getenv('ADMISSION_WRITE_LIMIT', 16)),  # armazenamento e atualização
+    'read': int(os.getenv('ADMISSION_READ_LIMIT', 64))  # leitura e listagem
+}
+
+# Total de bytes de conteúdo em processamento (0 = sem limite)
+ADMISSION_MAX_INFLIGHT_BYTES = int(os.getenv('ADMISSION_MAX_INFLIGHT_BYTES', 512 * 1024 * 1024))  # 512MB
+
+# Pedidos que podem esperar por vaga em cada classe e tempo máximo de espera (s)
+ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 32))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 5))
+
+# Sugestão de espera (s) devolvida aos pedidos rejeitados, aumentada com a fila
+ADMISSION_RETRY_AFTER = float(os.getenv('ADMISSION_RETRY_AFTER', 1))
+
+
+class AdmissionRejected(Exception):
+    """Pedido rejeitado por falta de capacidade - retry_after em segundos"""
+    
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Servidor sobrecarregado: {reason} (tente novamente dentro de {retry_after:.1f}s)")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """Vaga ocupada por um pedido admitido e bytes que lhe estão reservados"""
+    
+    def __init__(self, method_class, size):
+        self.method_class = method_class
+        self.size = size
+
+
+class AdmissionController:
+    """Controlo de admissão por classe de método e por bytes em processamento
+    
+    Um pedido entra se a sua classe tiver vaga e os seus bytes couberem no total;
+    caso contrário espera numa fila limitada, no máximo ADMISSION_QUEUE_TIMEOUT.
+    A fila de cada classe é FIFO: só o primeiro da fila pode entrar e um pedido novo
+    não passa à frente de quem já espera. Com a fila cheia, ou esgotada a espera, é
+    rejeitado com uma sugestão de quando voltar a tentar. Os pedidos de controlo
+    (ping, prontidão, métricas) não passam aqui.
+    """
+    
+    def __init__(self, limits=ADMISSION_LIMITS, max_inflight_bytes=ADMISSION_MAX_INFLIGHT_BYTES,
+                 queue_size=ADMISSION_QUEUE_SIZE, queue_timeout=ADMISSION_QUEUE_TIMEOUT):
+        self.limits = dict(limits)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._active = {method_class: 0 for method_class in self.limits}
+        # Pedidos à espera de cada classe, por ordem de chegada
+        self._queues = {method_class: deque() for method_class in self.limits}
+        self._inflight_bytes = 0
+        
+        for method_class, limit in self.limits.items():
+            metrics.set(f'admission_{method_class}_limit', limit)
+        metrics.set('admission_max_inflight_bytes', max_inflight_bytes)
+    
+    def _fits(self, method_class, size):
+        limit = self.limits[method_class]
+        if limit and self._active[method_class] >= limit:
+            return False
+        return not self.max_inflight_bytes or self._inflight_bytes + size <= self.max_inflight_bytes
+    
+    def _retry_after(self, method_class):
+        limit = self.limits[method_class] or 1
+        return ADMISSION_RETRY_AFTER * (1 + len(self._queues[method_class]) / limit)
+    
+    def _reject(self, method_class, reason):
+        metrics.increment('admission_rejected')
+        metrics.increment(f'admission_{method_class}_rejected')
+        logger.warning(f"Pedido {method_class} rejeitado: {reason}")
+        raise AdmissionRejected(reason, self._retry_after(method_class))
+    
+    def _publish(self, method_class):
+        metrics.set(f'admission_{method_class}_active', self._active[method_class])
+        metrics.set(f'admission_{method_class}_waiting', len(self._queues[method_class]))
+        metrics.set('admission_inflight_bytes', self._inflight_bytes)
+    
+    def acquire(self, method_class, size=0):
+        """Ocupa uma vaga da classe e reserva size bytes - devolve o ticket ou lança AdmissionRejected"""
+        with self._condition:
+            if self.max_inflight_bytes and size > self.max_inflight_bytes:
+                self._reject(method_class, f"pedido de {size} bytes acima do limite de {self.max_inflight_bytes}")
+            
+            queue = self._queues[method_class]
+            if queue or not self._fits(method_class, size):
+                if len(queue) >= self.queue_size:
+                    self._reject(method_class, "fila de espera cheia")
+                
+                waiter = object()
+                queue.append(waiter)
+                self._publish(method_class)
+                deadline = time.monotonic() + self.queue_timeout
+                try:
+                    while queue[0] is not waiter or not self._fits(method_class, size):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._reject(method_class, "tempo de espera esgotado")
+                        self._condition.wait(remaining)
+                finally:
+                    queue.remove(waiter)
+                    # O seguinte da fila pode já caber (ou caber agora que este desistiu)
+                    self._condition.notify_all()
+                metrics.increment('admission_queued')
+            
+            self._active[method_class] += 1
+            self._inflight_bytes += size
+            self._publish(method_class)
+            metrics.increment('admission_admitted')
+            return _Ticket(method_class, size)
+    
+    def reserve(self, ticket, size, cumulative=True):
+        """Reserva os bytes de mais um bloco de um stream, sem esperar
+        
+        Com cumulative os bytes somam-se aos já reservados (o handler guarda o stream
+        em memória, ex.: CSV). Sem ele os do bloco anterior são libertados: só serve
+        para handlers que escrevem cada bloco antes de ler o seguinte (GridFS, spool).
+        """
+        with self._condition:
+            change = size if cumulative else size - ticket.size
+            if self.max_inflight_bytes and change > 0 and self._inflight_bytes + change > self.max_inflight_bytes:
+                self._reject(ticket.method_class, "limite de bytes em processamento atingido")
+            ticket.size += change
+            self._inflight_bytes += change
+            metrics.set('admission_inflight_bytes', self._inflight_bytes)
+            if change < 0:
+                self._condition.notify_all()
+    
+    def release(self, ticket):
+        with self._condition:
+            self._active[ticket.method_class] -= 1
+            self._inflight_bytes -= ticket.size
+            self._publish(ticket.method_class)
+            self._condition.notify_all()
+    
+    @contextmanager
+    def admit(self, method_class, size=0):
+        """with controller.admit('cpu', len(content)) as ticket: ..."""
+        ticket = self.acquire(method_class, size)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
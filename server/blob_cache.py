@@ -0,0 +1,142 @@
+import os
+import glob
+import mmap
+import uuid
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos
+    fcntl = None
+
+from metrics import metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache local em disco para documentos GridFS (partilhável entre processos do mesmo host)
+XML_CACHE_ENABLED = os.getenv('XML_CACHE_ENABLED', 'true').lower() == 'true'
+XML_CACHE_DIR = os.getenv('XML_CACHE_DIR', '/tmp/xml_cache')
+XML_CACHE_MAX_BYTES = int(os.getenv('XML_CACHE_MAX_BYTES', 2 * 1024 * 1024 * 1024))  # 2GB
+
+
+class BlobCache:
+    """Cache de blobs XML em disco, lidos com mmap e limitada por bytes (LRU)
+    
+    Cada blob é guardado em <xml_id>_<validador>.xml. O validador muda quando o
+    documento é atualizado, pelo que entradas antigas nunca são servidas. A escrita
+    é atómica (ficheiro temporário + os.replace) e a ordem LRU é dada pelo mtime,
+    atualizado a cada leitura - o que permite vários processos usarem a mesma pasta.
+    
+    Os mmaps devolvidos por open e put pertencem ao chamador, que os fecha quando
+    acaba de os ler (storage.close_source); remover o ficheiro não os invalida.
+    """
+    
+    def __init__(self, cache_dir=XML_CACHE_DIR, max_bytes=XML_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _path(self, xml_id, validator):
+        return os.path.join(self.cache_dir, f"{xml_id}_{validator}.xml")
+    
+    def _map(self, path):
+        """Abre o ficheiro com mmap só de leitura"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def open(self, xml_id, validator):
+        """Devolve o blob mapeado em memória ou None se não estiver em cache"""
+        path = self._path(xml_id, validator)
+        try:
+            # Marca o acesso para a ordem LRU
+            os.utime(path)
+            mapped = self._map(path)
+        except FileNotFoundError:
+            metrics.increment('blob_cache_misses')
+            return None
+        
+        metrics.increment('blob_cache_hits')
+        return mapped
+    
+    def put(self, xml_id, validator, chunks):
+        """Escreve o blob a partir de blocos de bytes e devolve-o mapeado em memória
+        
+        O mapeamento é criado antes de o ficheiro entrar na cache: um evict (deste ou de
+        outro processo) que o remova logo a seguir, por exemplo um documento maior do que
+        max_bytes, não afeta o conteúdo devolvido.
+        """
+        path = self._path(xml_id, validator)
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            mapped = self._map(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        # Versões anteriores do mesmo documento deixam de ser válidas
+        self.invalidate(xml_id, keep=path)
+        self.evict()
+        
+        return mapped
+    
+    def invalidate(self, xml_id, keep=None):
+        """Remove as entradas de um documento (exceto a indicada em keep)"""
+        for path in glob.glob(os.path.join(self.cache_dir, f"{xml_id}_*.xml")):
+            if path != keep:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    
+    def evict(self):
+        """Remove os blobs menos usados até a cache ficar abaixo do limite de bytes"""
+        lock_file = open(os.path.join(self.cache_dir, '.lock'), 'w')
+        try:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            
+            entries = []
+            for path in glob.glob(os.path.join(self.cache_dir, '*.xml')):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                # Leitores com o ficheiro mapeado continuam a ver os dados após a remoção
+                try:
+                    os.remove(path)
+                    metrics.increment('blob_cache_evictions')
+                except FileNotFoundError:
+                    pass
+                total -= size
+            
+            metrics.set('blob_cache_bytes', total)
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+
+def get_blob_cache():
+    """Cria a cache local em disco, se ativa"""
+    if not XML_CACHE_ENABLED:
+        return None
+    try:
+        return BlobCache()
+    except OSError as e:
+        logger.warning(f"Cache local de XML desativada: {e}")
+        return None
@@ -0,0 +1,58 @@
+import logging
+import signal
+import threading
+
+import grpc_server
+import xmlrpc_server
+import http_gateway
+from xml_service_core import XMLServiceCore
+from admission import AdmissionController, ADMISSION_ENABLED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def serve():
+    """Inicia os servidores XML-RPC, gRPC e o gateway HTTP no mesmo processo, sobre o mesmo núcleo
+    
+    A ligação ao MongoDB, o pool de processos, o singleflight, as caches de documentos
+    e de schemas/XPath compilados e os limites de admissão são partilhados: um
+    documento carregado por um pedido XML-RPC serve os pedidos gRPC e HTTP seguintes e vice-versa.
+    """
+    core = XMLServiceCore()
+    admission = AdmissionController() if ADMISSION_ENABLED else None
+    
+    grpc, _ = grpc_server.create_server(core, admission)
+    xmlrpc = xmlrpc_server.create_server(core, admission)
+    xmlrpc_thread = threading.Thread(target=xmlrpc.serve_forever, name='xmlrpc-server', daemon=True)
+    http = http_gateway.create_server(core, admission)
+    http_thread = threading.Thread(target=http.serve_forever, name='http-gateway', daemon=True)
+    
+    def shutdown(signum, frame):
+        logger.info("Sinal de paragem recebido, a terminar servidores...")
+        grpc.stop(grace=grpc_server.GRPC_GRACE_PERIOD)
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    grpc.start()
+    xmlrpc_thread.start()
+    http_thread.start()
+    logger.info(f"Servidor combinado iniciado: gRPC na porta {grpc_server.GRPC_PORT}, "
+                f"XML-RPC em http://0.0.0.0:{xmlrpc_server.XMLRPC_PORT}, "
+                f"HTTP em http://0.0.0.0:{http_gateway.HTTP_PORT}")
+    grpc.wait_for_termination()
+    
+    # Espera pelos pedidos XML-RPC e HTTP em curso antes de fechar o armazenamento
+    xmlrpc.shutdown()
+    xmlrpc_thread.join()
+    xmlrpc.server_close()
+    http.shutdown()
+    http_thread.join()
+    http.server_close()
+    core.close()
+    logger.info("Servidor combinado parado")
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,55 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from metrics import metrics
+
+# Nº de schemas XSD, XSLT e expressões XPath compilados mantidos (LRU)
+COMPILED_CACHE_SIZE = int(os.getenv('COMPILED_CACHE_SIZE', 256))
+
+
+def file_key(kind, path):
+    """Chave de um objeto compilado a partir de um ficheiro (muda quando o ficheiro é alterado)"""
+    stat = os.stat(path)
+    return (kind, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class CompiledCache:
+    """Objetos compilados do lxml (XMLSchema, XSLT, XPath) reutilizados entre pedidos
+    
+    Um objeto compilado não pode ser usado por duas threads ao mesmo tempo (o
+    error_log é do objeto), por isso cada chave guarda as instâncias livres: um
+    pedido retira uma, ou compila outra se estiverem todas em uso, e devolve-a no fim.
+    """
+    
+    def __init__(self, max_keys=COMPILED_CACHE_SIZE):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._free = OrderedDict()
+    
+    @contextmanager
+    def use(self, key, build):
+        """with cache.use(chave, função que compila) as objeto: ..."""
+        instance = None
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                instance = free.pop()
+                self._free.move_to_end(key)
+        
+        if instance is None:
+            metrics.increment('compiled_cache_misses')
+            instance = build()
+        else:
+            metrics.increment('compiled_cache_hits')
+        
+        yield instance
+        
+        # Só volta à cache se o pedido terminou sem exceção
+        if self.max_keys:
+            with self._lock:
+                self._free.setdefault(key, []).append(instance)
+                self._free.move_to_end(key)
+                while len(self._free) > self.max_keys:
+                    self._free.popitem(last=False)
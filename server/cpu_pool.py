@@ -0,0 +1,172 @@
+import os
+import mmap
+import logging
+import threading
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from xml_converter import XMLConverter
+from metrics import metrics
+from deadline import DEADLINE_POLL_INTERVAL
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Processos para conversões pesadas (0 = executa na thread do pedido)
+CPU_POOL_WORKERS = int(os.getenv('CPU_POOL_WORKERS', 0))
+
+# Métodos do XMLConverter enviados para o pool de processos
+CPU_POOL_METHODS = {
+    method.strip()
+    for method in os.getenv(
+        'CPU_POOL_METHODS',
+        'csv_to_xml,json_to_xml,xml_to_json,generate_xsd_from_xml,validate_xml,query_xml_xpath,query_xml_xquery,transform_xml,ingest_csv'
+    ).split(',')
+    if method.strip()
+}
+
+# Segundos que as tarefas abandonadas têm para terminar num pool retirado antes de os processos serem terminados
+CPU_POOL_ABANDON_GRACE = float(os.getenv('CPU_POOL_ABANDON_GRACE', 5))
+
+# Conversor de cada processo do pool (criado uma vez no arranque do processo)
+_worker_converter = None
+
+
+def _init_worker():
+    global _worker_converter
+    _worker_converter = XMLConverter()
+
+
+def _run_in_worker(method, args):
+    return getattr(_worker_converter, method)(*args)
+
+
+def _picklable(arg):
+    """Conteúdo que pode ser enviado para o processo (buffers e streams passam a bytes)"""
+    if isinstance(arg, (mmap.mmap, memoryview)):
+        return bytes(arg)
+    if hasattr(arg, 'read'):
+        return arg.read()
+    if isinstance(arg, Iterator):
+        return b''.join(arg)
+    return arg
+
+
+class CPUPool:
+    """Executa métodos do XMLConverter num pool de processos, fora do GIL do servidor
+    
+    Sem processos configurados (ou para métodos fora de CPU_POOL_METHODS) a chamada é
+    feita diretamente no conversor do servidor, que lê buffers e streams sem cópias.
+    Conteúdos em mmap/memoryview, streams e iteradores de blocos são lidos para bytes,
+    já que têm de ser serializados para o processo.
+    """
+    
+    def __init__(self, converter, workers=CPU_POOL_WORKERS, methods=CPU_POOL_METHODS):
+        self.converter = converter
+        self.workers = workers
+        self.methods = methods
+        self._lock = threading.Lock()
+        # Pools retirados -> (processos, tarefas abandonadas que ainda os ocupam)
+        self._retired = {}
+        self._executor = self._create_executor() if workers > 0 else None
+        if self._executor:
+            logger.info(f"Pool de processos ativo ({workers} processos): {', '.join(sorted(methods))}")
+    
+    def _create_executor(self):
+        # spawn: o servidor já tem threads ativas (pymongo, pedidos), fork não é seguro
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+    
+    def offloads(self, method):
+        """Indica se o método corre no pool de processos (e não na thread do pedido)"""
+        return self._executor is not None and method in self.methods
+    
+    def run(self, method, *args, deadline=None):
+        """Executa converter.<method>(*args) - devolve o mesmo resultado da chamada direta
+        
+        Com deadline, a thread do pedido deixa de esperar pelo processo quando o cliente
+        desiste (Cancelled); uma tarefa ainda na fila é retirada dela. Uma tarefa já em
+        execução não pode ser interrompida no processo: o pool é retirado (_retire).
+        """
+        executor = self._executor
+        if executor is None or method not in self.methods:
+            if deadline is not None:
+                deadline.check('evaluate')
+            return getattr(self.converter, method)(*args)
+        
+        args = tuple(_picklable(arg) for arg in args)
+        metrics.increment('cpu_pool_tasks')
+        try:
+            future = executor.submit(_run_in_worker, method, args)
+            if deadline is None:
+                return future.result()
+            while True:
+                try:
+                    return future.result(timeout=DEADLINE_POLL_INTERVAL)
+                except FutureTimeout:
+                    if deadline.cancelled():
+                        if not future.cancel():
+                            self._retire(executor, future)
+                        deadline.check('evaluate')
+        except BrokenProcessPool:
+            # Um processo terminou de forma anormal: recria o pool para os pedidos seguintes
+            logger.error("Pool de processos interrompido - a recriar")
+            metrics.increment('cpu_pool_restarts')
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = self._create_executor()
+            raise
+    
+    def _retire(self, executor, future):
+        """Substitui o pool onde ficou uma tarefa abandonada em execução
+        
+        Os pedidos seguintes vão para um pool novo; as tarefas do antigo têm até
+        CPU_POOL_ABANDON_GRACE segundos para terminar e depois os processos que
+        restam são terminados (as tarefas de outros pedidos ainda em curso nesse
+        pool falham com BrokenProcessPool).
+        """
+        with self._lock:
+            if executor in self._retired:
+                self._retired[executor][1].append(future)
+                return
+            if self._executor is not executor:
+                # Já recriado (BrokenProcessPool) ou encerrado
+                return
+            self._executor = self._create_executor()
+            # Os processos são lidos antes do shutdown, que deixa de os expor
+            self._retired[executor] = (list((executor._processes or {}).values()), [future])
+        executor.shutdown(wait=False)
+        
+        logger.warning("Tarefa abandonada em execução no pool de processos - a recriar o pool")
+        metrics.increment('cpu_pool_recycles')
+        threading.Thread(target=self._reap, args=(executor,), name='cpu-pool-reap', daemon=True).start()
+    
+    def _reap(self, executor, timeout=CPU_POOL_ABANDON_GRACE):
+        with self._lock:
+            _, abandoned = self._retired.get(executor, ((), []))
+            abandoned = list(abandoned)
+        wait(abandoned, timeout=timeout)
+        with self._lock:
+            if executor not in self._retired:
+                return
+            processes, abandoned = self._retired.pop(executor)
+        if all(future.done() for future in abandoned):
+            return
+        logger.warning(f"Tarefas abandonadas não terminaram em {timeout}s - a terminar {len(processes)} processos")
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+    
+    def shutdown(self):
+        with self._lock:
+            retired = list(self._retired)
+        for executor in retired:
+            self._reap(executor, timeout=0)
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
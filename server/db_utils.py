@@ -1,9 +1,20 @@
+import bson
+import pymongo
 from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, PyMongoError
+from pymongo.errors import ConnectionFailure, PyMongoError, BulkWriteError, DuplicateKeyError
 import gridfs
+from xml_diff import compute_delta, apply_delta, delta_size
+from log_writer import ConversionLogWriter
+from blob_cache import get_blob_cache
+from storage import StorageBackend, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, STREAM_CHUNK_SIZE, content_bytes, content_text, close_source
+from path_summary import PathSummaryBuilder, compute_path_summary, answer_from_summary
 import os
+import re
+import json
+import base64
+import hashlib
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,7 +22,53 @@ logger = logging.getLogger(__name__)
 # Limite MongoDB: 16MB, usamos 15MB como margem de segurança
 MAX_DOCUMENT_SIZE = 15 * 1024 * 1024  # 15MB em bytes
 
-class DatabaseConnection:
+# Escrita dos logs de conversão em segundo plano (write-behind)
+LOG_WRITE_BEHIND = os.getenv('LOG_WRITE_BEHIND', 'true').lower() == 'true'
+
+# Versionamento: a cada N versões guarda-se um snapshot completo em vez de um delta
+SNAPSHOT_INTERVAL = int(os.getenv('XML_SNAPSHOT_INTERVAL', 10))
+
+# Versão gravada há mais do que isto (s) sem o documento apontar para ela: atualização interrompida
+VERSION_ORPHAN_GRACE = float(os.getenv('XML_VERSION_ORPHAN_GRACE', 60))
+
+# Campos devolvidos na listagem (nunca o conteúdo)
+LIST_PROJECTION = {'filename': 1, 'created_at': 1, 'is_gridfs': 1, 'size': 1}
+
+# Leitura do conteúdo: o resumo estrutural só é pedido quando necessário
+CONTENT_PROJECTION = {'path_summary': 0}
+
+# Só os metadados (validação de ETags sem ler o conteúdo)
+INFO_PROJECTION = {'content': 0, 'path_summary': 0}
+
+
+def _summary_size(summary):
+    """Tamanho do resumo estrutural em BSON - guardado no documento de xml_data, conta para o limite de 16MB"""
+    return len(bson.encode({'path_summary': summary}))
+
+
+def _fit_summary(summary, room):
+    """Resumo que cabe em room bytes; se não couber fica só o cabeçalho, marcado como truncado
+    
+    Um resumo truncado nunca responde a consultas (são avaliadas sobre o documento).
+    """
+    if summary is None or _summary_size(summary) <= room:
+        return summary
+    logger.warning(f"Resumo estrutural com {len(summary['paths'])} caminhos não cabe no documento - guardado truncado")
+    return dict(summary, paths=[], truncated=True)
+
+
+def _inline_size(document):
+    """Bytes do conteúdo original guardado inline no documento de xml_data (0 no GridFS)"""
+    if document.get('is_gridfs', False):
+        return 0
+    return document.get('base_size', document.get('size', 0))
+
+
+class DatabaseConnection(StorageBackend):
+    """Backend de armazenamento MongoDB (GridFS para documentos > 15MB)"""
+    
+    name = 'mongo'
+    
     def __init__(self):
         self.mongo_host = os.getenv('MONGO_HOST', 'localhost')
         self.mongo_user = os.getenv('MONGO_USER', 'user')
@@ -21,6 +78,8 @@ class DatabaseConnection:
         self.client = None
         self.db = None
         self.fs = None  # GridFS para ficheiros grandes
+        self.log_writer = None  # Escrita assíncrona dos logs de conversão
+        self.blob_cache = get_blob_cache()  # Cache local em disco (mmap) para documentos GridFS
     
     def connect(self):
         """Estabelece conexão com a base de dados MongoDB"""
@@ -42,8 +101,25 @@ class DatabaseConnection:
             logger.error(f"Erro inesperado ao conectar: {e}")
             return False
     
+    def start_log_writer(self):
+        """Passa a escrever os logs de conversão em segundo plano, em lotes"""
+        if self.log_writer is None:
+            self.log_writer = ConversionLogWriter(self.get_collection('conversion_log'))
+            self.log_writer.start()
+    
+    def is_connected(self):
+        return self.client is not None
+    
+    def timeout(self, seconds):
+        """Prazo das operações no bloco: o pymongo aplica-o como maxTimeMS e timeout de socket"""
+        return pymongo.timeout(seconds)
+    
     def disconnect(self):
         """Fecha a conexão com a base de dados"""
+        # Escreve os logs pendentes antes de fechar a conexão
+        if self.log_writer:
+            self.log_writer.stop()
+            self.log_writer = None
         if self.client:
             self.client.close()
             logger.info("Conexão com MongoDB fechada")
@@ -54,16 +130,23 @@ class DatabaseConnection:
             raise Exception("Conexão não estabelecida. Execute connect() primeiro.")
         return self.db[collection_name]
     
-    def insert_xml(self, filename, content):
-        """Insere documento XML - usa GridFS se > 15MB"""
+    def insert_xml(self, filename, content, job_id=None):
+        """Insere documento XML - usa GridFS se > 15MB
+        
+        job_id identifica o trabalho assíncrono que produziu o documento (índice único em xml_data).
+        """
         try:
-            content_size = len(content.encode('utf-8'))
+            data = content_bytes(content)
+            content_size = len(data)
+            content_hash = hashlib.sha256(data).hexdigest()
+            path_summary = compute_path_summary(data)
             
-            # Se o conteúdo for maior que 15MB, usa GridFS
-            if content_size > MAX_DOCUMENT_SIZE:
+            # Se o conteúdo (com o resumo, guardado no mesmo documento) for maior que 15MB, usa GridFS
+            if content_size + _summary_size(path_summary) > MAX_DOCUMENT_SIZE:
                 logger.info(f"Documento grande ({content_size} bytes) - usando GridFS")
+                path_summary = _fit_summary(path_summary, MAX_DOCUMENT_SIZE)
                 file_id = self.fs.put(
-                    content.encode('utf-8'),
+                    data,
                     filename=filename,
                     created_at=datetime.now(),
                     updated_at=datetime.now(),
@@ -77,10 +160,19 @@ class DatabaseConnection:
                     'gridfs_id': file_id,
                     'is_gridfs': True,
                     'size': content_size,
+                    'content_hash': content_hash,
+                    'path_summary': path_summary,
                     'created_at': datetime.now(),
                     'updated_at': datetime.now()
                 }
-                result = collection.insert_one(document)
+                if job_id is not None:
+                    document['job_id'] = job_id
+                try:
+                    result = collection.insert_one(document)
+                except PyMongoError:
+                    # Sem referência o ficheiro GridFS ficaria órfão
+                    self.fs.delete(file_id)
+                    raise
                 logger.info(f"Documento XML inserido em GridFS com ID: {result.inserted_id}")
                 return str(result.inserted_id)
             else:
@@ -88,12 +180,16 @@ class DatabaseConnection:
                 collection = self.get_collection('xml_data')
                 document = {
                     'filename': filename,
-                    'content': content,
+                    'content': content_text(content),
                     'is_gridfs': False,
                     'size': content_size,
+                    'content_hash': content_hash,
+                    'path_summary': path_summary,
                     'created_at': datetime.now(),
                     'updated_at': datetime.now()
                 }
+                if job_id is not None:
+                    document['job_id'] = job_id
                 result = collection.insert_one(document)
                 logger.info(f"Documento XML inserido com ID: {result.inserted_id}")
                 return str(result.inserted_id)
@@ -101,24 +197,146 @@ class DatabaseConnection:
             logger.error(f"Erro ao inserir XML: {e}")
             raise e
     
+    def insert_xml_many(self, documents):
+        """Insere vários documentos XML (filename, content) - insert_many(ordered=False) e GridFS se > 15MB"""
+        try:
+            collection = self.get_collection('xml_data')
+            results = [None] * len(documents)
+            inline_documents = []
+            inline_indexes = []
+            
+            for index, (filename, content) in enumerate(documents):
+                data = content_bytes(content)
+                content_size = len(data)
+                path_summary = compute_path_summary(data)
+                
+                # Documentos grandes (conteúdo e resumo) seguem individualmente para o GridFS
+                if content_size + _summary_size(path_summary) > MAX_DOCUMENT_SIZE:
+                    try:
+                        results[index] = {'xml_id': self.insert_xml(filename, content), 'error': None}
+                    except PyMongoError as e:
+                        results[index] = {'xml_id': None, 'error': str(e)}
+                    continue
+                
+                inline_documents.append({
+                    'filename': filename,
+                    'content': content_text(content),
+                    'is_gridfs': False,
+                    'size': content_size,
+                    'content_hash': hashlib.sha256(data).hexdigest(),
+                    'path_summary': path_summary,
+                    'created_at': datetime.now(),
+                    'updated_at': datetime.now()
+                })
+                inline_indexes.append(index)
+            
+            if inline_documents:
+                # ordered=False: uma falha não impede a inserção dos restantes documentos
+                failed = {}
+                try:
+                    collection.insert_many(inline_documents, ordered=False)
+                except BulkWriteError as e:
+                    failed = {error['index']: error['errmsg'] for error in e.details.get('writeErrors', [])}
+                
+                for position, index in enumerate(inline_indexes):
+                    if position in failed:
+                        results[index] = {'xml_id': None, 'error': failed[position]}
+                    else:
+                        results[index] = {'xml_id': str(inline_documents[position]['_id']), 'error': None}
+            
+            stored = sum(1 for result in results if result['xml_id'])
+            logger.info(f"Lote de {len(documents)} documentos XML inserido ({stored} com sucesso)")
+            return results
+        except PyMongoError as e:
+            logger.error(f"Erro ao inserir lote de XMLs: {e}")
+            raise e
+    
+    def insert_xml_stream(self, filename, chunks):
+        """Insere documento XML recebido em blocos de bytes - escreve diretamente no GridFS se > 15MB"""
+        try:
+            buffered = []
+            buffered_size = 0
+            chunks = iter(chunks)
+            
+            # Acumula blocos até ultrapassar o limite do documento
+            for chunk in chunks:
+                buffered.append(chunk)
+                buffered_size += len(chunk)
+                if buffered_size > MAX_DOCUMENT_SIZE:
+                    break
+            
+            # Documento pequeno - armazena diretamente
+            if buffered_size <= MAX_DOCUMENT_SIZE:
+                return self.insert_xml(filename, b''.join(buffered))
+            
+            logger.info(f"Documento em streaming (> {MAX_DOCUMENT_SIZE} bytes) - usando GridFS")
+            grid_in = self.fs.new_file(
+                filename=filename,
+                created_at=datetime.now(),
+                updated_at=datetime.now(),
+                content_type='application/xml'
+            )
+            content_size = 0
+            content_hash = hashlib.sha256()
+            # O resumo estrutural é calculado à medida que os blocos chegam
+            summary_builder = PathSummaryBuilder()
+            try:
+                for chunk in buffered:
+                    grid_in.write(chunk)
+                    content_hash.update(chunk)
+                    summary_builder.feed(chunk)
+                    content_size += len(chunk)
+                buffered = None
+                
+                for chunk in chunks:
+                    grid_in.write(chunk)
+                    content_hash.update(chunk)
+                    summary_builder.feed(chunk)
+                    content_size += len(chunk)
+                grid_in.close()
+            except Exception:
+                grid_in.abort()
+                raise
+            
+            # Criar referência na coleção xml_data
+            collection = self.get_collection('xml_data')
+            document = {
+                'filename': filename,
+                'gridfs_id': grid_in._id,
+                'is_gridfs': True,
+                'size': content_size,
+                'content_hash': content_hash.hexdigest(),
+                'path_summary': _fit_summary(summary_builder.close(), MAX_DOCUMENT_SIZE),
+                'created_at': datetime.now(),
+                'updated_at': datetime.now()
+            }
+            result = collection.insert_one(document)
+            logger.info(f"Documento XML inserido em GridFS (streaming) com ID: {result.inserted_id}")
+            return str(result.inserted_id)
+        except PyMongoError as e:
+            logger.error(f"Erro ao inserir XML em streaming: {e}")
+            raise e
+    
     def retrieve_xml(self, xml_id):
         """Recupera documento XML pelo ID - suporta GridFS"""
         try:
             from bson.objectid import ObjectId
             collection = self.get_collection('xml_data')
-            document = collection.find_one({'_id': ObjectId(xml_id)})
+            document = collection.find_one({'_id': ObjectId(xml_id)}, CONTENT_PROJECTION)
             
             if not document:
                 return None
             
+            # Documento versionado: reconstrói a versão mais recente (snapshot + deltas)
+            if document.get('version', 1) > 1:
+                document['content'] = self._reconstruct_content(document, document['version'])
             # Se está em GridFS, recupera o conteúdo
+            elif document.get('is_gridfs', False):
+                document['content'] = self._load_base_content(document)
+            
+            # Converte gridfs_id para string
             if document.get('is_gridfs', False):
-                gridfs_id = document.get('gridfs_id')
-                grid_out = self.fs.get(gridfs_id)
-                content = grid_out.read().decode('utf-8')
-                document['content'] = content
-                # Converte gridfs_id para string
-                document['gridfs_id'] = str(gridfs_id)
+                document['gridfs_id'] = str(document['gridfs_id'])
             
             # Converte ObjectId para string para serialização
             document['_id'] = str(document['_id'])
@@ -130,38 +348,486 @@ class DatabaseConnection:
             logger.error(f"Erro ao recuperar XML: {e}")
             raise e
     
-    def list_xml_files(self):
-        """Lista todos os documentos XML armazenados"""
+    def _cache_validator(self, document):
+        """Identifica o conteúdo atual do documento (hash ou versão + updated_at)"""
+        if document.get('content_hash'):
+            return document['content_hash']
+        updated_at = int(document['updated_at'].timestamp() * 1000) if 'updated_at' in document else 0
+        return f"v{document.get('version', 1)}-{updated_at}"
+    
+    def _iter_latest_chunks(self, document, chunk_size=STREAM_CHUNK_SIZE):
+        """Blocos de bytes da versão mais recente do documento"""
+        if document.get('version', 1) > 1:
+            yield self._reconstruct_content(document, document['version']).encode('utf-8')
+        elif document.get('is_gridfs', False):
+            grid_out = self.fs.get(document['gridfs_id'])
+            yield from iter(lambda: grid_out.read(chunk_size), b'')
+        else:
+            yield document['content'].encode('utf-8')
+    
+    def _load_source(self, xml_id, document):
+        """Conteúdo da versão mais recente do documento lido - formata o documento (sem conteúdo) para devolver
+        
+        Documentos GridFS ou versionados são servidos pela cache local em disco, como
+        mmap que o lxml lê diretamente; os restantes devolvem o conteúdo como str.
+        """
+        is_blob = document.get('is_gridfs', False) or document.get('version', 1) > 1
+        if is_blob and self.blob_cache:
+            validator = self._cache_validator(document)
+            source = self.blob_cache.open(xml_id, validator)
+            if source is None:
+                source = self.blob_cache.put(xml_id, validator, self._iter_latest_chunks(document))
+        elif is_blob:
+            source = b''.join(self._iter_latest_chunks(document))
+        else:
+            source = document['content']
+        
+        self._format_document(document)
+        return source
+    
+    def _format_document(self, document):
+        """Converte ObjectId e datas do documento lido para tipos serializáveis"""
+        document.pop('content', None)
+        document['_id'] = str(document['_id'])
+        if document.get('is_gridfs', False):
+            document['gridfs_id'] = str(document['gridfs_id'])
+        document['created_at'] = document['created_at'].isoformat() if 'created_at' in document else None
+        document['updated_at'] = document['updated_at'].isoformat() if 'updated_at' in document else None
+        return document
+    
+    def retrieve_xml_source(self, xml_id):
+        """Recupera documento XML para processamento - devolve (documento, conteúdo)"""
         try:
+            from bson.objectid import ObjectId
             collection = self.get_collection('xml_data')
-            documents = list(collection.find({}, {'filename': 1, 'created_at': 1, 'is_gridfs': 1, 'size': 1}))
+            document = collection.find_one({'_id': ObjectId(xml_id)}, CONTENT_PROJECTION)
+            
+            if not document:
+                return None, None
             
-            # Converte ObjectId para string
-            for doc in documents:
-                doc['_id'] = str(doc['_id'])
-                if 'created_at' in doc:
-                    doc['created_at'] = doc['created_at'].isoformat()
-                doc['storage'] = 'GridFS' if doc.get('is_gridfs', False) else 'Document'
+            source = self._load_source(xml_id, document)
+            return document, source
+        except Exception as e:
+            logger.error(f"Erro ao recuperar XML: {e}")
+            raise e
+    
+    def retrieve_xml_for_plan(self, xml_id, plan):
+        """Uma só leitura do documento com o resumo estrutural e o conteúdo inline - devolve (documento, conteúdo, resposta)
+        
+        O conteúdo de documentos GridFS ou versionados só é lido se o resumo não responder.
+        """
+        try:
+            from bson.objectid import ObjectId
+            collection = self.get_collection('xml_data')
+            document = collection.find_one({'_id': ObjectId(xml_id)})
+            
+            if not document:
+                return None, None, None
+            
+            answer = answer_from_summary(document.pop('path_summary', None), plan)
+            if answer is not None:
+                return self._format_document(document), None, answer
+            
+            source = self._load_source(xml_id, document)
+            return document, source, None
+        except Exception as e:
+            logger.error(f"Erro ao recuperar XML: {e}")
+            raise e
+    
+    def retrieve_xml_info(self, xml_id):
+        """Recupera só os metadados do documento (hash do conteúdo, versão, datas), sem o conteúdo"""
+        try:
+            from bson.objectid import ObjectId
+            collection = self.get_collection('xml_data')
+            document = collection.find_one({'_id': ObjectId(xml_id)}, INFO_PROJECTION)
+            
+            if not document:
+                return None
+            
+            document['_id'] = str(document['_id'])
+            if document.get('is_gridfs', False):
+                document['gridfs_id'] = str(document['gridfs_id'])
+            document['created_at'] = document['created_at'].isoformat() if 'created_at' in document else None
+            document['updated_at'] = document['updated_at'].isoformat() if 'updated_at' in document else None
+            
+            return document
+        except Exception as e:
+            logger.error(f"Erro ao recuperar metadados do XML: {e}")
+            raise e
+    
+    def open_xml_stream(self, xml_id, chunk_size=STREAM_CHUNK_SIZE):
+        """Abre documento XML para leitura em blocos - devolve (documento, iterador de bytes)"""
+        try:
+            from bson.objectid import ObjectId
+            collection = self.get_collection('xml_data')
+            document = collection.find_one({'_id': ObjectId(xml_id)}, CONTENT_PROJECTION)
+            
+            if not document:
+                return None, None
+            
+            # Documento versionado: a versão mais recente é reconstruída em memória
+            if document.get('version', 1) > 1:
+                content = self._reconstruct_content(document, document['version'])
+                document['_id'] = str(document['_id'])
+                document.pop('content', None)
+                if document.get('is_gridfs', False):
+                    document['gridfs_id'] = str(document['gridfs_id'])
+                data = memoryview(content.encode('utf-8'))
+                chunks = (bytes(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size))
+                return document, chunks
+            
+            document['_id'] = str(document['_id'])
+            
+            # Se está em GridFS, lê os blocos diretamente do GridOut
+            if document.get('is_gridfs', False):
+                grid_out = self.fs.get(document['gridfs_id'])
+                document['gridfs_id'] = str(document['gridfs_id'])
+                return document, iter(lambda: grid_out.read(chunk_size), b'')
             
-            return documents
+            # Documento pequeno - divide o conteúdo em blocos
+            data = memoryview(document.pop('content').encode('utf-8'))
+            chunks = (bytes(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size))
+            return document, chunks
+        except Exception as e:
+            logger.error(f"Erro ao abrir XML em streaming: {e}")
+            raise e
+    
+    def _build_list_filter(self, filename_prefix=None, min_size=None, max_size=None,
+                           created_after=None, created_before=None):
+        """Constrói o filtro da listagem (prefixo, tamanho e datas usam os índices existentes)"""
+        query = {}
+        if filename_prefix:
+            # Regex ancorada ao início permite usar o índice de filename
+            query['filename'] = {'$regex': f'^{re.escape(filename_prefix)}'}
+        if min_size or max_size:
+            query['size'] = {}
+            if min_size:
+                query['size']['$gte'] = min_size
+            if max_size:
+                query['size']['$lte'] = max_size
+        if created_after or created_before:
+            query['created_at'] = {}
+            if created_after:
+                query['created_at']['$gte'] = datetime.fromisoformat(created_after)
+            if created_before:
+                query['created_at']['$lt'] = datetime.fromisoformat(created_before)
+        return query
+    
+    def _format_file_info(self, doc):
+        """Converte documento da listagem para formato serializável"""
+        doc['_id'] = str(doc['_id'])
+        if 'created_at' in doc:
+            doc['created_at'] = doc['created_at'].isoformat()
+        doc['storage'] = 'GridFS' if doc.get('is_gridfs', False) else 'Document'
+        return doc
+    
+    def _encode_cursor(self, doc):
+        """Gera o token de paginação a partir do último documento da página"""
+        token = json.dumps({'created_at': doc['created_at'].isoformat(), '_id': str(doc['_id'])})
+        return base64.urlsafe_b64encode(token.encode('utf-8')).decode('ascii')
+    
+    def _decode_cursor(self, cursor):
+        """Converte o token de paginação numa condição keyset sobre (created_at, _id)"""
+        from bson.objectid import ObjectId
+        token = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        created_at = datetime.fromisoformat(token['created_at'])
+        last_id = ObjectId(token['_id'])
+        return {'$or': [
+            {'created_at': {'$gt': created_at}},
+            {'created_at': created_at, '_id': {'$gt': last_id}}
+        ]}
+    
+    def list_xml_page(self, page_size=DEFAULT_PAGE_SIZE, cursor=None, include_count=False, **filters):
+        """Lista uma página de documentos XML com paginação keyset sobre (created_at, _id)"""
+        try:
+            collection = self.get_collection('xml_data')
+            page_size = max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+            query = self._build_list_filter(**filters)
+            
+            page_query = query
+            if cursor:
+                page_query = {'$and': [query, self._decode_cursor(cursor)]} if query else self._decode_cursor(cursor)
+            
+            # Pede um documento extra para saber se existe página seguinte
+            documents = list(
+                collection.find(page_query, LIST_PROJECTION)
+                .sort([('created_at', 1), ('_id', 1)])
+                .limit(page_size + 1)
+            )
+            has_more = len(documents) > page_size
+            documents = documents[:page_size]
+            next_cursor = self._encode_cursor(documents[-1]) if has_more else None
+            
+            # Contagem total apenas quando pedida (count_documents em vez de len())
+            total = collection.count_documents(query) if include_count else None
+            
+            return {
+                'files': [self._format_file_info(doc) for doc in documents],
+                'next_cursor': next_cursor,
+                'has_more': has_more,
+                'total': total
+            }
         except PyMongoError as e:
             logger.error(f"Erro ao listar XMLs: {e}")
             raise e
     
+    def iter_xml_files(self, batch_size=DEFAULT_PAGE_SIZE, **filters):
+        """Itera sobre os documentos XML sem materializar a coleção completa"""
+        try:
+            collection = self.get_collection('xml_data')
+            query = self._build_list_filter(**filters)
+            cursor = (
+                collection.find(query, LIST_PROJECTION)
+                .sort([('created_at', 1), ('_id', 1)])
+                .batch_size(batch_size)
+            )
+            for doc in cursor:
+                yield self._format_file_info(doc)
+        except PyMongoError as e:
+            logger.error(f"Erro ao listar XMLs: {e}")
+            raise e
+    
+    def list_xml_files(self, **filters):
+        """Lista todos os documentos XML armazenados"""
+        return list(self.iter_xml_files(**filters))
+    
+    def retrieve_path_summary(self, xml_id):
+        """Recupera os metadados e o resumo estrutural do documento, sem o conteúdo
+        
+        Documentos inseridos antes do resumo existir são analisados uma vez e o
+        resumo fica guardado para as consultas seguintes.
+        """
+        try:
+            from bson.objectid import ObjectId
+            collection = self.get_collection('xml_data')
+            document = collection.find_one({'_id': ObjectId(xml_id)}, {'content': 0})
+            
+            if not document:
+                return None
+            
+            if 'path_summary' not in document:
+                _, source = self.retrieve_xml_source(xml_id)
+                document['path_summary'] = _fit_summary(compute_path_summary(source), MAX_DOCUMENT_SIZE - _inline_size(document))
+                close_source(source)
+                # Não sobrepõe um resumo escrito entretanto por uma atualização
+                collection.update_one(
+                    {'_id': document['_id'], 'path_summary': {'$exists': False}},
+                    {'$set': {'path_summary': document['path_summary']}}
+                )
+            
+            document['_id'] = str(document['_id'])
+            if document.get('is_gridfs', False):
+                document['gridfs_id'] = str(document['gridfs_id'])
+            document['created_at'] = document['created_at'].isoformat() if 'created_at' in document else None
+            document['updated_at'] = document['updated_at'].isoformat() if 'updated_at' in document else None
+            
+            return document
+        except Exception as e:
+            logger.error(f"Erro ao recuperar resumo estrutural do XML: {e}")
+            raise e
+    
+    def _load_base_content(self, document):
+        """Lê o conteúdo original (versão 1) do documento - inline ou GridFS"""
+        if document.get('is_gridfs', False):
+            return self.fs.get(document['gridfs_id']).read().decode('utf-8')
+        return document['content']
+    
+    def _reconstruct_content(self, document, version):
+        """Reconstrói uma versão a partir do snapshot mais próximo e dos deltas seguintes"""
+        versions = self.get_collection('xml_versions')
+        
+        snapshot = versions.find_one(
+            {'xml_id': document['_id'], 'kind': 'snapshot', 'version': {'$lte': version}},
+            sort=[('version', -1)]
+        )
+        if snapshot:
+            base_version = snapshot['version']
+            if snapshot.get('is_gridfs', False):
+                content = self.fs.get(snapshot['gridfs_id']).read().decode('utf-8')
+            else:
+                content = snapshot['content']
+        else:
+            base_version = 1
+            content = self._load_base_content(document)
+        
+        deltas = versions.find(
+            {'xml_id': document['_id'], 'kind': 'delta', 'version': {'$gt': base_version, '$lte': version}}
+        ).sort('version', 1)
+        for delta in deltas:
+            content = apply_delta(content, delta['delta'])
+        
+        return content
+    
     def update_xml(self, xml_id, content):
-        """Atualiza conteúdo de um documento XML"""
+        """Atualiza documento XML criando uma nova versão (delta ou snapshot) - devolve o número da versão"""
         try:
             from bson.objectid import ObjectId
             collection = self.get_collection('xml_data')
-            result = collection.update_one(
-                {'_id': ObjectId(xml_id)},
-                {'$set': {'content': content, 'updated_at': datetime.now()}}
-            )
-            return result.modified_count
+            versions = self.get_collection('xml_versions')
+            
+            document = collection.find_one({'_id': ObjectId(xml_id)}, CONTENT_PROJECTION)
+            if not document:
+                return None
+            
+            current_version = document.get('version', 1)
+            if current_version > 1:
+                previous_content = self._reconstruct_content(document, current_version)
+            else:
+                previous_content = self._load_base_content(document)
+            
+            new_version = current_version + 1
+            # O delta é calculado sobre o texto; os bytes servem para o tamanho e o GridFS
+            data = content_bytes(content)
+            content = content_text(content)
+            content_size = len(data)
+            delta = compute_delta(previous_content, content)
+            
+            version_entry = {
+                'xml_id': document['_id'],
+                'version': new_version,
+                'size': content_size,
+                'created_at': datetime.now()
+            }
+            
+            # Snapshot periódico (ou quando o delta não compensa ou não cabe num documento) limita a reconstrução
+            delta_bytes = delta_size(delta)
+            if new_version % SNAPSHOT_INTERVAL == 0 or delta_bytes > content_size // 2 or delta_bytes > MAX_DOCUMENT_SIZE:
+                version_entry['kind'] = 'snapshot'
+                if content_size > MAX_DOCUMENT_SIZE:
+                    version_entry['is_gridfs'] = True
+                    version_entry['gridfs_id'] = self.fs.put(
+                        data,
+                        filename=document['filename'],
+                        created_at=datetime.now(),
+                        content_type='application/xml'
+                    )
+                else:
+                    version_entry['content'] = content
+            else:
+                version_entry['kind'] = 'delta'
+                version_entry['delta'] = delta
+            
+            # Índice único (xml_id, version) impede duas atualizações concorrentes da mesma versão
+            try:
+                try:
+                    versions.insert_one(version_entry)
+                except DuplicateKeyError:
+                    if not self._discard_orphan_version(document['_id'], new_version):
+                        raise
+                    version_entry.pop('_id', None)
+                    versions.insert_one(version_entry)
+            except Exception:
+                # Sem a versão o snapshot no GridFS ficaria órfão
+                if version_entry.get('is_gridfs', False):
+                    self.fs.delete(version_entry['gridfs_id'])
+                raise
+            
+            changes = {
+                'version': new_version,
+                'size': content_size,
+                'content_hash': hashlib.sha256(data).hexdigest(),
+                # O conteúdo original continua inline no mesmo documento
+                'path_summary': _fit_summary(compute_path_summary(data), MAX_DOCUMENT_SIZE - _inline_size(document)),
+                'updated_at': datetime.now()
+            }
+            if current_version == 1:
+                # Preserva o tamanho da versão original
+                changes['base_size'] = document.get('size', 0)
+            # Só avança se o documento ainda estiver na versão lida (documentos antigos não têm o campo)
+            version_filter = {'_id': document['_id'], 'version': current_version if current_version > 1 else {'$in': [1, None]}}
+            result = collection.update_one(version_filter, {'$set': changes})
+            if result.matched_count == 0:
+                self._delete_version_entry(version_entry)
+                raise PyMongoError(f"XML {xml_id} alterado ou removido durante a atualização (versão {current_version})")
+            
+            logger.info(f"XML {xml_id} atualizado para a versão {new_version} ({version_entry['kind']})")
+            return new_version
         except Exception as e:
             logger.error(f"Erro ao atualizar XML: {e}")
             raise e
     
+    def _delete_version_entry(self, version_entry):
+        """Remove uma versão (e o seu snapshot no GridFS) para a qual o documento não aponta"""
+        self.get_collection('xml_versions').delete_one({'_id': version_entry['_id']})
+        if version_entry.get('is_gridfs', False):
+            self.fs.delete(version_entry['gridfs_id'])
+    
+    def _discard_orphan_version(self, xml_id, version):
+        """Remove a versão deixada por uma atualização interrompida entre as duas escritas - True se removida
+        
+        Só é órfã se o documento não apontar para ela e tiver sido gravada há mais de
+        VERSION_ORPHAN_GRACE segundos; uma atualização concorrente ainda em curso é mais recente.
+        """
+        stale = self.get_collection('xml_versions').find_one({'xml_id': xml_id, 'version': version})
+        if not stale or stale['created_at'] > datetime.now() - timedelta(seconds=VERSION_ORPHAN_GRACE):
+            return False
+        if self.get_collection('xml_data').count_documents({'_id': xml_id, 'version': {'$gte': version}}):
+            return False
+        logger.warning(f"Versão {version} do XML {xml_id} sem referência (atualização interrompida) - removida")
+        self._delete_version_entry(stale)
+        return True
+    
+    def retrieve_xml_version(self, xml_id, version):
+        """Recupera uma versão específica de um documento XML"""
+        try:
+            from bson.objectid import ObjectId
+            collection = self.get_collection('xml_data')
+            document = collection.find_one({'_id': ObjectId(xml_id)}, CONTENT_PROJECTION)
+            
+            if not document or version < 1 or version > document.get('version', 1):
+                return None
+            
+            if version == 1:
+                content = self._load_base_content(document)
+            else:
+                content = self._reconstruct_content(document, version)
+            
+            return {
+                '_id': str(document['_id']),
+                'filename': document['filename'],
+                'version': version,
+                'content': content,
+                'is_gridfs': document.get('is_gridfs', False)
+            }
+        except Exception as e:
+            logger.error(f"Erro ao recuperar versão do XML: {e}")
+            raise e
+    
+    def list_xml_versions(self, xml_id):
+        """Lista as versões de um documento XML"""
+        try:
+            from bson.objectid import ObjectId
+            collection = self.get_collection('xml_data')
+            document = collection.find_one({'_id': ObjectId(xml_id)}, {'content': 0})
+            
+            if not document:
+                return None
+            
+            # A versão 1 é o conteúdo original guardado em xml_data
+            history = [{
+                'version': 1,
+                'kind': 'snapshot',
+                'size': document.get('base_size', document.get('size', 0)),
+                'created_at': document['created_at'].isoformat()
+            }]
+            
+            versions = self.get_collection('xml_versions').find(
+                {'xml_id': document['_id']},
+                {'version': 1, 'kind': 1, 'size': 1, 'created_at': 1}
+            ).sort('version', 1)
+            for entry in versions:
+                history.append({
+                    'version': entry['version'],
+                    'kind': entry['kind'],
+                    'size': entry['size'],
+                    'created_at': entry['created_at'].isoformat()
+                })
+            
+            return history
+        except Exception as e:
+            logger.error(f"Erro ao listar versões do XML: {e}")
+            raise e
+    
     def delete_xml(self, xml_id):
         """Remove documento XML - suporta GridFS"""
         try:
@@ -169,13 +835,22 @@ class DatabaseConnection:
             collection = self.get_collection('xml_data')
             
             # Verificar se está em GridFS
-            document = collection.find_one({'_id': ObjectId(xml_id)})
+            document = collection.find_one({'_id': ObjectId(xml_id)}, CONTENT_PROJECTION)
             if document and document.get('is_gridfs', False):
                 # Remover do GridFS primeiro
                 gridfs_id = document.get('gridfs_id')
                 self.fs.delete(gridfs_id)
                 logger.info(f"Arquivo GridFS {gridfs_id} removido")
             
+            # Remover histórico de versões (e snapshots em GridFS)
+            versions = self.get_collection('xml_versions')
+            for entry in versions.find({'xml_id': ObjectId(xml_id), 'is_gridfs': True}, {'gridfs_id': 1}):
+                self.fs.delete(entry['gridfs_id'])
+            versions.delete_many({'xml_id': ObjectId(xml_id)})
+            
+            if self.blob_cache:
+                self.blob_cache.invalidate(xml_id)
+            
             # Remover documento da coleção
             result = collection.delete_one({'_id': ObjectId(xml_id)})
             return result.deleted_count > 0
@@ -190,9 +865,8 @@ class DatabaseConnection:
             raise e
     
     def log_conversion(self, xml_id, conversion_type, status, error_message=None):
-        """Regista log de conversão"""
+        """Regista log de conversão - assíncrono se a escrita em segundo plano estiver ativa"""
         try:
-            collection = self.get_collection('conversion_log')
             log_entry = {
                 'xml_id': xml_id,
                 'conversion_type': conversion_type,
@@ -200,6 +874,13 @@ class DatabaseConnection:
                 'error_message': error_message,
                 'created_at': datetime.now()
             }
+            
+            # Fora do caminho do pedido: o log é escrito mais tarde em lote
+            if self.log_writer:
+                self.log_writer.submit(log_entry)
+                return None
+            
+            collection = self.get_collection('conversion_log')
             result = collection.insert_one(log_entry)
             return str(result.inserted_id)
         except PyMongoError as e:
@@ -211,11 +892,26 @@ class DatabaseConnection:
             xml_collection = self.get_collection('xml_data')
             xml_collection.create_index('filename')
             xml_collection.create_index('created_at')
+            # Índices para paginação keyset e filtro por tamanho
+            xml_collection.create_index([('created_at', 1), ('_id', 1)])
+            xml_collection.create_index('size')
+            # Um só XML por trabalho assíncrono, mesmo que o trabalho seja retomado por outro worker
+            xml_collection.create_index(
+                'job_id', unique=True, partialFilterExpression={'job_id': {'$exists': True}}
+            )
+            
+            versions_collection = self.get_collection('xml_versions')
+            versions_collection.create_index([('xml_id', 1), ('version', 1)], unique=True)
             
             log_collection = self.get_collection('conversion_log')
             log_collection.create_index('xml_id')
             log_collection.create_index('conversion_type')
             
+            # Fila de trabalhos assíncronos: reclamação por estado e lease (jobs.py)
+            jobs_collection = self.get_collection('jobs')
+            jobs_collection.create_index([('status', 1), ('created_at', 1)])
+            jobs_collection.create_index([('status', 1), ('lease_until', 1)])
+            
             logger.info("Índices criados com sucesso")
         except Exception as e:
             logger.error(f"Erro ao criar índices: {e}")
@@ -224,5 +920,9 @@ class DatabaseConnection:
 def get_db_connection():
     db = DatabaseConnection()
     if db.connect():
+        if LOG_WRITE_BEHIND:
+            db.start_log_writer()
         return db
+    # Liberta o MongoClient (e as threads de monitorização) da tentativa falhada
+    db.disconnect()
     return None
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import time
+import threading
+
+from metrics import metrics
+
+# Intervalo (s) entre verificações de cancelamento enquanto se espera por outro (pool de processos, singleflight)
+DEADLINE_POLL_INTERVAL = float(os.getenv('DEADLINE_POLL_INTERVAL', 0.05))
+
+# Prazos acima disto (s) são tratados como ausentes: sem prazo o gRPC devolve ~9.2e18 em time_remaining(),
+# que o pymongo não consegue usar como maxTimeMS nem como timeout de socket
+DEADLINE_MAX_SECONDS = float(os.getenv('DEADLINE_MAX_SECONDS', 24 * 3600))
+
+
+class Cancelled(Exception):
+    """Pedido abandonado pelo cliente (cancelado ou prazo esgotado) - o trabalho restante é descartado"""
+    
+    def __init__(self, stage, expired):
+        super().__init__(f"Pedido {'com prazo esgotado' if expired else 'cancelado pelo cliente'} (etapa: {stage})")
+        self.stage = stage
+        self.expired = expired
+
+
+class Deadline:
+    """Prazo e estado de cancelamento de um pedido, verificados entre as etapas do processamento
+    
+    Sem prazo nem função is_active (ex.: pedidos XML-RPC) nunca é cancelado. O trabalho
+    abandonado é contado uma vez por pedido nas métricas abandoned_work e
+    abandoned_work_<etapa>.
+    """
+    
+    def __init__(self, timeout=None, is_active=None):
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+        self._is_active = is_active
+        self._abandoned = False
+    
+    @classmethod
+    def from_grpc(cls, context):
+        """Prazo do cliente gRPC (time_remaining) e cancelamento da chamada (is_active)"""
+        timeout = context.time_remaining()
+        if timeout is not None and timeout > DEADLINE_MAX_SECONDS:
+            timeout = None
+        return cls(timeout, context.is_active)
+    
+    def remaining(self):
+        """Segundos até ao fim do prazo (None sem prazo)"""
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0)
+    
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def cancelled(self):
+        return self.expired() or (self._is_active is not None and not self._is_active())
+    
+    def check(self, stage):
+        """Lança Cancelled se o cliente já não espera pela resposta"""
+        if not self.cancelled():
+            return
+        if not self._abandoned:
+            self._abandoned = True
+            metrics.increment('abandoned_work')
+            metrics.increment(f'abandoned_work_{stage}')
+        raise Cancelled(stage, self.expired())
+
+
+class SharedDeadline(Deadline):
+    """Prazo de uma computação partilhada (singleflight): só é abandonada quando
+    todos os pedidos que esperam por ela desistiram"""
+    
+    def __init__(self, deadline):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._deadlines = [deadline]
+    
+    def add(self, deadline):
+        with self._lock:
+            self._deadlines.append(deadline)
+    
+    def remaining(self):
+        with self._lock:
+            remaining = [deadline.remaining() for deadline in self._deadlines]
+        return None if None in remaining else max(remaining)
+    
+    def expired(self):
+        with self._lock:
+            return all(deadline.expired() for deadline in self._deadlines)
+    
+    def cancelled(self):
+        with self._lock:
+            return all(deadline.cancelled() for deadline in self._deadlines)
@@ -0,0 +1,75 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from metrics import metrics
+
+# Árvores lxml mantidas em memória (0 = cache desativada)
+DOCUMENT_CACHE_SIZE = int(os.getenv('DOCUMENT_CACHE_SIZE', 32))
+
+# Documentos maiores do que isto (bytes do XML) não são guardados: a árvore ocupa várias vezes mais
+DOCUMENT_CACHE_MAX_DOCUMENT = int(os.getenv('DOCUMENT_CACHE_MAX_DOCUMENT', 4 * 1024 * 1024))  # 4MB
+
+
+def document_version(document):
+    """Identifica o conteúdo atual do documento (hash do conteúdo ou, sem ele, a última alteração)"""
+    return document.get('content_hash') or (document.get('updated_at'), document.get('version'), document.get('size'))
+
+
+class _Entry:
+    def __init__(self, version):
+        self.version = version
+        self.tree = None
+        self.lock = threading.Lock()
+
+
+class DocumentCache:
+    """Árvores lxml dos documentos usados recentemente, partilhadas pelos pedidos do processo
+    
+    Consultas, conversões e validações seguidas sobre o mesmo documento evitam o
+    parsing, seja qual for o protocolo do pedido. O lock de cada entrada só cobre o
+    parsing (pedidos concorrentes esperam pela mesma árvore em vez de a construírem
+    duas vezes); a árvore é depois partilhada só de leitura, já que os métodos do
+    conversor não alteram os documentos lidos.
+    """
+    
+    def __init__(self, max_documents=DOCUMENT_CACHE_SIZE, max_document_bytes=DOCUMENT_CACHE_MAX_DOCUMENT):
+        self.max_documents = max_documents
+        self.max_document_bytes = max_document_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+    
+    @contextmanager
+    def use(self, xml_id, version, source, parse):
+        """with cache.use(xml_id, versão, conteúdo, parse) as árvore: ... (None se o conteúdo não puder ser lido)"""
+        if not self.max_documents or not hasattr(source, '__len__') or len(source) > self.max_document_bytes:
+            yield None
+            return
+        
+        with self._lock:
+            entry = self._entries.get(xml_id)
+            if entry is None or entry.version != version:
+                entry = self._entries[xml_id] = _Entry(version)
+            self._entries.move_to_end(xml_id)
+            while len(self._entries) > self.max_documents:
+                self._entries.popitem(last=False)
+        
+        with entry.lock:
+            if entry.tree is None:
+                metrics.increment('document_cache_misses')
+                try:
+                    entry.tree = parse(source)
+                except Exception:
+                    # Conteúdo inválido: o chamador processa-o diretamente e devolve o erro
+                    pass
+            else:
+                metrics.increment('document_cache_hits')
+            tree = entry.tree
+        
+        # Fora do lock: consultas concorrentes sobre o mesmo documento correm em paralelo
+        yield tree
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
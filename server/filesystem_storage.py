@@ -0,0 +1,259 @@
+import os
+import json
+import mmap
+import uuid
+import shutil
+import threading
+import logging
+from datetime import datetime
+
+from storage import LocalStorageBackend, STREAM_CHUNK_SIZE, content_bytes
+from path_summary import PathSummaryBuilder, compute_path_summary
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FileSystemStorage(LocalStorageBackend):
+    """Backend em sistema de ficheiros local, com leituras por mmap
+    
+    Estrutura da pasta:
+        documents/<xml_id>/meta.json   metadados e histórico de versões
+        documents/<xml_id>/v<N>.xml    conteúdo completo de cada versão
+        conversion_log.jsonl           logs de conversão (um JSON por linha)
+    """
+    
+    name = 'filesystem'
+    
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.documents_path = os.path.join(root_path, 'documents')
+        self.log_path = os.path.join(root_path, 'conversion_log.jsonl')
+        self._log_lock = threading.Lock()
+    
+    def connect(self):
+        """Cria a estrutura de pastas"""
+        try:
+            os.makedirs(self.documents_path, exist_ok=True)
+            logger.info(f"Armazenamento local em {self.root_path}")
+            return True
+        except OSError as e:
+            logger.error(f"Erro ao preparar armazenamento local: {e}")
+            return False
+    
+    def _document_path(self, xml_id):
+        # O ID é usado como nome de pasta: rejeita caminhos
+        if not xml_id or os.sep in xml_id or xml_id.startswith('.'):
+            raise ValueError(f"ID inválido: {xml_id}")
+        return os.path.join(self.documents_path, xml_id)
+    
+    def _version_path(self, xml_id, version):
+        return os.path.join(self._document_path(xml_id), f"v{version}.xml")
+    
+    def _write_atomic(self, path, data):
+        """Escreve o ficheiro de forma atómica (temporário + os.replace)"""
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    
+    def _read_meta(self, xml_id):
+        try:
+            with open(os.path.join(self._document_path(xml_id), 'meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def _write_meta(self, xml_id, meta):
+        path = os.path.join(self._document_path(xml_id), 'meta.json')
+        self._write_atomic(path, json.dumps(meta).encode('utf-8'))
+    
+    def _map(self, path):
+        """Abre o ficheiro com mmap só de leitura"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _all_documents(self):
+        documents = []
+        for entry in os.scandir(self.documents_path):
+            meta = self._read_meta(entry.name) if entry.is_dir() else None
+            if meta:
+                meta['created_at'] = datetime.fromisoformat(meta['created_at'])
+                documents.append(meta)
+        return documents
+    
+    def insert_xml(self, filename, content):
+        """Insere documento XML como ficheiro local"""
+        xml_id = uuid.uuid4().hex
+        data = content_bytes(content)
+        now = datetime.now().isoformat()
+        
+        os.makedirs(self._document_path(xml_id))
+        self._write_atomic(self._version_path(xml_id, 1), data)
+        self._write_meta(xml_id, {
+            '_id': xml_id,
+            'filename': filename,
+            'size': len(data),
+            'version': 1,
+            'path_summary': compute_path_summary(data),
+            'created_at': now,
+            'updated_at': now,
+            'versions': [{'version': 1, 'kind': 'snapshot', 'size': len(data), 'created_at': now}]
+        })
+        return xml_id
+    
+    def insert_xml_stream(self, filename, chunks):
+        """Insere documento recebido em blocos, escrevendo-os diretamente no ficheiro"""
+        xml_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        os.makedirs(self._document_path(xml_id))
+        
+        path = self._version_path(xml_id, 1)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        size = 0
+        summary_builder = PathSummaryBuilder()
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    summary_builder.feed(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except Exception:
+            shutil.rmtree(self._document_path(xml_id), ignore_errors=True)
+            raise
+        
+        self._write_meta(xml_id, {
+            '_id': xml_id,
+            'filename': filename,
+            'size': size,
+            'version': 1,
+            'path_summary': summary_builder.close(),
+            'created_at': now,
+            'updated_at': now,
+            'versions': [{'version': 1, 'kind': 'snapshot', 'size': size, 'created_at': now}]
+        })
+        return xml_id
+    
+    def retrieve_xml_source(self, xml_id):
+        """Devolve (documento, conteúdo mapeado em memória com mmap)"""
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None, None
+        
+        source = self._map(self._version_path(xml_id, meta['version']))
+        meta.pop('versions', None)
+        meta.pop('path_summary', None)
+        meta['is_gridfs'] = False
+        return meta, source
+    
+    def retrieve_xml(self, xml_id):
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None
+        
+        with open(self._version_path(xml_id, meta['version']), 'r', encoding='utf-8') as f:
+            meta['content'] = f.read()
+        meta.pop('versions', None)
+        meta.pop('path_summary', None)
+        meta['is_gridfs'] = False
+        return meta
+    
+    def open_xml_stream(self, xml_id, chunk_size=STREAM_CHUNK_SIZE):
+        """Lê o ficheiro da versão mais recente em blocos"""
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None, None
+        
+        def chunks():
+            with open(self._version_path(xml_id, meta['version']), 'rb') as f:
+                yield from iter(lambda: f.read(chunk_size), b'')
+        
+        meta.pop('versions', None)
+        meta.pop('path_summary', None)
+        return meta, chunks()
+    
+    def retrieve_xml_info(self, xml_id):
+        """Devolve os metadados guardados em meta.json, sem abrir o ficheiro do conteúdo"""
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None
+        meta.pop('versions', None)
+        meta.pop('path_summary', None)
+        meta['is_gridfs'] = False
+        return meta
+    
+    def retrieve_path_summary(self, xml_id):
+        """Devolve os metadados e o resumo estrutural guardado em meta.json"""
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None
+        meta.pop('versions', None)
+        return meta
+    
+    def update_xml(self, xml_id, content):
+        """Guarda uma nova versão completa do documento"""
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None
+        
+        version = meta['version'] + 1
+        data = content_bytes(content)
+        now = datetime.now().isoformat()
+        
+        # O_EXCL impede que duas atualizações concorrentes criem a mesma versão
+        fd = os.open(self._version_path(xml_id, version), os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        
+        meta['version'] = version
+        meta['size'] = len(data)
+        meta['path_summary'] = compute_path_summary(data)
+        meta['updated_at'] = now
+        meta['versions'].append({'version': version, 'kind': 'snapshot', 'size': len(data), 'created_at': now})
+        self._write_meta(xml_id, meta)
+        return version
+    
+    def retrieve_xml_version(self, xml_id, version):
+        meta = self._read_meta(xml_id)
+        if meta is None or version < 1 or version > meta['version']:
+            return None
+        
+        with open(self._version_path(xml_id, version), 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        return {
+            '_id': xml_id,
+            'filename': meta['filename'],
+            'version': version,
+            'content': content,
+            'is_gridfs': False
+        }
+    
+    def list_xml_versions(self, xml_id):
+        meta = self._read_meta(xml_id)
+        if meta is None:
+            return None
+        return meta['versions']
+    
+    def delete_xml(self, xml_id):
+        path = self._document_path(xml_id)
+        if not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+        return True
+    
+    def log_conversion(self, xml_id, conversion_type, status, error_message=None):
+        log_entry = {
+            'xml_id': xml_id,
+            'conversion_type': conversion_type,
+            'status': status,
+            'error_message': error_message,
+            'created_at': datetime.now().isoformat()
+        }
+        with self._log_lock:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        return None
@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import os
+import signal
+import tempfile
+from concurrent import futures
+
+import grpc
+
+import xml_service_pb2 as pb2
+import xml_service_pb2_grpc as pb2_grpc
+import xml_service_v2_pb2 as pb2_v2
+import xml_service_v2_pb2_grpc as pb2_v2_grpc
+from grpc_server import (XMLServiceServicer, StreamReservation, GRPC_PORT, GRPC_GRACE_PERIOD,
+                         GRPC_METHOD_CLASSES, GRPC_STREAM_RETAINED_BYTES, admitted)
+from admission import AdmissionController, AdmissionRejected, ADMISSION_ENABLED
+from deadline import Deadline, Cancelled
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Threads dedicadas ao acesso ao armazenamento (MongoDB/GridFS) e às conversões
+GRPC_AIO_IO_WORKERS = int(os.getenv('GRPC_AIO_IO_WORKERS', 32))
+
+# Número máximo de RPCs em curso (os restantes recebem RESOURCE_EXHAUSTED)
+GRPC_AIO_MAX_CONCURRENT_RPCS = int(os.getenv('GRPC_AIO_MAX_CONCURRENT_RPCS', 10000))
+
+# Streams do cliente ficam em memória até este tamanho e depois num ficheiro temporário
+GRPC_AIO_SPOOL_MEMORY = int(os.getenv('GRPC_AIO_SPOOL_MEMORY', 4 * 1024 * 1024))  # 4MB em bytes
+
+# Tamanho máximo de um stream do cliente (acima dele o pedido termina com RESOURCE_EXHAUSTED)
+GRPC_AIO_SPOOL_MAX_BYTES = int(os.getenv('GRPC_AIO_SPOOL_MAX_BYTES', 1024 * 1024 * 1024))  # 1GB em bytes
+
+SERVICE = pb2.DESCRIPTOR.services_by_name['XMLService']
+SERVICE_V2 = pb2_v2.DESCRIPTOR.services_by_name['XMLService']
+
+_DONE = object()
+
+
+class _Aborted(Exception):
+    """context.abort() chamado por um handler síncrono numa thread de I/O"""
+    
+    def __init__(self, code, details):
+        super().__init__(details)
+        self.code = code
+        self.details = details
+
+
+class _ThreadContext:
+    """Contexto entregue aos handlers síncronos: abort() termina o handler e é
+    reencaminhado para o contexto assíncrono no event loop"""
+    
+    def __init__(self, context):
+        self._context = context
+    
+    def abort(self, code, details):
+        raise _Aborted(code, details)
+    
+    def is_active(self):
+        return not self._context.done()
+    
+    def add_callback(self, callback):
+        self._context.add_done_callback(lambda _: callback())
+        return True
+    
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class _SpoolLimitExceeded(Exception):
+    """Stream do cliente acima de GRPC_AIO_SPOOL_MAX_BYTES"""
+
+
+class _SpooledRequests:
+    """Mensagens de um stream do cliente guardadas à medida que chegam
+    
+    O stream é lido no event loop; o handler síncrono só ocupa uma thread depois
+    de o cliente terminar o envio, mesmo que este seja lento. Cada mensagem passa
+    por on_message (admissão, prazo) antes de ser guardada.
+    """
+    
+    def __init__(self, max_bytes=GRPC_AIO_SPOOL_MAX_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=GRPC_AIO_SPOOL_MEMORY)
+        self._message_type = None
+        self.max_bytes = max_bytes
+        self.size = 0
+    
+    async def receive(self, request_iterator, on_message):
+        async for message in request_iterator:
+            on_message(message)
+            self._message_type = type(message)
+            data = message.SerializeToString()
+            self.size += len(data)
+            if self.max_bytes and self.size > self.max_bytes:
+                raise _SpoolLimitExceeded(f"Stream acima do limite de {self.max_bytes} bytes")
+            self._file.write(len(data).to_bytes(4, 'big'))
+            self._file.write(data)
+    
+    def __iter__(self):
+        self._file.seek(0)
+        while True:
+            header = self._file.read(4)
+            if len(header) < 4:
+                return
+            yield self._message_type.FromString(self._file.read(int.from_bytes(header, 'big')))
+    
+    def close(self):
+        self._file.close()
+
+
+async def _abort_rejected(context, rejected):
+    """RESOURCE_EXHAUSTED com a espera sugerida em grpc-retry-pushback-ms, como no servidor síncrono"""
+    context.set_trailing_metadata((('grpc-retry-pushback-ms', str(int(rejected.retry_after * 1000))),))
+    await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(rejected))
+
+
+class AsyncXMLServiceServicer:
+    """XMLService para grpc.aio sobre os handlers do servidor síncrono
+    
+    As conexões e os clientes lentos ficam no event loop; cada handler corre
+    num executor dedicado ao I/O e só ocupa uma thread enquanto trabalha
+    (as conversões pesadas seguem para o pool de processos do servicer).
+    Nos streams do cliente a admissão é feita antes de guardar o stream e os
+    bytes e o prazo são verificados a cada mensagem recebida; os restantes
+    métodos passam pelo AdmittedServicer do servidor síncrono.
+    """
+    
+    def __init__(self, servicer, executor, service=SERVICE, admission=None):
+        self.servicer = servicer
+        self.executor = executor
+        self.admission = admission
+        admitted_servicer = admitted(servicer, service, admission)
+        for method in service.methods:
+            method_class = GRPC_METHOD_CLASSES.get(method.name) if admission else None
+            if method.client_streaming and method_class:
+                handler = getattr(servicer, method.name)
+                stream_admission = (method_class, GRPC_STREAM_RETAINED_BYTES.get(method.name))
+            else:
+                handler = getattr(admitted_servicer, method.name)
+                stream_admission = None
+            if method.server_streaming:
+                wrapper = self._server_streaming(handler, method.client_streaming, stream_admission)
+            else:
+                wrapper = self._unary(handler, method.client_streaming, stream_admission)
+            setattr(self, method.name, wrapper)
+    
+    async def _requests(self, request, context, client_streaming, stream_admission):
+        """Pedido a entregar ao handler - devolve (pedido, ticket de admissão ou None)"""
+        if not client_streaming:
+            return request, None
+        
+        ticket = None
+        reservation = None
+        if stream_admission:
+            method_class, retained = stream_admission
+            try:
+                # A espera por vaga bloqueia: corre numa thread de I/O
+                ticket = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.admission.acquire, method_class, 0
+                )
+            except AdmissionRejected as e:
+                await _abort_rejected(context, e)
+            reservation = StreamReservation(self.admission, ticket, retained)
+        
+        deadline = Deadline.from_grpc(_ThreadContext(context))
+        
+        def on_message(message):
+            deadline.check('receive')
+            if reservation:
+                reservation.add(message)
+        
+        spooled = _SpooledRequests()
+        try:
+            await spooled.receive(request, on_message)
+        except BaseException as e:
+            spooled.close()
+            if ticket is not None:
+                self.admission.release(ticket)
+            if isinstance(e, AdmissionRejected):
+                await _abort_rejected(context, e)
+            if isinstance(e, _SpoolLimitExceeded):
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+            if isinstance(e, Cancelled):
+                logger.info(f"gRPC: {e}")
+                await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED if e.expired else grpc.StatusCode.CANCELLED, str(e))
+            raise
+        return spooled, ticket
+    
+    def _unary(self, handler, client_streaming, stream_admission):
+        async def call(request, context):
+            request, ticket = await self._requests(request, context, client_streaming, stream_admission)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.executor, handler, iter(request) if client_streaming else request, _ThreadContext(context)
+                )
+            except _Aborted as e:
+                await context.abort(e.code, e.details)
+            finally:
+                if client_streaming:
+                    request.close()
+                if ticket is not None:
+                    self.admission.release(ticket)
+        return call
+    
+    def _server_streaming(self, handler, client_streaming, stream_admission):
+        async def call(request, context):
+            loop = asyncio.get_running_loop()
+            request, ticket = await self._requests(request, context, client_streaming, stream_admission)
+            responses = handler(iter(request) if client_streaming else request, _ThreadContext(context))
+            try:
+                while True:
+                    # Cada bloco é produzido numa thread; a escrita para o cliente não ocupa nenhuma
+                    response = await loop.run_in_executor(self.executor, next, responses, _DONE)
+                    if response is _DONE:
+                        break
+                    yield response
+            except _Aborted as e:
+                await context.abort(e.code, e.details)
+            finally:
+                try:
+                    responses.close()
+                except ValueError:
+                    # Cancelado enquanto a thread ainda produz o bloco seguinte
+                    pass
+                if client_streaming:
+                    request.close()
+                if ticket is not None:
+                    self.admission.release(ticket)
+        return call
+
+
+async def serve():
+    """Inicia o servidor gRPC assíncrono (grpc.aio)"""
+    executor = futures.ThreadPoolExecutor(max_workers=GRPC_AIO_IO_WORKERS, thread_name_prefix='grpc-aio-io')
+    servicer = XMLServiceServicer()
+    server = grpc.aio.server(
+        maximum_concurrent_rpcs=GRPC_AIO_MAX_CONCURRENT_RPCS,
+        options=[('grpc.so_reuseport', 0)]
+    )
+    # Limites partilhados pelos serviços v1 e v2; a espera por vaga ocupa uma thread de I/O
+    admission = AdmissionController() if ADMISSION_ENABLED else None
+    pb2_grpc.add_XMLServiceServicer_to_server(
+        AsyncXMLServiceServicer(servicer, executor, SERVICE, admission), server
+    )
+    pb2_v2_grpc.add_XMLServiceServicer_to_server(
+        AsyncXMLServiceServicer(servicer.v2, executor, SERVICE_V2, admission), server
+    )
+    server.add_insecure_port(f'[::]:{GRPC_PORT}')
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+    
+    await server.start()
+    logger.info(f"Servidor gRPC (asyncio) iniciado na porta {GRPC_PORT} ({GRPC_AIO_IO_WORKERS} threads de I/O)")
+    await stop.wait()
+    
+    logger.info("Sinal de paragem recebido, a terminar servidor gRPC...")
+    await server.stop(GRPC_GRACE_PERIOD)
+    executor.shutdown(wait=True)
+    
+    # Escreve os logs de conversão pendentes e fecha a conexão
+    servicer.close()
+    logger.info("Servidor gRPC parado")
+
+
+if __name__ == '__main__':
+    asyncio.run(serve())
@@ -3,59 +3,881 @@ from concurrent import futures
 import logging
 import time
 import os
+import json
+import argparse
+import itertools
+import signal
+from lxml import etree
 
 # Importar classes do projeto
-from db_utils import get_db_connection
-from xml_converter import XMLConverter
+from storage import content_bytes, close_source
+from xml_service_core import XMLServiceCore, ServiceError, JOBS_UNAVAILABLE
+from jobs import JOB_FINISHED
+from metrics import metrics
+from deadline import Deadline, Cancelled
+from admission import AdmissionController, AdmissionRejected, ADMISSION_ENABLED
+from supervisor import supervise
+from db_utils import MAX_DOCUMENT_SIZE
 
 # Importar código gerado do protobuf (será gerado depois)
 import xml_service_pb2 as pb2
 import xml_service_pb2_grpc as pb2_grpc
+import xml_service_v2_pb2 as pb2_v2
+import xml_service_v2_pb2_grpc as pb2_v2_grpc
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Porta e threads de I/O do servidor gRPC
+GRPC_PORT = int(os.getenv('GRPC_PORT', 50051))
+GRPC_WORKERS = int(os.getenv('GRPC_WORKERS', 10))
+
+# Modo multi-processo: tempo de drenagem no SIGTERM e espera antes de reiniciar um processo
+GRPC_GRACE_PERIOD = float(os.getenv('GRPC_GRACE_PERIOD', 5))
+GRPC_RESTART_DELAY = float(os.getenv('GRPC_RESTART_DELAY', 1))
+
+# Intervalo (s) entre leituras do estado de um trabalho no WatchJob
+JOB_WATCH_INTERVAL = float(os.getenv('JOB_WATCH_INTERVAL', 0.5))
+
+# Classe de admissão de cada método (Ping, Ready, GetMetrics e o WatchJob, de longa duração, não são limitados)
+GRPC_METHOD_CLASSES = {
+    'StoreXML': 'write',
+    'StoreXMLBatch': 'write',
+    'StoreXMLStream': 'write',
+    'UpdateXML': 'write',
+    'GetXML': 'read',
+    'GetXMLVersion': 'read',
+    'ListXMLVersions': 'read',
+    'GetXMLStream': 'read',
+    'ListXMLs': 'read',
+    'ListXMLsStream': 'read',
+    'DescribeXML': 'read',
+    'QueryXPath': 'cpu',
+    'QueryXQuery': 'cpu',
+    'ConvertToJSON': 'cpu',
+    'ValidateXML': 'cpu',
+    'ConvertCSVToXML': 'cpu',
+    'IngestCSV': 'cpu',
+    'ConvertJSONToXML': 'cpu',
+    'TransformXML': 'cpu',
+    'GenerateXSD': 'cpu',
+    'SubmitJob': 'write',
+    'GetJobStatus': 'read'
+}
+
+# Bytes de um stream do cliente que o handler guarda em memória; além deles só o bloco atual
+# conta para a admissão. Os métodos que não estão aqui guardam o stream inteiro (ex.: CSV)
+GRPC_STREAM_RETAINED_BYTES = {
+    'StoreXMLStream': MAX_DOCUMENT_SIZE,  # buffer até o documento passar para o GridFS
+    'SubmitJob': 0  # cada bloco é escrito no spool do trabalho (GridFS)
+}
+
 
 class XMLServiceServicer(pb2_grpc.XMLServiceServicer):
     """Implementação do serviço gRPC para operações XML"""
     
-    def __init__(self):
-        self.xml_converter = XMLConverter()
-        self.db = None
-        self.init_database()
+    def __init__(self, core=None):
+        # Armazenamento, conversor, pool de processos e caches (partilhados com o XML-RPC no combined_server.py)
+        self.core = core or XMLServiceCore()
+        self._owns_core = core is None
+        # Operações com conteúdo em bytes (xmlservice.v2), partilhando o armazenamento
+        self.v2 = XMLServiceV2Servicer(self)
+    
+    @property
+    def db(self):
+        return self.core.db
+    
+    @property
+    def xml_converter(self):
+        return self.core.converter
+    
+    @property
+    def cpu_pool(self):
+        return self.core.cpu_pool
+    
+    def close(self):
+        """Liberta o núcleo (armazenamento e pool de processos), se não for partilhado"""
+        if self._owns_core:
+            self.core.close()
+    
+    def GetMetrics(self, request, context):
+        """Devolve as métricas deste processo (pedidos agrupados, pool de processos, cache, logs)"""
+        return pb2.MetricsResponse(values=metrics.snapshot())
+    
+    def Ping(self, request, context):
+        """Testa conectividade do servidor"""
+        return pb2.XMLResponse(
+            success=True,
+            filename="",
+            xml_content="",
+            message="pong"
+        )
+    
+    def Ready(self, request, context):
+        """Indica se o servidor está pronto (armazenamento ligado); o Ping só indica que está vivo"""
+        return pb2.ReadyResponse(**self.core.ready_status())
+    
+    # Operações com conteúdo: a implementação é a da v2 (bytes); a v1 converte as strings
+    
+    def StoreXML(self, request, context):
+        """Armazena documento XML no MongoDB"""
+        return self.v2.StoreXML(pb2_v2.StoreXMLRequest(
+            filename=request.filename,
+            xml_content=request.xml_content.encode('utf-8')
+        ), context)
+    
+    def GetXML(self, request, context):
+        """Recupera documento XML do MongoDB"""
+        return _xml_response_v1(self.v2.GetXML(request, context))
+    
+    def StoreXMLBatch(self, request, context):
+        """Armazena vários documentos XML numa só operação"""
+        return self.v2.StoreXMLBatch(pb2_v2.StoreXMLBatchRequest(documents=[
+            pb2_v2.StoreXMLRequest(filename=document.filename, xml_content=document.xml_content.encode('utf-8'))
+            for document in request.documents
+        ]), context)
+    
+    def UpdateXML(self, request, context):
+        """Atualiza documento XML criando uma nova versão"""
+        return self.v2.UpdateXML(pb2_v2.UpdateXMLRequest(
+            xml_id=request.xml_id,
+            xml_content=request.xml_content.encode('utf-8')
+        ), context)
+    
+    def GetXMLVersion(self, request, context):
+        """Recupera uma versão específica de um documento XML"""
+        return _xml_response_v1(self.v2.GetXMLVersion(request, context))
+    
+    def ListXMLVersions(self, request, context):
+        """Lista as versões de um documento XML"""
+        try:
+            if not self.db:
+                return pb2.ListXMLVersionsResponse(
+                    success=False,
+                    message="Conexão com MongoDB não disponível"
+                )
+            
+            history = self.db.list_xml_versions(request.xml_id)
+            if history is None:
+                return pb2.ListXMLVersionsResponse(
+                    success=False,
+                    message=f"XML com ID {request.xml_id} não encontrado"
+                )
+            
+            return pb2.ListXMLVersionsResponse(
+                success=True,
+                message=f"{len(history)} versão(ões)",
+                versions=[pb2.XMLVersionInfo(**entry) for entry in history]
+            )
+        
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao listar versões do XML: {e}")
+            return pb2.ListXMLVersionsResponse(
+                success=False,
+                message=str(e)
+            )
+    
+    def StoreXMLStream(self, request_iterator, context):
+        """Armazena documento XML recebido em blocos (GridFS para documentos grandes)"""
+        try:
+            if not self.db:
+                return pb2.StoreXMLResponse(
+                    success=False,
+                    message="Conexão com MongoDB não disponível",
+                    xml_id=""
+                )
+            
+            # O primeiro bloco indica o nome do ficheiro
+            first_chunk = next(request_iterator, None)
+            if first_chunk is None:
+                return pb2.StoreXMLResponse(
+                    success=False,
+                    message="Stream vazio: nenhum bloco recebido",
+                    xml_id=""
+                )
+            
+            chunks = itertools.chain(
+                [first_chunk.data],
+                (chunk.data for chunk in request_iterator)
+            )
+            
+            # Validar XML enquanto os blocos são escritos
+            xml_id = self.db.insert_xml_stream(
+                first_chunk.filename,
+                self.xml_converter.iter_validated_chunks(chunks)
+            )
+            
+            logger.info(f"gRPC: XML armazenado em streaming com ID {xml_id}")
+            return pb2.StoreXMLResponse(
+                success=True,
+                message="XML armazenado com sucesso",
+                xml_id=xml_id
+            )
+        
+        except etree.XMLSyntaxError as e:
+            logger.error(f"gRPC: XML inválido recebido em streaming: {e}")
+            return pb2.StoreXMLResponse(
+                success=False,
+                message=f"XML inválido: {e}",
+                xml_id=""
+            )
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao armazenar XML em streaming: {e}")
+            return pb2.StoreXMLResponse(
+                success=False,
+                message=str(e),
+                xml_id=""
+            )
+    
+    def GetXMLStream(self, request, context):
+        """Envia documento XML em blocos de tamanho fixo"""
+        if not self.db:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Conexão com MongoDB não disponível")
+        
+        try:
+            document, chunks = self.db.open_xml_stream(request.xml_id)
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao abrir XML em streaming: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+        
+        if document is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f"XML com ID {request.xml_id} não encontrado")
+        
+        filename = document['filename']
+        for data in chunks:
+            yield pb2.XMLChunk(filename=filename, data=data)
+            filename = ""
+        
+        # Documento vazio: envia pelo menos o nome do ficheiro
+        if filename:
+            yield pb2.XMLChunk(filename=filename, data=b"")
+    
+    def _list_filters(self, request):
+        """Extrai os filtros da listagem a partir do pedido"""
+        return {
+            'filename_prefix': request.filename_prefix or None,
+            'min_size': request.min_size or None,
+            'max_size': request.max_size or None,
+            'created_after': request.created_after or None,
+            'created_before': request.created_before or None
+        }
+    
+    def _file_info(self, doc):
+        """Converte documento da listagem para XMLFileInfo"""
+        return pb2.XMLFileInfo(
+            xml_id=doc['_id'],
+            filename=doc['filename'],
+            created_at=doc.get('created_at', ''),
+            size=doc.get('size', 0),
+            storage=doc.get('storage', '')
+        )
+    
+    def ListXMLs(self, request, context):
+        """Lista os XMLs armazenados (todos, ou uma página com page_size/cursor)"""
+        try:
+            if not self.db:
+                return pb2.ListXMLResponse(
+                    success=False,
+                    files=[],
+                    count=0
+                )
+            
+            page = self.core.list_xml(
+                page_size=request.page_size,
+                cursor=request.cursor or None,
+                include_count=request.include_count,
+                **self._list_filters(request)
+            )
+            
+            files = [self._file_info(doc) for doc in page['files']]
+            
+            return pb2.ListXMLResponse(
+                success=True,
+                files=files,
+                count=page['total'] if page['total'] is not None else len(files),
+                next_cursor=page['next_cursor'] or "",
+                has_more=page['has_more']
+            )
+        
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao listar XMLs: {e}")
+            return pb2.ListXMLResponse(
+                success=False,
+                files=[],
+                count=0
+            )
+    
+    def ListXMLsStream(self, request, context):
+        """Lista os XMLs armazenados em streaming, sem materializar a coleção"""
+        if not self.db:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Conexão com MongoDB não disponível")
+        
+        try:
+            for doc in self.db.iter_xml_files(**self._list_filters(request)):
+                yield self._file_info(doc)
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao listar XMLs em streaming: {e}")
+            context.abort(grpc.StatusCode.INTERNAL, str(e))
+    
+    def DescribeXML(self, request, context):
+        """Descreve a estrutura de um documento XML a partir do resumo estrutural"""
+        try:
+            if not self.db:
+                return pb2.DescribeXMLResponse(
+                    success=False,
+                    message="Conexão com MongoDB não disponível"
+                )
+            
+            document = self.db.retrieve_path_summary(request.xml_id)
+            if not document:
+                return pb2.DescribeXMLResponse(
+                    success=False,
+                    message=f"XML com ID {request.xml_id} não encontrado"
+                )
+            
+            summary = document.get('path_summary')
+            if not summary:
+                return pb2.DescribeXMLResponse(
+                    success=False,
+                    message="Resumo estrutural indisponível (XML mal formado)"
+                )
+            
+            return pb2.DescribeXMLResponse(
+                success=True,
+                message=f"{len(summary['paths'])} caminho(s) distinto(s)",
+                filename=document.get('filename', ''),
+                size=document.get('size', 0),
+                element_count=summary['element_count'],
+                max_depth=summary['max_depth'],
+                paths=[pb2.PathInfo(**entry) for entry in summary['paths']],
+                truncated=summary['truncated']
+            )
+        
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao descrever XML: {e}")
+            return pb2.DescribeXMLResponse(
+                success=False,
+                message=str(e)
+            )
+    
+    def QueryXPath(self, request, context):
+        """Executa consulta XPath sobre XML armazenado"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            if not self.db:
+                return pb2.XPathResponse(
+                    success=False,
+                    results=[],
+                    message="Conexão com MongoDB não disponível"
+                )
+            
+            # Expressão inválida é rejeitada sem ler o documento
+            success, result = self.xml_converter.check_xpath(request.expression)
+            
+            if success:
+                # Executar XPath (ou responder pelo resumo estrutural, ver XMLServiceCore.run_on_document)
+                outcome = self.core.run_on_document('query_xml_xpath', request.xml_id, request.expression, deadline=deadline)
+                if outcome is None:
+                    return pb2.XPathResponse(
+                        success=False,
+                        results=[],
+                        message=f"XML com ID {request.xml_id} não encontrado"
+                    )
+                success, result = outcome
+            
+            deadline.check('serialize')
+            if success:
+                # Converter resultado para lista de strings
+                results = []
+                if isinstance(result, dict) and 'results' in result:
+                    for item in result['results']:
+                        results.append(str(item))
+                
+                # Log da consulta
+                self.db.log_conversion(request.xml_id, "xpath_query", "success")
+                
+                return pb2.XPathResponse(
+                    success=True,
+                    results=results,
+                    message="Consulta XPath executada com sucesso"
+                )
+            else:
+                self.db.log_conversion(request.xml_id, "xpath_query", "error", result)
+                return pb2.XPathResponse(
+                    success=False,
+                    results=[],
+                    message=f"Erro na consulta XPath: {result}"
+                )
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na consulta XPath: {e}")
+            return pb2.XPathResponse(
+                success=False,
+                results=[],
+                message=str(e)
+            )
+    
+    def ConvertToJSON(self, request, context):
+        """Converte XML armazenado para JSON"""
+        response = self.v2.ConvertToJSON(request, context)
+        return pb2.ConvertToJSONResponse(
+            success=response.success,
+            json_content=response.json_content.decode('utf-8'),
+            message=response.message
+        )
+    
+    def ValidateXML(self, request, context):
+        """Valida XML contra schema XSD"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            if not self.db:
+                return pb2.ValidateXMLResponse(
+                    success=False,
+                    is_valid=False,
+                    validation_result="",
+                    message="Conexão com MongoDB não disponível"
+                )
+            
+            # Validar XML (schema compilado e árvore do documento reutilizados entre pedidos)
+            schema_path = request.schema_path if request.schema_path else None
+            outcome = self.core.run_on_document('validate_xml', request.xml_id, schema_path, deadline=deadline)
+            if outcome is None:
+                return pb2.ValidateXMLResponse(
+                    success=False,
+                    is_valid=False,
+                    validation_result="",
+                    message=f"XML com ID {request.xml_id} não encontrado"
+                )
+            is_valid, validation_result = outcome
+            
+            deadline.check('serialize')
+            return pb2.ValidateXMLResponse(
+                success=True,
+                is_valid=is_valid,
+                validation_result=str(validation_result),
+                message="Validação realizada com sucesso"
+            )
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na validação XML: {e}")
+            return pb2.ValidateXMLResponse(
+                success=False,
+                is_valid=False,
+                validation_result="",
+                message=str(e)
+            )
+    
+    def _conversion_response(self, success, result, filename, conversion_type, validate=False, v2=False):
+        """Resposta de uma conversão para XML - com filename o resultado é armazenado e só o xml_id é devolvido"""
+        response_class = pb2_v2.ConvertToXMLResponse if v2 else pb2.ConvertToXMLResponse
+        if not success:
+            return response_class(
+                success=False,
+                message=f"Erro na conversão: {result}"
+            )
+        
+        if not filename:
+            return response_class(
+                success=True,
+                message="Conversão para XML realizada com sucesso",
+                xml_content=content_bytes(result) if v2 else result
+            )
+        
+        if not self.db:
+            return response_class(
+                success=False,
+                message="Conexão com MongoDB não disponível"
+            )
+        
+        if validate:
+            is_valid, validation_result = self.xml_converter.validate_xml(result)
+            if not is_valid:
+                return response_class(
+                    success=False,
+                    message=f"Resultado não é XML válido: {validation_result}"
+                )
+        
+        xml_id = self.db.insert_xml(filename, result)
+        self.db.log_conversion(xml_id, conversion_type, "success")
+        
+        logger.info(f"gRPC: Resultado de {conversion_type} armazenado com ID {xml_id}")
+        return response_class(
+            success=True,
+            message="Conversão para XML realizada e armazenada com sucesso",
+            xml_id=xml_id
+        )
+    
+    def _read_csv_chunks(self, request_iterator, deadline):
+        """Junta os blocos de CSV - devolve (primeiro bloco, conteúdo) ou (None, None) se o stream for vazio"""
+        # O primeiro bloco indica os nomes dos elementos e o ficheiro de destino
+        first_chunk = next(request_iterator, None)
+        if first_chunk is None:
+            return None, None
+        
+        csv_data = bytearray(first_chunk.data)
+        for chunk in request_iterator:
+            deadline.check('receive')
+            csv_data += chunk.data
+        return first_chunk, csv_data.decode('utf-8')
+    
+    def ConvertCSVToXML(self, request_iterator, context):
+        """Converte CSV recebido em blocos para XML"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            first_chunk, csv_content = self._read_csv_chunks(request_iterator, deadline)
+            if first_chunk is None:
+                return pb2.ConvertToXMLResponse(
+                    success=False,
+                    message="Stream vazio: nenhum bloco recebido"
+                )
+            
+            args = (csv_content, first_chunk.root_element or "dataset", first_chunk.row_element or "record")
+            if not self.cpu_pool.offloads('csv_to_xml'):
+                # Na thread do pedido o cancelamento é verificado a cada CSV_PROGRESS_ROWS linhas
+                args += (lambda position, total: deadline.check('convert'),)
+            success, result = self.cpu_pool.run('csv_to_xml', *args, deadline=deadline)
+            # O csv_to_xml devolve a interrupção como erro de conversão
+            deadline.check('convert')
+            return self._conversion_response(success, result, first_chunk.filename, "csv_to_xml")
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na conversão CSV para XML: {e}")
+            return pb2.ConvertToXMLResponse(
+                success=False,
+                message=str(e)
+            )
+    
+    def IngestCSV(self, request_iterator, context):
+        """Converte CSV recebido em blocos, armazena o XML e o XSD gerado e valida, sem devolver os conteúdos"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            if not self.db:
+                return pb2.IngestCSVResponse(
+                    success=False,
+                    message="Conexão com MongoDB não disponível"
+                )
+            
+            first_chunk, csv_content = self._read_csv_chunks(request_iterator, deadline)
+            if first_chunk is None:
+                return pb2.IngestCSVResponse(
+                    success=False,
+                    message="Stream vazio: nenhum bloco recebido"
+                )
+            if not first_chunk.filename:
+                return pb2.IngestCSVResponse(
+                    success=False,
+                    message="filename obrigatório no primeiro bloco"
+                )
+            
+            # Conversão, geração do XSD e validação sobre a mesma árvore
+            success, result = self.cpu_pool.run(
+                'ingest_csv',
+                csv_content,
+                first_chunk.root_element or "dataset",
+                first_chunk.row_element or "record",
+                deadline=deadline
+            )
+            # Nada é armazenado se o cliente já desistiu
+            deadline.check('store')
+            if not success:
+                return pb2.IngestCSVResponse(
+                    success=False,
+                    message=f"Erro na conversão: {result}"
+                )
+            
+            xml_id = self.db.insert_xml(first_chunk.filename, result['xml_content'])
+            schema_id = self.db.insert_xml(
+                f"{os.path.splitext(first_chunk.filename)[0]}.xsd",
+                result['xsd_content']
+            )
+            
+            self.db.log_conversion(xml_id, "csv_ingest", "success")
+            if not result['is_valid']:
+                self.db.log_conversion(xml_id, "xml_validation", "warning", result['validation_result'])
+            
+            logger.info(f"gRPC: CSV ingerido com ID {xml_id} (schema {schema_id})")
+            return pb2.IngestCSVResponse(
+                success=True,
+                message="CSV convertido, armazenado e validado com sucesso",
+                xml_id=xml_id,
+                schema_id=schema_id,
+                records=result['records'],
+                columns=result['columns'],
+                is_valid=result['is_valid'],
+                validation_result=str(result['validation_result'])
+            )
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na ingestão CSV: {e}")
+            return pb2.IngestCSVResponse(
+                success=False,
+                message=str(e)
+            )
+    
+    def ConvertJSONToXML(self, request, context):
+        """Converte JSON para XML"""
+        return _conversion_response_v1(self.v2.ConvertJSONToXML(pb2_v2.ConvertJSONToXMLRequest(
+            json_content=request.json_content.encode('utf-8'),
+            root_element=request.root_element,
+            filename=request.filename
+        ), context))
     
-    def init_database(self):
-        """Inicializa conexão com MongoDB"""
-        max_retries = 10
-        retry_delay = 5
+    def TransformXML(self, request, context):
+        """Aplica transformação XSLT a XML armazenado"""
+        return _conversion_response_v1(self.v2.TransformXML(request, context))
+    
+    def GenerateXSD(self, request, context):
+        """Gera schema XSD a partir de XML armazenado"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            if not self.db:
+                return pb2.GenerateXSDResponse(
+                    success=False,
+                    xsd_content="",
+                    message="Conexão com MongoDB não disponível"
+                )
+            
+            outcome = self.core.run_on_document(
+                'generate_xsd_from_xml',
+                request.xml_id,
+                request.target_namespace or "http://kaggle-data.local",
+                deadline=deadline
+            )
+            if outcome is None:
+                return pb2.GenerateXSDResponse(
+                    success=False,
+                    xsd_content="",
+                    message=f"XML com ID {request.xml_id} não encontrado"
+                )
+            success, result = outcome
+            
+            deadline.check('serialize')
+            if success:
+                self.db.log_conversion(request.xml_id, "xsd_generation", "success")
+                return pb2.GenerateXSDResponse(
+                    success=True,
+                    xsd_content=result,
+                    message="Schema XSD gerado com sucesso"
+                )
+            else:
+                self.db.log_conversion(request.xml_id, "xsd_generation", "error", result)
+                return pb2.GenerateXSDResponse(
+                    success=False,
+                    xsd_content="",
+                    message=f"Erro na geração do XSD: {result}"
+                )
         
-        for attempt in range(max_retries):
-            try:
-                self.db = get_db_connection()
-                if self.db:
-                    self.db.create_indexes()
-                    logger.info("gRPC: Conexão MongoDB estabelecida")
-                    return
-                else:
-                    logger.warning(f"gRPC: Tentativa {attempt + 1} de conexão falhou")
-            except Exception as e:
-                logger.error(f"gRPC: Erro na tentativa {attempt + 1}: {e}")
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na geração do XSD: {e}")
+            return pb2.GenerateXSDResponse(
+                success=False,
+                xsd_content="",
+                message=str(e)
+            )
+    
+    def QueryXQuery(self, request, context):
+        """Executa consulta XQuery sobre XML armazenado"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            if not self.db:
+                return pb2.XQueryResponse(
+                    success=False,
+                    results=[],
+                    message="Conexão com MongoDB não disponível"
+                )
             
-            if attempt < max_retries - 1:
-                logger.info(f"Aguardando {retry_delay}s antes da próxima tentativa...")
-                time.sleep(retry_delay)
+            outcome = self.core.run_on_document('query_xml_xquery', request.xml_id, request.expression, deadline=deadline)
+            if outcome is None:
+                return pb2.XQueryResponse(
+                    success=False,
+                    results=[],
+                    message=f"XML com ID {request.xml_id} não encontrado"
+                )
+            success, result = outcome
+            
+            deadline.check('serialize')
+            if success:
+                self.db.log_conversion(request.xml_id, "xquery_query", "success")
+                return pb2.XQueryResponse(
+                    success=True,
+                    results=[str(item) for item in result.get('results', [])],
+                    message="Consulta XQuery executada com sucesso",
+                    converted_xpath=result.get('converted_xpath', "")
+                )
+            else:
+                self.db.log_conversion(request.xml_id, "xquery_query", "error", result)
+                return pb2.XQueryResponse(
+                    success=False,
+                    results=[],
+                    message=f"Erro na consulta XQuery: {result}"
+                )
         
-        logger.error("gRPC: Não foi possível conectar ao MongoDB")
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na consulta XQuery: {e}")
+            return pb2.XQueryResponse(
+                success=False,
+                results=[],
+                message=str(e)
+            )
     
-    def Ping(self, request, context):
-        """Testa conectividade do servidor"""
-        return pb2.XMLResponse(
+    def SubmitJob(self, request_iterator, context):
+        """Cria um trabalho assíncrono com o CSV recebido em blocos - devolve o job_id sem esperar pela execução"""
+        try:
+            if not self.core.jobs:
+                return pb2.SubmitJobResponse(
+                    success=False,
+                    message=JOBS_UNAVAILABLE
+                )
+            
+            first_chunk = next(request_iterator, None)
+            if first_chunk is None:
+                return pb2.SubmitJobResponse(
+                    success=False,
+                    message="Stream vazio: nenhum bloco recebido"
+                )
+            
+            # O CSV vai diretamente para GridFS, bloco a bloco
+            chunks = itertools.chain((first_chunk.data,), (chunk.data for chunk in request_iterator))
+            job_id = self.core.submit_job(first_chunk.type, {
+                'filename': first_chunk.filename,
+                'root_element': first_chunk.root_element,
+                'row_element': first_chunk.row_element,
+                'xml_ids': list(first_chunk.xml_ids),
+                'schema_path': first_chunk.schema_path
+            }, (data for data in chunks if data))
+            
+            return pb2.SubmitJobResponse(
+                success=True,
+                message="Trabalho criado",
+                job_id=job_id
+            )
+        
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao criar trabalho: {e}")
+            return pb2.SubmitJobResponse(
+                success=False,
+                message=str(e)
+            )
+    
+    def _job_status_response(self, job_id):
+        try:
+            status = self.core.job_status(job_id)
+        except ServiceError as e:
+            return pb2.JobStatus(
+                success=False,
+                job_id=job_id,
+                message=str(e)
+            )
+        
+        result = status['result'] or {}
+        return pb2.JobStatus(
             success=True,
-            filename="",
-            xml_content="",
-            message="pong"
+            message="Estado do trabalho",
+            job_id=status['job_id'],
+            type=status['type'],
+            status=status['status'],
+            phase=status['phase'],
+            processed=status['processed'],
+            total=status['total'],
+            eta_seconds=status['eta_seconds'],
+            xml_id=result.get('xml_id', ""),
+            result_json=json.dumps(result, ensure_ascii=False) if status['result'] else "",
+            error=status['error'] or "",
+            attempts=status['attempts'],
+            created_at=status['created_at'],
+            updated_at=status['updated_at']
         )
     
+    def GetJobStatus(self, request, context):
+        """Estado, progresso e resultado de um trabalho"""
+        try:
+            return self._job_status_response(request.job_id)
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao obter estado do trabalho: {e}")
+            return pb2.JobStatus(
+                success=False,
+                job_id=request.job_id,
+                message=str(e)
+            )
+    
+    def WatchJob(self, request, context):
+        """Envia o estado do trabalho sempre que muda (progresso, ETA), até terminar ou o cliente cancelar"""
+        last = None
+        try:
+            while context.is_active():
+                response = self._job_status_response(request.job_id)
+                current = (response.status, response.processed, response.total, response.attempts)
+                if current != last:
+                    yield response
+                    last = current
+                if not response.success or response.status in JOB_FINISHED:
+                    return
+                time.sleep(JOB_WATCH_INTERVAL)
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao acompanhar trabalho: {e}")
+            yield pb2.JobStatus(
+                success=False,
+                job_id=request.job_id,
+                message=str(e)
+            )
+
+
+def _xml_response_v1(response):
+    """Converte XMLResponse da v2 (bytes) para a v1 (string)"""
+    return pb2.XMLResponse(
+        success=response.success,
+        filename=response.filename,
+        xml_content=response.xml_content.decode('utf-8'),
+        message=response.message,
+        version=response.version
+    )
+
+
+def _conversion_response_v1(response):
+    """Converte ConvertToXMLResponse da v2 (bytes) para a v1 (string)"""
+    return pb2.ConvertToXMLResponse(
+        success=response.success,
+        message=response.message,
+        xml_content=response.xml_content.decode('utf-8'),
+        xml_id=response.xml_id
+    )
+
+
+class XMLServiceV2Servicer(pb2_v2_grpc.XMLServiceServicer):
+    """Operações com conteúdo do serviço gRPC em bytes (xmlservice.v2)
+    
+    O conteúdo segue em bytes UTF-8 do pedido ao lxml e ao armazenamento (e do
+    armazenamento à resposta), sem cópias de descodificação/codificação. Os métodos
+    equivalentes da v1 são adaptadores sobre estes.
+    """
+    
+    def __init__(self, servicer):
+        self.servicer = servicer
+    
+    @property
+    def db(self):
+        return self.servicer.db
+    
+    @property
+    def xml_converter(self):
+        return self.servicer.xml_converter
+    
+    @property
+    def cpu_pool(self):
+        return self.servicer.cpu_pool
+    
     def StoreXML(self, request, context):
         """Armazena documento XML no MongoDB"""
         try:
@@ -84,7 +906,7 @@ class XMLServiceServicer(pb2_grpc.XMLServiceServicer):
                 message="XML armazenado com sucesso",
                 xml_id=xml_id
             )
-            
+        
         except Exception as e:
             logger.error(f"gRPC: Erro ao armazenar XML: {e}")
             return pb2.StoreXMLResponse(
@@ -97,227 +919,442 @@ class XMLServiceServicer(pb2_grpc.XMLServiceServicer):
         """Recupera documento XML do MongoDB"""
         try:
             if not self.db:
-                return pb2.XMLResponse(
+                return pb2_v2.XMLResponse(
                     success=False,
-                    filename="",
-                    xml_content="",
                     message="Conexão com MongoDB não disponível"
                 )
             
-            document = self.db.retrieve_xml(request.xml_id)
+            # Conteúdo como bytes/mmap sempre que o backend o permite
+            document, source = self.db.retrieve_xml_source(request.xml_id)
             
             if document:
-                return pb2.XMLResponse(
+                response = pb2_v2.XMLResponse(
                     success=True,
                     filename=document['filename'],
-                    xml_content=document['content'],
-                    message="XML recuperado com sucesso"
+                    xml_content=content_bytes(source),
+                    message="XML recuperado com sucesso",
+                    version=document.get('version', 1)
                 )
+                close_source(source)
+                return response
             else:
-                return pb2.XMLResponse(
+                return pb2_v2.XMLResponse(
                     success=False,
-                    filename="",
-                    xml_content="",
                     message=f"XML com ID {request.xml_id} não encontrado"
                 )
-                
+        
         except Exception as e:
             logger.error(f"gRPC: Erro ao recuperar XML: {e}")
-            return pb2.XMLResponse(
+            return pb2_v2.XMLResponse(
                 success=False,
-                filename="",
-                xml_content="",
                 message=str(e)
             )
     
-    def ListXMLs(self, request, context):
-        """Lista todos os XMLs armazenados"""
+    def StoreXMLBatch(self, request, context):
+        """Armazena vários documentos XML numa só operação"""
         try:
             if not self.db:
-                return pb2.ListXMLResponse(
+                return pb2.StoreXMLBatchResponse(
                     success=False,
-                    files=[],
-                    count=0
+                    message="Conexão com MongoDB não disponível"
                 )
             
-            documents = self.db.list_xml_files()
+            documents = list(request.documents)
             
-            files = []
-            for doc in documents:
-                files.append(pb2.XMLFileInfo(
-                    xml_id=doc['_id'],
-                    filename=doc['filename'],
-                    created_at=doc.get('created_at', '')
-                ))
+            # Validar todos os XMLs em paralelo
+            validations = self.xml_converter.validate_xml_many(
+                [document.xml_content for document in documents]
+            )
             
-            return pb2.ListXMLResponse(
-                success=True,
-                files=files,
-                count=len(files)
+            results = [None] * len(documents)
+            valid_indexes = []
+            for index, (is_valid, validation_result) in enumerate(validations):
+                if is_valid:
+                    valid_indexes.append(index)
+                else:
+                    results[index] = pb2.StoreXMLResult(
+                        index=index,
+                        success=False,
+                        message=f"XML inválido: {validation_result}"
+                    )
+            
+            # Inserir os documentos válidos com insert_many
+            inserted = self.db.insert_xml_many(
+                [(documents[index].filename, documents[index].xml_content) for index in valid_indexes]
             )
+            for index, outcome in zip(valid_indexes, inserted):
+                results[index] = pb2.StoreXMLResult(
+                    index=index,
+                    success=outcome['xml_id'] is not None,
+                    xml_id=outcome['xml_id'] or "",
+                    message=outcome['error'] or "XML armazenado com sucesso"
+                )
             
+            stored_count = sum(1 for result in results if result.success)
+            logger.info(f"gRPC: Lote armazenado ({stored_count}/{len(documents)} documentos)")
+            return pb2.StoreXMLBatchResponse(
+                success=True,
+                message=f"{stored_count} de {len(documents)} XMLs armazenados",
+                results=results,
+                stored_count=stored_count,
+                failed_count=len(documents) - stored_count
+            )
+        
         except Exception as e:
-            logger.error(f"gRPC: Erro ao listar XMLs: {e}")
-            return pb2.ListXMLResponse(
+            logger.error(f"gRPC: Erro ao armazenar lote de XMLs: {e}")
+            return pb2.StoreXMLBatchResponse(
                 success=False,
-                files=[],
-                count=0
+                message=str(e)
             )
     
-    def QueryXPath(self, request, context):
-        """Executa consulta XPath sobre XML armazenado"""
+    def UpdateXML(self, request, context):
+        """Atualiza documento XML criando uma nova versão"""
         try:
             if not self.db:
-                return pb2.XPathResponse(
+                return pb2.UpdateXMLResponse(
                     success=False,
-                    results=[],
                     message="Conexão com MongoDB não disponível"
                 )
             
-            # Recuperar XML
-            document = self.db.retrieve_xml(request.xml_id)
-            if not document:
-                return pb2.XPathResponse(
+            # Validar XML
+            is_valid, validation_result = self.xml_converter.validate_xml(request.xml_content)
+            if not is_valid:
+                return pb2.UpdateXMLResponse(
+                    success=False,
+                    message=f"XML inválido: {validation_result}"
+                )
+            
+            version = self.db.update_xml(request.xml_id, request.xml_content)
+            if version is None:
+                return pb2.UpdateXMLResponse(
                     success=False,
-                    results=[],
                     message=f"XML com ID {request.xml_id} não encontrado"
                 )
             
-            # Executar XPath
-            success, result = self.xml_converter.query_xml_xpath(
-                document['content'],
-                request.expression
+            logger.info(f"gRPC: XML {request.xml_id} atualizado para a versão {version}")
+            return pb2.UpdateXMLResponse(
+                success=True,
+                message="XML atualizado com sucesso",
+                version=version
+            )
+        
+        except Exception as e:
+            logger.error(f"gRPC: Erro ao atualizar XML: {e}")
+            return pb2.UpdateXMLResponse(
+                success=False,
+                message=str(e)
             )
+    
+    def GetXMLVersion(self, request, context):
+        """Recupera uma versão específica de um documento XML"""
+        try:
+            if not self.db:
+                return pb2_v2.XMLResponse(
+                    success=False,
+                    message="Conexão com MongoDB não disponível"
+                )
             
-            if success:
-                # Converter resultado para lista de strings
-                results = []
-                if isinstance(result, dict) and 'results' in result:
-                    for item in result['results']:
-                        results.append(str(item))
-                
-                # Log da consulta
-                self.db.log_conversion(request.xml_id, "xpath_query", "success")
-                
-                return pb2.XPathResponse(
+            document = self.db.retrieve_xml_version(request.xml_id, request.version)
+            
+            if document:
+                return pb2_v2.XMLResponse(
                     success=True,
-                    results=results,
-                    message="Consulta XPath executada com sucesso"
+                    filename=document['filename'],
+                    xml_content=content_bytes(document['content']),
+                    message="Versão recuperada com sucesso",
+                    version=document['version']
                 )
             else:
-                self.db.log_conversion(request.xml_id, "xpath_query", "error", result)
-                return pb2.XPathResponse(
+                return pb2_v2.XMLResponse(
                     success=False,
-                    results=[],
-                    message=f"Erro na consulta XPath: {result}"
+                    message=f"Versão {request.version} do XML {request.xml_id} não encontrada"
                 )
-                
+        
         except Exception as e:
-            logger.error(f"gRPC: Erro na consulta XPath: {e}")
-            return pb2.XPathResponse(
+            logger.error(f"gRPC: Erro ao recuperar versão do XML: {e}")
+            return pb2_v2.XMLResponse(
                 success=False,
-                results=[],
                 message=str(e)
             )
     
     def ConvertToJSON(self, request, context):
         """Converte XML armazenado para JSON"""
         try:
+            deadline = Deadline.from_grpc(context)
             if not self.db:
-                return pb2.ConvertToJSONResponse(
+                return pb2_v2.ConvertToJSONResponse(
                     success=False,
-                    json_content="",
                     message="Conexão com MongoDB não disponível"
                 )
             
-            # Recuperar XML
-            document = self.db.retrieve_xml(request.xml_id)
-            if not document:
-                return pb2.ConvertToJSONResponse(
+            # Converter para JSON
+            outcome = self.servicer.core.run_on_document('xml_to_json', request.xml_id, deadline=deadline)
+            if outcome is None:
+                return pb2_v2.ConvertToJSONResponse(
                     success=False,
-                    json_content="",
                     message=f"XML com ID {request.xml_id} não encontrado"
                 )
+            success, result = outcome
             
-            # Converter para JSON
-            success, result = self.xml_converter.xml_to_json(document['content'])
-            
+            deadline.check('serialize')
             if success:
                 self.db.log_conversion(request.xml_id, "xml_to_json", "success")
-                return pb2.ConvertToJSONResponse(
+                return pb2_v2.ConvertToJSONResponse(
                     success=True,
-                    json_content=result,
+                    json_content=content_bytes(result),
                     message="Conversão para JSON realizada com sucesso"
                 )
             else:
                 self.db.log_conversion(request.xml_id, "xml_to_json", "error", result)
-                return pb2.ConvertToJSONResponse(
+                return pb2_v2.ConvertToJSONResponse(
                     success=False,
-                    json_content="",
                     message=f"Erro na conversão: {result}"
                 )
-                
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
         except Exception as e:
             logger.error(f"gRPC: Erro na conversão para JSON: {e}")
-            return pb2.ConvertToJSONResponse(
+            return pb2_v2.ConvertToJSONResponse(
                 success=False,
-                json_content="",
                 message=str(e)
             )
     
-    def ValidateXML(self, request, context):
-        """Valida XML contra schema XSD"""
+    def ConvertJSONToXML(self, request, context):
+        """Converte JSON para XML"""
+        try:
+            deadline = Deadline.from_grpc(context)
+            # json.loads aceita bytes UTF-8 diretamente
+            success, result = self.cpu_pool.run(
+                'json_to_xml',
+                request.json_content,
+                request.root_element or "root",
+                deadline=deadline
+            )
+            deadline.check('serialize')
+            return self.servicer._conversion_response(success, result, request.filename, "json_to_xml", v2=True)
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
+        except Exception as e:
+            logger.error(f"gRPC: Erro na conversão JSON para XML: {e}")
+            return pb2_v2.ConvertToXMLResponse(
+                success=False,
+                message=str(e)
+            )
+    
+    def TransformXML(self, request, context):
+        """Aplica transformação XSLT a XML armazenado"""
         try:
+            deadline = Deadline.from_grpc(context)
             if not self.db:
-                return pb2.ValidateXMLResponse(
+                return pb2_v2.ConvertToXMLResponse(
                     success=False,
-                    is_valid=False,
-                    validation_result="",
                     message="Conexão com MongoDB não disponível"
                 )
             
-            # Recuperar XML
-            document = self.db.retrieve_xml(request.xml_id)
-            if not document:
-                return pb2.ValidateXMLResponse(
+            outcome = self.servicer.core.run_on_document('transform_xml', request.xml_id, request.xslt_path, deadline=deadline)
+            if outcome is None:
+                return pb2_v2.ConvertToXMLResponse(
                     success=False,
-                    is_valid=False,
-                    validation_result="",
                     message=f"XML com ID {request.xml_id} não encontrado"
                 )
+            success, result = outcome
             
-            # Validar XML
-            schema_path = request.schema_path if request.schema_path else None
-            is_valid, validation_result = self.xml_converter.validate_xml(
-                document['content'], 
-                schema_path
-            )
+            deadline.check('serialize')
+            if success:
+                self.db.log_conversion(request.xml_id, "xslt_transform", "success")
+            else:
+                self.db.log_conversion(request.xml_id, "xslt_transform", "error", result)
             
-            return pb2.ValidateXMLResponse(
-                success=True,
-                is_valid=is_valid,
-                validation_result=str(validation_result),
-                message="Validação realizada com sucesso"
+            # O resultado de uma transformação XSLT pode não ser XML
+            return self.servicer._conversion_response(
+                success, result, request.filename, "xslt_transform", validate=True, v2=True
             )
-                
+        
+        except Cancelled as e:
+            _abort_abandoned(context, e)
         except Exception as e:
-            logger.error(f"gRPC: Erro na validação XML: {e}")
-            return pb2.ValidateXMLResponse(
+            logger.error(f"gRPC: Erro na transformação XSLT: {e}")
+            return pb2_v2.ConvertToXMLResponse(
                 success=False,
-                is_valid=False,
-                validation_result="",
                 message=str(e)
             )
-def serve():
-    """Inicia o servidor gRPC"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    pb2_grpc.add_XMLServiceServicer_to_server(XMLServiceServicer(), server)
-    server.add_insecure_port('[::]:50051')
+
+
+def _abort_abandoned(context, cancelled):
+    """Termina um pedido que o cliente abandonou (o trabalho restante já foi descartado)"""
+    logger.info(f"gRPC: {cancelled}")
+    code = grpc.StatusCode.DEADLINE_EXCEEDED if cancelled.expired else grpc.StatusCode.CANCELLED
+    context.abort(code, str(cancelled))
+
+
+def _abort_rejected(context, rejected):
+    """RESOURCE_EXHAUSTED com a espera sugerida em grpc-retry-pushback-ms (lida pelas políticas de retry do gRPC)"""
+    context.set_trailing_metadata((('grpc-retry-pushback-ms', str(int(rejected.retry_after * 1000))),))
+    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(rejected))
+
+
+class StreamReservation:
+    """Reserva na admissão os bytes de um stream do cliente à medida que as mensagens chegam
+    
+    Soma os blocos enquanto o handler os guarda em memória (GRPC_STREAM_RETAINED_BYTES,
+    None = o stream inteiro); a partir daí só o bloco atual fica reservado.
+    """
+    
+    def __init__(self, controller, ticket, retained=None):
+        self.controller = controller
+        self.ticket = ticket
+        self.retained = retained
+        self.received = 0
+    
+    def add(self, message):
+        """Reserva os bytes da mensagem - lança AdmissionRejected acima do limite"""
+        size = message.ByteSize()
+        self.received += size
+        self.controller.reserve(self.ticket, size, cumulative=self.retained is None or self.received <= self.retained)
+
+
+class AdmittedServicer:
+    """Servicer com controlo de admissão à frente dos métodos em GRPC_METHOD_CLASSES
+    
+    Pedidos unários reservam o tamanho da mensagem; nos streams do cliente os
+    bytes são reservados à medida que os blocos chegam, somados enquanto o handler
+    os guarda em memória (GRPC_STREAM_RETAINED_BYTES).
+    """
+    
+    def __init__(self, servicer, service, controller):
+        self.controller = controller
+        for method in service.methods:
+            handler = getattr(servicer, method.name)
+            method_class = GRPC_METHOD_CLASSES.get(method.name)
+            if method_class:
+                handler = self._wrap(handler, method_class, method.client_streaming, method.server_streaming,
+                                     GRPC_STREAM_RETAINED_BYTES.get(method.name))
+            setattr(self, method.name, handler)
+    
+    def _reserving(self, request_iterator, ticket, rejections, retained):
+        reservation = StreamReservation(self.controller, ticket, retained)
+        for message in request_iterator:
+            try:
+                reservation.add(message)
+            except AdmissionRejected as e:
+                # O handler pode apanhar a exceção; o pedido é abortado depois de ele terminar
+                rejections.append(e)
+                raise
+            yield message
+    
+    def _wrap(self, handler, method_class, client_streaming, server_streaming, retained=None):
+        controller = self.controller
+        
+        def admit(request, context):
+            try:
+                ticket = controller.acquire(method_class, 0 if client_streaming else request.ByteSize())
+            except AdmissionRejected as e:
+                _abort_rejected(context, e)
+            rejections = []
+            if client_streaming:
+                request = self._reserving(request, ticket, rejections, retained)
+            return ticket, request, rejections
+        
+        def finish(context, rejections):
+            if rejections:
+                _abort_rejected(context, rejections[0])
+        
+        if server_streaming:
+            def call(request, context):
+                ticket, request, rejections = admit(request, context)
+                try:
+                    yield from handler(request, context)
+                except AdmissionRejected as e:
+                    rejections.append(e)
+                finally:
+                    controller.release(ticket)
+                finish(context, rejections)
+        else:
+            def call(request, context):
+                ticket, request, rejections = admit(request, context)
+                try:
+                    response = handler(request, context)
+                except AdmissionRejected as e:
+                    rejections.append(e)
+                finally:
+                    controller.release(ticket)
+                finish(context, rejections)
+                return response
+        return call
+
+
+def admitted(servicer, service, controller):
+    """Servicer a registar no servidor: com controlo de admissão se ADMISSION_ENABLED"""
+    return AdmittedServicer(servicer, service, controller) if controller else servicer
+
+
+def create_server(core=None, admission=None, reuse_port=False):
+    """Cria o servidor gRPC (serviços v1 e v2) sem o iniciar - devolve (servidor, servicer)
+    
+    Com core, o servicer usa esse núcleo (partilhado com outro front-end); com
+    admission, os dois serviços ficam sujeitos aos mesmos limites.
+    """
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=GRPC_WORKERS),
+        options=[('grpc.so_reuseport', 1 if reuse_port else 0)]
+    )
+    servicer = XMLServiceServicer(core)
+    pb2_grpc.add_XMLServiceServicer_to_server(
+        admitted(servicer, pb2.DESCRIPTOR.services_by_name['XMLService'], admission), server
+    )
+    pb2_v2_grpc.add_XMLServiceServicer_to_server(
+        admitted(servicer.v2, pb2_v2.DESCRIPTOR.services_by_name['XMLService'], admission), server
+    )
+    server.add_insecure_port(f'[::]:{GRPC_PORT}')
+    return server, servicer
+
+
+def serve(reuse_port=False):
+    """Inicia o servidor gRPC
     
-    logger.info("Servidor gRPC iniciado na porta 50051")
+    Com reuse_port vários processos fazem bind à mesma porta (SO_REUSEPORT) e o
+    kernel distribui as conexões entre eles.
+    """
+    server, servicer = create_server(
+        admission=AdmissionController() if ADMISSION_ENABLED else None,
+        reuse_port=reuse_port
+    )
+    
+    def shutdown(signum, frame):
+        logger.info("Sinal de paragem recebido, a terminar servidor gRPC...")
+        server.stop(grace=GRPC_GRACE_PERIOD)
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    logger.info(f"Servidor gRPC iniciado na porta {GRPC_PORT} ({GRPC_WORKERS} threads, pid {os.getpid()})")
     server.start()
     server.wait_for_termination()
+    
+    # Escreve os logs de conversão pendentes e fecha a conexão
+    servicer.close()
+    logger.info("Servidor gRPC parado")
+
+
+def serve_workers(workers):
+    """Arranca N processos servidores na mesma porta (SO_REUSEPORT) e reinicia os que terminarem
+    
+    Cada processo tem a sua conexão ao MongoDB. No SIGTERM/SIGINT os processos recebem
+    SIGTERM e drenam os pedidos em curso (GRPC_GRACE_PERIOD) antes de terminar.
+    """
+    supervise(serve, workers, 'grpc-worker', kwargs={'reuse_port': True},
+              restart_delay=GRPC_RESTART_DELAY, join_timeout=GRPC_GRACE_PERIOD + 10)
 
 
 if __name__ == '__main__':
-    serve()
+    parser = argparse.ArgumentParser(description="Servidor gRPC para operações XML")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('GRPC_PROCESSES', 1)),
+                        help="número de processos servidores na mesma porta (SO_REUSEPORT)")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        serve_workers(args.workers)
+    else:
+        serve()
@@ -0,0 +1,270 @@
+import os
+import json
+import math
+import signal
+import hashlib
+import logging
+import functools
+
+from bson.errors import InvalidId
+from flask import Flask, Response, request, jsonify
+from flask_cors import CORS
+from werkzeug.serving import make_server
+
+from xml_service_core import XMLServiceCore
+from storage import STREAM_CHUNK_SIZE, close_source
+from metrics import metrics
+from admission import AdmissionController, AdmissionRejected, ADMISSION_ENABLED
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Porta do gateway HTTP/JSON
+HTTP_PORT = int(os.getenv('HTTP_PORT', 8080))
+
+# Classe de admissão de cada endpoint (health não é limitado)
+HTTP_ENDPOINT_CLASSES = {
+    'get_xml': 'read',
+    'convert_to_json': 'cpu',
+    'query_xpath': 'cpu',
+    'query_xquery': 'cpu'
+}
+
+
+def document_etag(document, *representation):
+    """ETag forte de uma representação do documento, a partir do hash do conteúdo e da última alteração
+    
+    Sem content_hash (backends memory e filesystem) a versão e o tamanho identificam o conteúdo.
+    """
+    updated_at = document.get('updated_at')
+    if hasattr(updated_at, 'isoformat'):
+        updated_at = updated_at.isoformat()
+    validator = [document.get('content_hash'), updated_at, document.get('version', 1), document.get('size')]
+    return hashlib.sha256(json.dumps(validator + list(representation)).encode('utf-8')).hexdigest()[:32]
+
+
+def _error(status, message):
+    response = jsonify(success=False, error=message)
+    response.status_code = status
+    return response
+
+
+def _not_modified(etag):
+    """304 sem corpo se o cliente já tem esta representação (If-None-Match), senão None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    metrics.increment('http_not_modified')
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _if_range_matches(etag):
+    """If-Range: uma parte só é enviada se o cliente tiver a versão atual (sem Last-Modified, datas nunca coincidem)"""
+    if_range = request.if_range
+    if if_range.date:
+        return False
+    return not if_range.etag or if_range.etag == etag
+
+
+def _with_etag(response, etag):
+    # no-cache: o cliente guarda a resposta mas revalida-a sempre com If-None-Match
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _iter_range(source, start, stop, chunk_size=STREAM_CHUNK_SIZE):
+    """Blocos dos bytes [start, stop) do conteúdo - o mmap é fechado no fim do envio ou quando o cliente desiste"""
+    try:
+        for offset in range(start, stop, chunk_size):
+            yield source[offset:min(offset + chunk_size, stop)]
+    finally:
+        close_source(source)
+
+
+def create_app(core=None, admission=None):
+    """Cria a aplicação Flask sobre o núcleo dos serviços XML
+    
+    Com core, o gateway usa esse núcleo (partilhado com outro front-end); com
+    admission, os endpoints ficam sujeitos a esse controlo de admissão.
+    """
+    app = Flask(__name__)
+    CORS(app, expose_headers=['ETag', 'Content-Range', 'Accept-Ranges'])
+    core = core or XMLServiceCore()
+    app.extensions['xml_service_core'] = core
+    
+    def endpoint(rule):
+        """Regista um GET com tratamento de erros e, se configurado, controlo de admissão"""
+        def register(view):
+            method_class = HTTP_ENDPOINT_CLASSES.get(view.__name__)
+            
+            @functools.wraps(view)
+            def call(**kwargs):
+                if not core.db:
+                    return _error(503, "Armazenamento não disponível")
+                
+                ticket = None
+                if admission and method_class:
+                    try:
+                        ticket = admission.acquire(method_class)
+                    except AdmissionRejected as e:
+                        response = _error(429, str(e))
+                        response.headers['Retry-After'] = str(math.ceil(e.retry_after))
+                        return response
+                
+                try:
+                    response = view(**kwargs)
+                except InvalidId:
+                    # ID mal formado (MongoDB): nenhum documento o pode ter
+                    response = _error(404, f"XML com ID {kwargs['xml_id']} não encontrado")
+                except Exception as e:
+                    logger.error(f"HTTP: Erro em {request.path}: {e}")
+                    response = _error(500, str(e))
+                
+                # Nas respostas em streaming a vaga só é libertada depois do envio do corpo
+                if ticket is not None:
+                    response.call_on_close(lambda: admission.release(ticket))
+                return response
+            
+            app.add_url_rule(rule, view_func=call, methods=['GET'])
+            return call
+        return register
+    
+    @app.route('/health')
+    def health():
+        """Prontidão do gateway (armazenamento ligado)"""
+        status = core.ready_status()
+        return jsonify(status), 200 if status['ready'] else 503
+    
+    @endpoint('/xml/<xml_id>')
+    def get_xml(xml_id):
+        """Conteúdo do documento: em blocos (chunked) ou, com Range, só os bytes pedidos"""
+        document = core.db.retrieve_xml_info(xml_id)
+        if not document:
+            return _error(404, f"XML com ID {xml_id} não encontrado")
+        etag = document_etag(document)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        # Vários intervalos são ignorados (resposta completa), como o RFC 9110 permite
+        ranges = request.range
+        if ranges and len(ranges.ranges) == 1 and _if_range_matches(etag):
+            document, source = core.db.retrieve_xml_source(xml_id)
+            if not document:
+                return _error(404, f"XML com ID {xml_id} não encontrado")
+            etag = document_etag(document)
+            
+            # str para documentos pequenos; mmap/bytes (lidos sem cópia) para os restantes
+            data = source.encode('utf-8') if isinstance(source, str) else source
+            length = len(data)
+            span = ranges.range_for_length(length)
+            if span is None:
+                close_source(data)
+                response = _error(416, "Intervalo pedido fora do documento")
+                response.headers['Content-Range'] = f"bytes */{length}"
+                return response
+            
+            metrics.increment('http_range_requests')
+            start, stop = span
+            response = Response(_iter_range(data, start, stop), status=206, mimetype='application/xml')
+            response.headers['Content-Range'] = f"bytes {start}-{stop - 1}/{length}"
+            response.headers['Accept-Ranges'] = 'bytes'
+            response.content_length = stop - start
+            return _with_etag(response, etag)
+        
+        # Sem Content-Length o corpo segue em Transfer-Encoding: chunked, bloco a bloco do armazenamento
+        document, chunks = core.db.open_xml_stream(xml_id)
+        if not document:
+            return _error(404, f"XML com ID {xml_id} não encontrado")
+        response = Response(chunks, mimetype='application/xml')
+        response.headers['Accept-Ranges'] = 'bytes'
+        return _with_etag(response, document_etag(document))
+    
+    def _document_result(xml_id, conversion_type, method, *args):
+        """Executa converter.<method> sobre o documento - devolve (resposta de erro/304, None) ou (None, (ETag, resultado))"""
+        document = core.db.retrieve_xml_info(xml_id)
+        if not document:
+            return _error(404, f"XML com ID {xml_id} não encontrado"), None
+        etag = document_etag(document, method, *args)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified, None
+        
+        outcome = core.run_on_document(method, xml_id, *args)
+        if outcome is None:
+            return _error(404, f"XML com ID {xml_id} não encontrado"), None
+        success, result = outcome
+        core.log_conversion(xml_id, conversion_type, "success" if success else "error", None if success else result)
+        if not success:
+            return _error(422, result), None
+        return None, (etag, result)
+    
+    @endpoint('/xml/<xml_id>/json')
+    def convert_to_json(xml_id):
+        """Documento convertido para JSON"""
+        response, outcome = _document_result(xml_id, "xml_to_json", 'xml_to_json')
+        if response:
+            return response
+        etag, json_content = outcome
+        return _with_etag(Response(json_content, mimetype='application/json'), etag)
+    
+    def _query(xml_id, conversion_type, method):
+        expression = request.args.get('expression')
+        if not expression:
+            return _error(400, "Parâmetro expression obrigatório")
+        if method == 'query_xml_xpath':
+            # Expressão inválida é rejeitada sem ler o documento
+            valid, error = core.converter.check_xpath(expression)
+            if not valid:
+                return _error(400, f"Expressão XPath inválida: {error}")
+        response, outcome = _document_result(xml_id, conversion_type, method, expression)
+        if response:
+            return response
+        etag, result = outcome
+        return _with_etag(jsonify(success=True, **result), etag)
+    
+    @endpoint('/xml/<xml_id>/xpath')
+    def query_xpath(xml_id):
+        """Resultado de uma consulta XPath (?expression=...)"""
+        return _query(xml_id, "xpath_query", 'query_xml_xpath')
+    
+    @endpoint('/xml/<xml_id>/xquery')
+    def query_xquery(xml_id):
+        """Resultado de uma consulta XQuery (?expression=...)"""
+        return _query(xml_id, "xquery_query", 'query_xml_xquery')
+    
+    return app
+
+
+def create_server(core=None, admission=None):
+    """Cria o servidor HTTP (werkzeug, uma thread por pedido) do gateway"""
+    app = create_app(core, admission)
+    server = make_server('0.0.0.0', HTTP_PORT, app, threaded=True)
+    # Guardado para permitir encerrar a conexão no fim
+    server.core = app.extensions['xml_service_core']
+    return server
+
+
+if __name__ == '__main__':
+    logger.info("Iniciando gateway HTTP...")
+    
+    server = create_server(admission=AdmissionController() if ADMISSION_ENABLED else None)
+    
+    # SIGTERM (docker stop) termina o servidor como um Ctrl+C
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    logger.info(f"Gateway HTTP iniciado em http://0.0.0.0:{HTTP_PORT}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Gateway interrompido pelo utilizador")
+    finally:
+        server.server_close()
+        server.core.close()
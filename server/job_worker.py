@@ -0,0 +1,255 @@
+import os
+import time
+import socket
+import signal
+import logging
+import argparse
+import threading
+
+from storage import get_storage_backend, close_source, STORAGE_BACKEND, STORAGE_RETRY_INITIAL, STORAGE_RETRY_MAX
+from xml_converter import XMLConverter
+from supervisor import supervise
+from jobs import (JobQueue, JobLost, JOB_LEASE_SECONDS, JOB_PHASE_READING, JOB_PHASE_CONVERTING,
+                  JOB_PHASE_VALIDATING, JOB_PHASE_STORING)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Processos worker (cada um executa um trabalho de cada vez)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 1))
+
+# Espera (s) entre consultas à fila quando não há trabalhos pendentes
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1))
+
+# Intervalo mínimo (s) entre escritas do progresso (e renovações da lease) no MongoDB
+JOB_PROGRESS_INTERVAL = float(os.getenv('JOB_PROGRESS_INTERVAL', 1))
+
+# Intervalo (s) entre renovações da lease pela thread de heartbeat, em todas as fases do trabalho
+JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', JOB_LEASE_SECONDS / 3))
+
+# Nº máximo de documentos inválidos descritos no resultado de uma validação em lote
+JOB_MAX_REPORTED_ERRORS = int(os.getenv('JOB_MAX_REPORTED_ERRORS', 100))
+
+# Espera antes de reiniciar um processo worker que terminou
+JOB_RESTART_DELAY = float(os.getenv('JOB_RESTART_DELAY', 1))
+
+
+class JobInterrupted(Exception):
+    """Worker a terminar: o trabalho em curso volta para a fila"""
+
+
+class JobWorker:
+    """Executa os trabalhos da fila (jobs.py), um de cada vez, até stop()
+    
+    O resultado das conversões é armazenado em xml_data como qualquer outro XML;
+    o progresso é escrito no trabalho no máximo a cada JOB_PROGRESS_INTERVAL. Uma
+    thread de heartbeat renova a lease durante todo o trabalho (leitura da entrada,
+    parsing, serialização e armazenamento incluídos), não só entre linhas.
+    """
+    
+    def __init__(self, name=None):
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.converter = XMLConverter()
+        self.storage = None
+        self.queue = None
+        self._stopped = threading.Event()
+        # Marcado pelo heartbeat quando o trabalho em curso deixou de ser deste worker
+        self._lost = threading.Event()
+        self.handlers = {
+            'csv_to_xml': self._csv_to_xml,
+            'validate_xml': self._validate_xml
+        }
+    
+    def stop(self):
+        self._stopped.set()
+    
+    def connect(self):
+        """Liga ao MongoDB com backoff exponencial - devolve False se parado antes de ligar"""
+        delay = STORAGE_RETRY_INITIAL
+        while not self._stopped.is_set():
+            storage = get_storage_backend()
+            if storage is not None:
+                if storage.name != 'mongo':
+                    storage.disconnect()
+                    raise RuntimeError(f"A fila de trabalhos requer STORAGE_BACKEND=mongo (atual: {STORAGE_BACKEND})")
+                self.storage = storage
+                self.queue = JobQueue(storage)
+                return True
+            logger.warning(f"Worker {self.name}: MongoDB indisponível (nova tentativa em {delay:.1f}s)")
+            self._stopped.wait(delay)
+            delay = min(delay * 2, STORAGE_RETRY_MAX)
+        return False
+    
+    def run(self):
+        if not self.connect():
+            return
+        logger.info(f"Worker {self.name} à espera de trabalhos")
+        try:
+            while not self._stopped.is_set():
+                job = self.queue.claim(self.name)
+                if job is None:
+                    self._stopped.wait(JOB_POLL_INTERVAL)
+                    continue
+                self.run_job(job)
+        finally:
+            self.storage.disconnect()
+            logger.info(f"Worker {self.name} parado")
+    
+    def run_job(self, job):
+        job_id = job['_id']
+        logger.info(f"Worker {self.name}: trabalho {job_id} ({job['type']}) iniciado")
+        started = time.perf_counter()
+        finished = threading.Event()
+        self._lost.clear()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, finished), name='job-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            result = self.handlers[job['type']](job)
+        except JobInterrupted:
+            if self.queue.release(job):
+                logger.info(f"Worker {self.name}: trabalho {job_id} devolvido à fila")
+            return
+        except JobLost as e:
+            logger.warning(f"Worker {self.name}: {e}")
+            return
+        except Exception as e:
+            logger.error(f"Worker {self.name}: trabalho {job_id} falhou: {e}")
+            self.queue.fail(job, e)
+            return
+        finally:
+            finished.set()
+            heartbeat.join()
+        
+        if self.queue.complete(job, result):
+            logger.info(f"Worker {self.name}: trabalho {job_id} concluído em {time.perf_counter() - started:.1f}s")
+    
+    def _heartbeat(self, job, finished):
+        """Renova a lease a cada JOB_HEARTBEAT_INTERVAL até o trabalho terminar"""
+        while not finished.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                self.queue.renew(job)
+            except JobLost as e:
+                logger.warning(f"Worker {self.name}: {e}")
+                self._lost.set()
+                return
+            except Exception as e:
+                # Falha transitória do MongoDB: a lease ainda tem margem até à próxima tentativa
+                logger.warning(f"Worker {self.name}: erro ao renovar a lease do trabalho {job['_id']}: {e}")
+    
+    def _check_owned(self, job):
+        if self._stopped.is_set():
+            raise JobInterrupted()
+        if self._lost.is_set():
+            raise JobLost(f"Trabalho {job['_id']} já não está atribuído a {job['worker']}")
+    
+    def _reporter(self, job):
+        """Callback progress(processados, total) - escreve no máximo a cada JOB_PROGRESS_INTERVAL"""
+        last_write = 0.0
+        
+        def report(processed, total):
+            nonlocal last_write
+            self._check_owned(job)
+            now = time.monotonic()
+            if processed < total and now - last_write < JOB_PROGRESS_INTERVAL:
+                return
+            last_write = now
+            self.queue.progress(job, processed, total)
+        
+        return report
+    
+    def _csv_to_xml(self, job):
+        params = job['params']
+        self.queue.set_phase(job, JOB_PHASE_READING)
+        csv_content = self.queue.read_input(job).decode('utf-8')
+        self._check_owned(job)
+        self.queue.set_phase(job, JOB_PHASE_CONVERTING)
+        report = self._reporter(job)
+        failure = []
+        records = 0
+        
+        def progress(processed, total):
+            nonlocal records
+            records = total
+            # O conversor devolve as exceções como (False, mensagem): guardam-se para as relançar
+            try:
+                report(processed, total)
+            except (JobInterrupted, JobLost) as e:
+                failure.append(e)
+                raise
+        
+        success, result = self.converter.csv_to_xml(
+            csv_content, params['root_element'], params['row_element'], progress
+        )
+        if failure:
+            raise failure[0]
+        if not success:
+            raise ValueError(f"Erro na conversão: {result}")
+        
+        self._check_owned(job)
+        self.queue.set_phase(job, JOB_PHASE_STORING)
+        xml_id = self.queue.store_output(job, self.storage, params['filename'], result)
+        if not xml_id:
+            raise RuntimeError("Erro ao armazenar XML")
+        self.storage.log_conversion(xml_id, "csv_to_xml", "success")
+        return {'xml_id': xml_id, 'records': records}
+    
+    def _validate_xml(self, job):
+        params = job['params']
+        xml_ids = params['xml_ids']
+        self.queue.set_phase(job, JOB_PHASE_VALIDATING)
+        report = self._reporter(job)
+        valid = 0
+        errors = []
+        
+        for position, xml_id in enumerate(xml_ids):
+            report(position, len(xml_ids))
+            document, xml_content = self.storage.retrieve_xml_source(xml_id)
+            if not document:
+                errors.append({'xml_id': xml_id, 'validation_result': "XML não encontrado"})
+                continue
+            
+            is_valid, validation_result = self.converter.validate_xml(xml_content, params['schema_path'])
+            close_source(xml_content)
+            if is_valid:
+                valid += 1
+                self.storage.log_conversion(xml_id, "xml_validation", "success")
+            else:
+                errors.append({'xml_id': xml_id, 'validation_result': str(validation_result)})
+                self.storage.log_conversion(xml_id, "xml_validation", "warning", validation_result)
+        report(len(xml_ids), len(xml_ids))
+        
+        return {
+            'valid': valid,
+            'invalid': len(errors),
+            'errors': errors[:JOB_MAX_REPORTED_ERRORS]
+        }
+
+
+def run_worker():
+    """Processo worker: executa trabalhos até SIGTERM/SIGINT (o trabalho em curso volta para a fila)"""
+    worker = JobWorker()
+    
+    def shutdown(signum, frame):
+        logger.info(f"Worker {worker.name}: sinal de paragem recebido")
+        worker.stop()
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    worker.run()
+
+
+def run_workers(workers):
+    """Arranca N processos worker e reinicia os que terminarem (o trabalho em curso volta para a fila)"""
+    supervise(run_worker, workers, 'job-worker', restart_delay=JOB_RESTART_DELAY)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Workers da fila de trabalhos assíncronos")
+    parser.add_argument('--workers', type=int, default=JOB_WORKERS,
+                        help="número de processos worker")
+    args = parser.parse_args()
+    
+    if args.workers > 1:
+        run_workers(args.workers)
+    else:
+        run_worker()
@@ -0,0 +1,258 @@
+import os
+import logging
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tipos de trabalho aceites pela fila
+JOB_TYPES = ('csv_to_xml', 'validate_xml')
+
+# Estados de um trabalho (done e failed são finais)
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_FINISHED = (JOB_DONE, JOB_FAILED)
+
+# Fases de um trabalho em execução: o ETA só é estimado enquanto as linhas/documentos são processados
+JOB_PHASE_READING = 'reading'
+JOB_PHASE_CONVERTING = 'converting'
+JOB_PHASE_VALIDATING = 'validating'
+JOB_PHASE_STORING = 'storing'
+
+# Tempo (s) que um trabalho fica atribuído a um worker sem sinal de vida; depois é retomado por outro
+JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', 60))
+
+# Execuções de um trabalho (retomas após falha de um worker incluídas) antes de ser dado como falhado
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+
+
+class JobLost(Exception):
+    """O trabalho deixou de estar atribuído a este worker (lease expirada e retomada por outro)"""
+
+
+class JobQueue:
+    """Fila de trabalhos assíncronos na coleção jobs do MongoDB
+    
+    O pedido só cria o documento do trabalho (com o CSV de entrada em GridFS) e
+    devolve o ID; os workers (job_worker.py) reclamam trabalhos com
+    find_one_and_update e renovam a lease durante toda a execução. Um trabalho
+    cujo worker terminou sem o concluir volta a ser reclamado quando a lease
+    expira, pelo que os trabalhos sobrevivem ao reinício dos servidores e workers.
+    """
+    
+    def __init__(self, storage):
+        self.collection = storage.get_collection('jobs')
+        self.fs = storage.fs
+    
+    def submit(self, job_type, params, chunks=()):
+        """Cria um trabalho com os blocos de entrada (bytes) - devolve o job_id"""
+        params = self._check_params(job_type, params)
+        
+        input_id = None
+        input_size = 0
+        grid_in = self.fs.new_file(filename=f"job-{job_type}", content_type='application/octet-stream')
+        try:
+            for chunk in chunks:
+                grid_in.write(chunk)
+                input_size += len(chunk)
+        except BaseException:
+            grid_in.abort()
+            raise
+        grid_in.close()
+        if input_size:
+            input_id = grid_in._id
+        else:
+            self.fs.delete(grid_in._id)
+        
+        if job_type == 'csv_to_xml' and not input_id:
+            raise ValueError("csv_to_xml: conteúdo CSV vazio")
+        
+        now = datetime.now()
+        result = self.collection.insert_one({
+            'type': job_type,
+            'status': JOB_QUEUED,
+            'params': params,
+            'input_id': input_id,
+            'input_size': input_size,
+            'processed': 0,
+            'total': len(params['xml_ids']) if job_type == 'validate_xml' else 0,
+            'attempts': 0,
+            'worker': None,
+            'lease_until': None,
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        })
+        logger.info(f"Trabalho {job_type} criado com ID {result.inserted_id} ({input_size} bytes de entrada)")
+        return str(result.inserted_id)
+    
+    def _check_params(self, job_type, params):
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Tipo de trabalho inválido: {job_type} ({', '.join(JOB_TYPES)})")
+        if job_type == 'csv_to_xml':
+            if not params.get('filename'):
+                raise ValueError("csv_to_xml: filename obrigatório")
+            return {
+                'filename': params['filename'],
+                'root_element': params.get('root_element') or "dataset",
+                'row_element': params.get('row_element') or "record"
+            }
+        
+        xml_ids = [str(xml_id) for xml_id in params.get('xml_ids') or []]
+        if not xml_ids:
+            raise ValueError("validate_xml: xml_ids obrigatório")
+        return {'xml_ids': xml_ids, 'schema_path': params.get('schema_path') or None}
+    
+    def get(self, job_id):
+        """Documento do trabalho (None se não existir)"""
+        try:
+            object_id = ObjectId(job_id)
+        except Exception:
+            return None
+        return self.collection.find_one({'_id': object_id})
+    
+    def claim(self, worker):
+        """Atribui ao worker o trabalho pendente mais antigo (ou um com a lease expirada) - devolve o documento ou None"""
+        while True:
+            now = datetime.now()
+            job = self.collection.find_one_and_update(
+                {'$or': [
+                    {'status': JOB_QUEUED},
+                    {'status': JOB_RUNNING, 'lease_until': {'$lt': now}}
+                ]},
+                {
+                    '$set': {
+                        'status': JOB_RUNNING,
+                        'worker': worker,
+                        'lease_until': now + timedelta(seconds=JOB_LEASE_SECONDS),
+                        'started_at': now,
+                        'updated_at': now,
+                        'processed': 0,
+                        'phase': None
+                    },
+                    '$inc': {'attempts': 1}
+                },
+                sort=[('created_at', 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if job is None:
+                return None
+            if job['attempts'] <= JOB_MAX_ATTEMPTS:
+                if job['attempts'] > 1:
+                    logger.warning(f"Trabalho {job['_id']} retomado (execução {job['attempts']})")
+                return job
+            # Terminou com o worker demasiadas vezes (ex.: memória esgotada): não volta a ser tentado
+            self.fail(job, f"Trabalho interrompido {JOB_MAX_ATTEMPTS} vezes sem terminar")
+    
+    def _owned(self, job):
+        return {'_id': job['_id'], 'worker': job['worker'], 'status': JOB_RUNNING}
+    
+    def _update_owned(self, job, changes):
+        """Aplica as alterações e renova a lease - lança JobLost se o trabalho já não é deste worker"""
+        now = datetime.now()
+        changes.update({'lease_until': now + timedelta(seconds=JOB_LEASE_SECONDS), 'updated_at': now})
+        result = self.collection.update_one(self._owned(job), {'$set': changes})
+        if not result.matched_count:
+            raise JobLost(f"Trabalho {job['_id']} já não está atribuído a {job['worker']}")
+    
+    def renew(self, job):
+        """Renova a lease (sinal de vida do worker, independente do progresso)"""
+        self._update_owned(job, {})
+    
+    def set_phase(self, job, phase):
+        """Regista a fase em curso (JOB_PHASE_*) e renova a lease"""
+        self._update_owned(job, {'phase': phase})
+    
+    def progress(self, job, processed, total):
+        """Regista o progresso e renova a lease - lança JobLost se o trabalho já não é deste worker"""
+        self._update_owned(job, {'processed': processed, 'total': total})
+    
+    def store_output(self, job, storage, filename, content):
+        """Armazena o XML produzido pelo trabalho em xml_data - devolve o xml_id
+        
+        O documento leva o job_id (índice único): se uma execução anterior do mesmo
+        trabalho já o guardou, é devolvido esse documento em vez de criar um duplicado.
+        """
+        xml_data = storage.get_collection('xml_data')
+        existing = xml_data.find_one({'job_id': job['_id']}, {'_id': 1})
+        if existing:
+            logger.info(f"Trabalho {job['_id']}: XML já armazenado por uma execução anterior ({existing['_id']})")
+            return str(existing['_id'])
+        
+        # Só o worker que ainda tem o trabalho escreve o resultado
+        self.renew(job)
+        try:
+            return storage.insert_xml(filename, content, job_id=job['_id'])
+        except DuplicateKeyError:
+            return str(xml_data.find_one({'job_id': job['_id']}, {'_id': 1})['_id'])
+    
+    def complete(self, job, result):
+        """Marca o trabalho como concluído com o resultado (resumo; o XML fica em xml_data)"""
+        return self._finish(job, {'status': JOB_DONE, 'result': result})
+    
+    def fail(self, job, error):
+        return self._finish(job, {'status': JOB_FAILED, 'error': str(error)})
+    
+    def release(self, job):
+        """Devolve o trabalho à fila (worker a terminar) sem contar a execução interrompida"""
+        result = self.collection.update_one(self._owned(job), {
+            '$set': {'status': JOB_QUEUED, 'worker': None, 'lease_until': None, 'phase': None, 'updated_at': datetime.now()},
+            '$inc': {'attempts': -1}
+        })
+        return result.matched_count > 0
+    
+    def _finish(self, job, changes):
+        now = datetime.now()
+        changes.update({'lease_until': None, 'phase': None, 'finished_at': now, 'updated_at': now})
+        result = self.collection.update_one(self._owned(job), {'$set': changes})
+        if not result.matched_count:
+            logger.warning(f"Trabalho {job['_id']} já não está atribuído a {job['worker']} - resultado ignorado")
+            return False
+        
+        # A entrada já não é necessária
+        if job.get('input_id'):
+            try:
+                self.fs.delete(job['input_id'])
+            except Exception as e:
+                logger.warning(f"Erro ao remover a entrada do trabalho {job['_id']}: {e}")
+        return True
+    
+    def read_input(self, job):
+        """Conteúdo de entrada do trabalho (bytes)"""
+        if not job.get('input_id'):
+            return b''
+        return self.fs.get(job['input_id']).read()
+
+
+def job_status(job):
+    """Estado do trabalho para os clientes, com a estimativa do tempo restante (eta_seconds, -1 se desconhecido)"""
+    processed = job.get('processed') or 0
+    total = job.get('total') or 0
+    eta_seconds = -1.0
+    if job['status'] in JOB_FINISHED:
+        eta_seconds = 0.0
+    elif job['status'] == JOB_RUNNING and job.get('phase') in (JOB_PHASE_CONVERTING, JOB_PHASE_VALIDATING) and processed and total:
+        elapsed = (job['updated_at'] - job['started_at']).total_seconds()
+        eta_seconds = elapsed / processed * (total - processed)
+    
+    return {
+        'job_id': str(job['_id']),
+        'type': job['type'],
+        'status': job['status'],
+        'phase': job.get('phase') or "",
+        'processed': processed,
+        'total': total,
+        'eta_seconds': eta_seconds,
+        'attempts': job.get('attempts', 0),
+        'result': job.get('result'),
+        'error': job.get('error'),
+        'created_at': job['created_at'].isoformat(),
+        'updated_at': job['updated_at'].isoformat()
+    }
@@ -0,0 +1,89 @@
+import os
+import queue
+import threading
+import time
+import logging
+from pymongo.errors import PyMongoError
+
+from metrics import metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuração do write-behind dos logs de conversão
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', 500))
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', 1.0))  # segundos
+
+
+class ConversionLogWriter:
+    """Escreve os logs de conversão em segundo plano, em lotes com insert_many"""
+    
+    def __init__(self, collection, max_queue=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Inicia a thread de escrita"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="conversion-log-writer", daemon=True)
+            self._thread.start()
+            logger.info("Escrita assíncrona de logs de conversão iniciada")
+    
+    def submit(self, log_entry):
+        """Coloca um log na fila sem bloquear - descarta se a fila estiver cheia"""
+        try:
+            self.queue.put_nowait(log_entry)
+            return True
+        except queue.Full:
+            # Sobrecarga persistente: a escrita não acompanha o ritmo dos pedidos
+            metrics.increment('conversion_log_dropped')
+            return False
+    
+    def stop(self, timeout=10):
+        """Para a thread de escrita depois de escrever os logs pendentes"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Escrita assíncrona de logs de conversão terminada")
+    
+    def _next_batch(self):
+        """Recolhe logs até atingir o tamanho do lote ou o intervalo de escrita"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._stop_event.is_set() and self.queue.empty():
+                break
+            try:
+                batch.append(self.queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+        
+        return batch
+    
+    def _run(self):
+        while not self._stop_event.is_set() or not self.queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+            metrics.set('conversion_log_queue_size', self.queue.qsize())
+    
+    def _flush(self, batch):
+        """Escreve um lote de logs numa só operação"""
+        try:
+            self.collection.insert_many(batch, ordered=False)
+            metrics.increment('conversion_log_written', len(batch))
+        except PyMongoError as e:
+            logger.error(f"Erro ao escrever lote de {len(batch)} logs: {e}")
+            metrics.increment('conversion_log_write_errors', len(batch))
@@ -0,0 +1,159 @@
+import uuid
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+
+from storage import LocalStorageBackend, content_bytes, content_text
+from path_summary import compute_path_summary
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Número máximo de logs de conversão mantidos em memória
+MAX_LOG_ENTRIES = 10000
+
+
+class MemoryStorage(LocalStorageBackend):
+    """Backend em memória (sem persistência) - útil para benchmarks e execução sem MongoDB"""
+    
+    name = 'memory'
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}  # xml_id -> metadados
+        self._versions = {}   # xml_id -> lista de versões (índice 0 = versão 1)
+        self.conversion_log = deque(maxlen=MAX_LOG_ENTRIES)
+    
+    def _all_documents(self):
+        with self._lock:
+            return list(self._documents.values())
+    
+    def insert_xml(self, filename, content):
+        """Insere documento XML em memória"""
+        xml_id = uuid.uuid4().hex
+        now = datetime.now()
+        summary = compute_path_summary(content)
+        size = len(content_bytes(content))
+        content = content_text(content)
+        with self._lock:
+            self._documents[xml_id] = {
+                '_id': xml_id,
+                'filename': filename,
+                'size': size,
+                'version': 1,
+                'path_summary': summary,
+                'created_at': now,
+                'updated_at': now
+            }
+            self._versions[xml_id] = [{'content': content, 'created_at': now}]
+        return xml_id
+    
+    def retrieve_xml(self, xml_id):
+        """Recupera documento XML (versão mais recente) pelo ID"""
+        with self._lock:
+            document = self._documents.get(xml_id)
+            if document is None:
+                return None
+            content = self._versions[xml_id][-1]['content']
+        
+        return {
+            '_id': xml_id,
+            'filename': document['filename'],
+            'content': content,
+            'is_gridfs': False,
+            'size': document['size'],
+            'version': document['version'],
+            'created_at': document['created_at'].isoformat(),
+            'updated_at': document['updated_at'].isoformat()
+        }
+    
+    def retrieve_xml_info(self, xml_id):
+        """Devolve os metadados do documento sem copiar o conteúdo"""
+        with self._lock:
+            document = self._documents.get(xml_id)
+            if document is None:
+                return None
+            return {
+                '_id': xml_id,
+                'filename': document['filename'],
+                'is_gridfs': False,
+                'size': document['size'],
+                'version': document['version'],
+                'created_at': document['created_at'].isoformat(),
+                'updated_at': document['updated_at'].isoformat()
+            }
+    
+    def retrieve_path_summary(self, xml_id):
+        """Devolve os metadados e o resumo estrutural calculado na inserção"""
+        with self._lock:
+            document = self._documents.get(xml_id)
+            if document is None:
+                return None
+            return {
+                '_id': xml_id,
+                'filename': document['filename'],
+                'size': document['size'],
+                'version': document['version'],
+                'path_summary': document['path_summary']
+            }
+    
+    def update_xml(self, xml_id, content):
+        """Guarda uma nova versão completa do documento"""
+        summary = compute_path_summary(content)
+        size = len(content_bytes(content))
+        content = content_text(content)
+        with self._lock:
+            document = self._documents.get(xml_id)
+            if document is None:
+                return None
+            now = datetime.now()
+            self._versions[xml_id].append({'content': content, 'created_at': now})
+            document['version'] = len(self._versions[xml_id])
+            document['size'] = size
+            document['path_summary'] = summary
+            document['updated_at'] = now
+            return document['version']
+    
+    def retrieve_xml_version(self, xml_id, version):
+        with self._lock:
+            document = self._documents.get(xml_id)
+            if document is None or version < 1 or version > len(self._versions[xml_id]):
+                return None
+            return {
+                '_id': xml_id,
+                'filename': document['filename'],
+                'version': version,
+                'content': self._versions[xml_id][version - 1]['content'],
+                'is_gridfs': False
+            }
+    
+    def list_xml_versions(self, xml_id):
+        with self._lock:
+            document = self._documents.get(xml_id)
+            if document is None:
+                return None
+            return [
+                {
+                    'version': index + 1,
+                    'kind': 'snapshot',
+                    'size': len(entry['content'].encode('utf-8')),
+                    'created_at': entry['created_at'].isoformat()
+                }
+                for index, entry in enumerate(self._versions[xml_id])
+            ]
+    
+    def delete_xml(self, xml_id):
+        with self._lock:
+            self._versions.pop(xml_id, None)
+            return self._documents.pop(xml_id, None) is not None
+    
+    def log_conversion(self, xml_id, conversion_type, status, error_message=None):
+        self.conversion_log.append({
+            'xml_id': xml_id,
+            'conversion_type': conversion_type,
+            'status': status,
+            'error_message': error_message,
+            'created_at': datetime.now()
+        })
+        return None
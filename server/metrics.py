@@ -0,0 +1,33 @@
+import threading
+
+
+class Metrics:
+    """Contadores e gauges em memória partilhados pelos componentes do servidor"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+    
+    def increment(self, name, amount=1):
+        """Incrementa um contador"""
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+    
+    def set(self, name, value):
+        """Define o valor atual de um gauge"""
+        with self._lock:
+            self._values[name] = value
+    
+    def get(self, name, default=0):
+        """Devolve o valor atual de uma métrica"""
+        with self._lock:
+            return self._values.get(name, default)
+    
+    def snapshot(self):
+        """Devolve uma cópia de todas as métricas"""
+        with self._lock:
+            return dict(self._values)
+
+
+# Instância única usada por todo o processo
+metrics = Metrics()
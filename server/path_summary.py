@@ -0,0 +1,193 @@
+import os
+import re
+import logging
+from lxml import etree
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Número máximo de caminhos distintos guardados no resumo de cada documento
+SUMMARY_MAX_PATHS = int(os.getenv('XML_SUMMARY_MAX_PATHS', 5000))
+
+# Tamanho dos blocos entregues ao parser quando o documento já está em memória
+SUMMARY_FEED_SIZE = 1024 * 1024  # 1MB em bytes
+
+# Caminhos de localização simples: /a/b, //b, /a//*, com predicados opcionais
+_STEP = r'(?:\*|[A-Za-z_][\w.\-]*)'
+_LOCATION_PATH = re.compile(rf'^(?://?{_STEP})+$')
+_LOCATION_STEP = re.compile(rf'(//?)({_STEP})')
+_COUNT = re.compile(r'^\s*count\s*\((.*)\)\s*$', re.S)
+
+
+class PathSummaryBuilder:
+    """Constrói o resumo estrutural (DataGuide) de um documento lido em blocos
+    
+    Para cada caminho distinto de elementos guarda o número de ocorrências e os
+    nomes dos atributos. Os elementos já processados são libertados, pelo que a
+    memória usada depende da profundidade e não do tamanho do documento.
+    """
+    
+    def __init__(self):
+        self._parser = etree.XMLPullParser(events=('start', 'end'))
+        self._stack = ['']
+        self._paths = {}
+        self.element_count = 0
+        self.max_depth = 0
+        self.has_namespaces = False
+        self.truncated = False
+        self.error = None
+    
+    def feed(self, data):
+        if self.error:
+            return
+        try:
+            self._parser.feed(data)
+            self._process_events()
+        except etree.XMLSyntaxError as e:
+            self.error = str(e)
+    
+    def _process_events(self):
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                tag = element.tag
+                if tag.startswith('{'):
+                    self.has_namespaces = True
+                
+                path = f"{self._stack[-1]}/{tag}"
+                self._stack.append(path)
+                self.element_count += 1
+                self.max_depth = max(self.max_depth, len(self._stack) - 1)
+                
+                entry = self._paths.get(path)
+                if entry is None:
+                    if len(self._paths) >= SUMMARY_MAX_PATHS:
+                        self.truncated = True
+                        continue
+                    entry = self._paths[path] = {'count': 0, 'attributes': set()}
+                entry['count'] += 1
+                entry['attributes'].update(element.attrib.keys())
+            else:
+                self._stack.pop()
+                # Liberta o elemento e os irmãos anteriores já processados
+                element.clear()
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+    
+    def close(self):
+        """Termina a análise - devolve o resumo ou None se o documento não for XML válido"""
+        if not self.error:
+            try:
+                self._parser.close()
+                self._process_events()
+            except etree.XMLSyntaxError as e:
+                self.error = str(e)
+        
+        if self.error:
+            logger.warning(f"Resumo estrutural não calculado: {self.error}")
+            return None
+        
+        return {
+            'paths': [
+                {'path': path, 'count': entry['count'], 'attributes': sorted(entry['attributes'])}
+                for path, entry in self._paths.items()
+            ],
+            'element_count': self.element_count,
+            'max_depth': self.max_depth,
+            'has_namespaces': self.has_namespaces,
+            'truncated': self.truncated
+        }
+
+
+def compute_path_summary(source):
+    """Calcula o resumo estrutural de um documento (str, bytes ou mmap)"""
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    
+    builder = PathSummaryBuilder()
+    for start in range(0, len(source), SUMMARY_FEED_SIZE):
+        builder.feed(source[start:start + SUMMARY_FEED_SIZE])
+    return builder.close()
+
+
+def _strip_predicates(expression):
+    """Remove os predicados [...] - devolve (caminho, tinha predicados) ou (None, False)"""
+    path = []
+    depth = 0
+    quote = None
+    has_predicates = False
+    
+    for char in expression:
+        if quote:
+            if char == quote:
+                quote = None
+        elif depth and char in '"\'':
+            quote = char
+        elif char == '[':
+            depth += 1
+            has_predicates = True
+        elif char == ']':
+            depth -= 1
+            if depth < 0:
+                return None, False
+        elif depth == 0:
+            path.append(char)
+    
+    if depth or quote:
+        return None, False
+    return ''.join(path).strip(), has_predicates
+
+
+def plan_summary_query(expression):
+    """Verifica se a consulta XPath pode ser respondida pelo resumo estrutural
+    
+    Só caminhos de localização simples (opcionalmente dentro de count()) são
+    elegíveis; devolve o plano da consulta ou None.
+    """
+    count_match = _COUNT.match(expression)
+    target = count_match.group(1) if count_match else expression
+    
+    location_path, has_predicates = _strip_predicates(target)
+    if not location_path or not _LOCATION_PATH.match(location_path):
+        return None
+    
+    pattern = ''
+    for separator, step in _LOCATION_STEP.findall(location_path):
+        name = '[^/]+' if step == '*' else re.escape(step)
+        pattern += ('(?:/[^/]+)*/' if separator == '//' else '/') + name
+    
+    return {
+        'expression': expression,
+        'path_regex': re.compile(pattern + '$'),
+        'is_count': count_match is not None,
+        'has_predicates': has_predicates
+    }
+
+
+def answer_from_summary(summary, plan):
+    """Responde à consulta usando apenas o resumo - devolve o resultado ou None se for preciso avaliar o documento"""
+    if not summary or not plan or summary.get('has_namespaces') or summary.get('truncated'):
+        return None
+    
+    # Cada elemento tem um único caminho, logo a soma das ocorrências não repete nós
+    matches = sum(
+        entry['count'] for entry in summary['paths']
+        if plan['path_regex'].match(entry['path'])
+    )
+    
+    if plan['is_count']:
+        # Com predicados só é possível afirmar que a contagem é zero
+        if plan['has_predicates'] and matches:
+            return None
+        results = [float(matches)]
+    elif matches:
+        return None
+    else:
+        results = []
+    
+    return {
+        'xpath': plan['expression'],
+        'results_count': len(results),
+        'results': results
+    }
@@ -0,0 +1,77 @@
+import threading
+
+from metrics import metrics
+from deadline import Cancelled, Deadline, SharedDeadline, DEADLINE_POLL_INTERVAL
+
+
+class _Call:
+    """Computação em curso partilhada pelos pedidos com a mesma chave"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.deadline = None
+
+
+class SingleFlight:
+    """Agrupa pedidos concorrentes idênticos numa só computação (single-flight)
+    
+    O primeiro pedido com uma chave executa a função; os que chegam enquanto
+    esta decorre esperam e recebem o mesmo resultado (ou a mesma exceção).
+    Nada fica guardado depois de terminar: não é uma cache. O resultado é
+    partilhado, pelo que quem o recebe não o deve alterar.
+    
+    Com deadline, cada pedido deixa de esperar quando o seu cliente desiste, e a
+    função recebe (em deadline=) um prazo partilhado que só é cancelado quando
+    todos os pedidos do grupo desistiram.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+    
+    def do(self, key, function, *args, deadline=None):
+        """Executa function(*args) uma vez por grupo de pedidos concorrentes com a mesma chave"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                if deadline is not None:
+                    call.deadline = SharedDeadline(deadline)
+            elif call.deadline is not None:
+                # Um pedido sem prazo mantém a computação até ao fim
+                call.deadline.add(deadline or Deadline())
+        
+        if not leader:
+            if deadline is None:
+                call.done.wait()
+            else:
+                while not call.done.wait(DEADLINE_POLL_INTERVAL):
+                    deadline.check('wait')
+            if isinstance(call.error, Cancelled):
+                # Os outros pedidos desistiram antes de este se juntar ao grupo: executa-o de novo
+                if deadline is not None:
+                    deadline.check('wait')
+                return self.do(key, function, *args, deadline=deadline)
+            # Só conta como agrupado quando o resultado (ou erro) do grupo é de facto reutilizado
+            metrics.increment('singleflight_coalesced')
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        metrics.increment('singleflight_executed')
+        try:
+            if call.deadline is not None:
+                call.result = function(*args, deadline=call.deadline)
+            else:
+                call.result = function(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
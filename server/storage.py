@@ -0,0 +1,329 @@
+import os
+import json
+import mmap
+import base64
+import logging
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+
+from path_summary import compute_path_summary, answer_from_summary
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Backend de armazenamento: mongo (por omissão), memory ou filesystem
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongo').lower()
+STORAGE_PATH = os.getenv('STORAGE_PATH', '/tmp/xml_storage')
+
+# Paginação da listagem de XMLs
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Tamanho dos blocos usados nas transferências em streaming
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1MB em bytes
+
+# Ligação em segundo plano: espera (s) após a primeira tentativa falhada, duplicada até ao máximo
+STORAGE_RETRY_INITIAL = float(os.getenv('STORAGE_RETRY_INITIAL', 0.5))
+STORAGE_RETRY_MAX = float(os.getenv('STORAGE_RETRY_MAX', 30))
+
+
+def content_bytes(content):
+    """Conteúdo XML em bytes UTF-8 (str é codificado; bytes é devolvido sem cópia)"""
+    if isinstance(content, str):
+        return content.encode('utf-8')
+    return content if isinstance(content, bytes) else bytes(content)
+
+
+def close_source(source):
+    """Fecha o mmap devolvido por retrieve_xml_source depois de lido (str e bytes são ignorados)
+    
+    Enquanto houver memoryviews sobre o mmap, o fecho fica para o coletor de lixo.
+    """
+    if isinstance(source, mmap.mmap):
+        try:
+            source.close()
+        except BufferError:
+            pass
+
+
+def content_text(content):
+    """Conteúdo XML como str (bytes, memoryview ou mmap são descodificados de UTF-8)"""
+    return content if isinstance(content, str) else str(content, 'utf-8')
+
+
+class StorageBackend:
+    """Interface comum dos backends de armazenamento de documentos XML
+    
+    Os métodos sem implementação por omissão têm de ser definidos por cada backend.
+    Os restantes são construídos sobre eles e podem ser otimizados quando o backend
+    o permite (ex.: insert_many no MongoDB). O conteúdo recebido na escrita pode ser
+    str ou bytes UTF-8.
+    """
+    
+    name = None
+    
+    def connect(self):
+        """Prepara o backend - devolve True se estiver disponível"""
+        return True
+    
+    def disconnect(self):
+        """Liberta os recursos do backend"""
+        pass
+    
+    def is_connected(self):
+        return True
+    
+    def timeout(self, seconds):
+        """Contexto em que as operações do backend terminam ao fim de seconds (None = sem limite)"""
+        return nullcontext()
+    
+    def create_indexes(self):
+        pass
+    
+    # Escrita
+    
+    def insert_xml(self, filename, content):
+        raise NotImplementedError
+    
+    def insert_xml_many(self, documents):
+        """Insere vários documentos (filename, content) - devolve {xml_id, error} por documento"""
+        results = []
+        for filename, content in documents:
+            try:
+                results.append({'xml_id': self.insert_xml(filename, content), 'error': None})
+            except Exception as e:
+                results.append({'xml_id': None, 'error': str(e)})
+        return results
+    
+    def insert_xml_stream(self, filename, chunks):
+        """Insere documento recebido em blocos de bytes"""
+        return self.insert_xml(filename, b''.join(chunks))
+    
+    def update_xml(self, xml_id, content):
+        """Cria uma nova versão do documento - devolve o número da versão ou None"""
+        raise NotImplementedError
+    
+    def delete_xml(self, xml_id):
+        raise NotImplementedError
+    
+    def log_conversion(self, xml_id, conversion_type, status, error_message=None):
+        raise NotImplementedError
+    
+    # Leitura
+    
+    def retrieve_xml(self, xml_id):
+        """Devolve o documento com o conteúdo da versão mais recente, ou None"""
+        raise NotImplementedError
+    
+    def retrieve_xml_source(self, xml_id):
+        """Devolve (documento sem conteúdo, conteúdo como str ou buffer)"""
+        document = self.retrieve_xml(xml_id)
+        if document is None:
+            return None, None
+        return document, document.pop('content')
+    
+    def retrieve_xml_info(self, xml_id):
+        """Devolve só os metadados do documento (sem conteúdo nem resumo estrutural), ou None"""
+        document, _ = self.retrieve_xml_source(xml_id)
+        return document
+    
+    def open_xml_stream(self, xml_id, chunk_size=STREAM_CHUNK_SIZE):
+        """Devolve (documento, iterador de blocos de bytes)"""
+        document, source = self.retrieve_xml_source(xml_id)
+        if document is None:
+            return None, None
+        data = memoryview(source.encode('utf-8') if isinstance(source, str) else source)
+        return document, (bytes(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size))
+    
+    def retrieve_path_summary(self, xml_id):
+        """Devolve os metadados do documento com o resumo estrutural (path_summary), sem o conteúdo"""
+        document, source = self.retrieve_xml_source(xml_id)
+        if document is None:
+            return None
+        document['path_summary'] = compute_path_summary(source)
+        close_source(source)
+        return document
+    
+    def retrieve_xml_for_plan(self, xml_id, plan):
+        """Responde a um plano de consulta (path_summary.plan_summary_query) pelo resumo estrutural
+        
+        Devolve (documento, conteúdo, resposta): sem resposta do resumo o conteúdo vem
+        já lido, para avaliar a consulta sem uma segunda leitura do documento.
+        """
+        document = self.retrieve_path_summary(xml_id)
+        if document is None:
+            return None, None, None
+        answer = answer_from_summary(document.pop('path_summary', None), plan)
+        if answer is not None:
+            return document, None, answer
+        document, source = self.retrieve_xml_source(xml_id)
+        return document, source, None
+    
+    def retrieve_xml_version(self, xml_id, version):
+        raise NotImplementedError
+    
+    def list_xml_versions(self, xml_id):
+        raise NotImplementedError
+    
+    def list_xml_page(self, page_size=DEFAULT_PAGE_SIZE, cursor=None, include_count=False, **filters):
+        raise NotImplementedError
+    
+    def iter_xml_files(self, batch_size=DEFAULT_PAGE_SIZE, **filters):
+        raise NotImplementedError
+    
+    def list_xml_files(self, **filters):
+        """Lista todos os documentos XML armazenados"""
+        return list(self.iter_xml_files(**filters))
+
+
+class LocalStorageBackend(StorageBackend):
+    """Base dos backends locais: listagem, filtros e paginação keyset feitos em Python"""
+    
+    def _all_documents(self):
+        """Metadados de todos os documentos (dicts com _id, filename, size, created_at...)"""
+        raise NotImplementedError
+    
+    def _matches(self, doc, filename_prefix=None, min_size=None, max_size=None,
+                 created_after=None, created_before=None):
+        if filename_prefix and not doc['filename'].startswith(filename_prefix):
+            return False
+        if min_size and doc['size'] < min_size:
+            return False
+        if max_size and doc['size'] > max_size:
+            return False
+        if created_after and doc['created_at'] < datetime.fromisoformat(created_after):
+            return False
+        if created_before and doc['created_at'] >= datetime.fromisoformat(created_before):
+            return False
+        return True
+    
+    def _format_file_info(self, doc):
+        return {
+            '_id': doc['_id'],
+            'filename': doc['filename'],
+            'created_at': doc['created_at'].isoformat(),
+            'is_gridfs': False,
+            'size': doc['size'],
+            'storage': 'Document'
+        }
+    
+    def _sorted_matches(self, **filters):
+        documents = [doc for doc in self._all_documents() if self._matches(doc, **filters)]
+        documents.sort(key=lambda doc: (doc['created_at'], doc['_id']))
+        return documents
+    
+    def list_xml_page(self, page_size=DEFAULT_PAGE_SIZE, cursor=None, include_count=False, **filters):
+        """Lista uma página de documentos com paginação keyset sobre (created_at, _id)"""
+        page_size = max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+        documents = self._sorted_matches(**filters)
+        total = len(documents) if include_count else None
+        
+        if cursor:
+            token = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            last_key = (datetime.fromisoformat(token['created_at']), token['_id'])
+            documents = [doc for doc in documents if (doc['created_at'], doc['_id']) > last_key]
+        
+        has_more = len(documents) > page_size
+        documents = documents[:page_size]
+        
+        next_cursor = None
+        if has_more:
+            last = documents[-1]
+            token = json.dumps({'created_at': last['created_at'].isoformat(), '_id': last['_id']})
+            next_cursor = base64.urlsafe_b64encode(token.encode('utf-8')).decode('ascii')
+        
+        return {
+            'files': [self._format_file_info(doc) for doc in documents],
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+            'total': total
+        }
+    
+    def iter_xml_files(self, batch_size=DEFAULT_PAGE_SIZE, **filters):
+        for doc in self._sorted_matches(**filters):
+            yield self._format_file_info(doc)
+
+
+def get_storage_backend():
+    """Cria o backend de armazenamento configurado em STORAGE_BACKEND"""
+    if STORAGE_BACKEND == 'memory':
+        from memory_storage import MemoryStorage
+        storage = MemoryStorage()
+    elif STORAGE_BACKEND == 'filesystem':
+        from filesystem_storage import FileSystemStorage
+        storage = FileSystemStorage(STORAGE_PATH)
+    else:
+        from db_utils import get_db_connection
+        return get_db_connection()
+    
+    if storage.connect():
+        logger.info(f"Backend de armazenamento: {storage.name}")
+        return storage
+    return None
+
+
+class StorageConnector:
+    """Liga ao backend de armazenamento numa thread, sem atrasar o arranque do servidor
+    
+    As tentativas falhadas repetem-se com backoff exponencial até haver ligação ou
+    até stop(). Depois de ligado, o MongoClient volta a ligar-se sozinho se o
+    MongoDB ficar indisponível.
+    """
+    
+    def __init__(self, on_connected):
+        self.on_connected = on_connected
+        self.attempts = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='storage-connector', daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        """Termina as tentativas; depois de stop() o on_connected já não é chamado"""
+        with self._lock:
+            self._stopped.set()
+    
+    def status_message(self, storage):
+        """Estado da ligação para as verificações de prontidão"""
+        if storage is not None:
+            return f"Armazenamento ({storage.name}) disponível"
+        if self.last_error:
+            return f"A aguardar armazenamento ({STORAGE_BACKEND}, tentativa {self.attempts}): {self.last_error}"
+        return f"A ligar ao armazenamento ({STORAGE_BACKEND})"
+    
+    def _connect(self):
+        storage = get_storage_backend()
+        if storage is None:
+            raise ConnectionError("Conexão falhou")
+        try:
+            storage.create_indexes()
+        except Exception:
+            storage.disconnect()
+            raise
+        return storage
+    
+    def _run(self):
+        delay = STORAGE_RETRY_INITIAL
+        while not self._stopped.is_set():
+            self.attempts += 1
+            try:
+                storage = self._connect()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Tentativa {self.attempts} de conexão ao armazenamento falhou: {e} "
+                               f"(nova tentativa em {delay:.1f}s)")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, STORAGE_RETRY_MAX)
+                continue
+            
+            with self._lock:
+                if self._stopped.is_set():
+                    # O servidor terminou entretanto
+                    storage.disconnect()
+                else:
+                    self.on_connected(storage)
+            return
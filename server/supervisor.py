@@ -0,0 +1,60 @@
+import time
+import signal
+import logging
+import multiprocessing
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def supervise(target, workers, name, kwargs=None, restart_delay=1, join_timeout=None):
+    """Supervisor: arranca N processos com target(**kwargs) e reinicia os que terminarem
+    
+    No SIGTERM/SIGINT os processos recebem SIGTERM e o supervisor espera que terminem
+    (no máximo join_timeout segundos cada, depois são forçados; None = sem limite).
+    Usado pelo servidor gRPC multi-processo e pelos workers da fila de trabalhos.
+    """
+    # spawn: os processos não herdam estado do supervisor e criam a sua própria conexão ao MongoDB
+    context = multiprocessing.get_context('spawn')
+    processes = {}
+    stopping = False
+    
+    def start(index):
+        process = context.Process(target=target, kwargs=kwargs or {}, name=f"{name}-{index}")
+        process.start()
+        processes[index] = process
+        logger.info(f"Processo {name} {index} iniciado (pid {process.pid})")
+    
+    def shutdown(signum, frame):
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        logger.info(f"Sinal de paragem recebido, a terminar {len(processes)} processos {name}...")
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    for index in range(workers):
+        start(index)
+    
+    while not stopping:
+        for index, process in list(processes.items()):
+            if not process.is_alive() and not stopping:
+                logger.warning(f"Processo {name} {index} terminou (código {process.exitcode}) - a reiniciar")
+                time.sleep(restart_delay)
+                if not stopping:
+                    start(index)
+        time.sleep(0.5)
+    
+    for index, process in processes.items():
+        process.join(timeout=join_timeout)
+        if process.is_alive():
+            logger.warning(f"Processo {name} {index} não terminou a tempo - a forçar")
+            process.kill()
+            process.join()
+    
+    logger.info(f"Supervisor {name} parado")
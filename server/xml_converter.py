@@ -5,46 +5,116 @@ import logging
 from datetime import datetime
 import os
 import csv
-import pandas as pd
+import mmap
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+
+from compiled_cache import CompiledCache, file_key
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Número de threads usadas na validação de lotes (o lxml liberta o GIL durante o parsing)
+VALIDATION_WORKERS = int(os.getenv('VALIDATION_WORKERS', os.cpu_count() or 4))
+
+# Intervalo (em linhas) entre chamadas ao progress da conversão CSV
+CSV_PROGRESS_ROWS = int(os.getenv('CSV_PROGRESS_ROWS', 1000))
+
 class XMLConverter:
     def __init__(self):
         self.xml_schemas_path = "/app/../data/xml_schemas"
         self.xml_outputs_path = "/app/../data/xml_outputs"
+        # Schemas XSD, XSLT e XPath compilados, reutilizados entre pedidos
+        self.compiled = CompiledCache()
+    
+    def _parse_xml(self, xml_content):
+        """Faz o parsing com lxml a partir de str, de um buffer (bytes, memoryview, mmap),
+        de um stream legível (ficheiro, GridOut) ou de um iterador de blocos de bytes;
+        uma árvore já carregada (cache de documentos) é usada diretamente"""
+        if isinstance(xml_content, etree._Element):
+            return xml_content
+        if isinstance(xml_content, str):
+            return etree.fromstring(xml_content.encode('utf-8'))
+        if isinstance(xml_content, (bytes, bytearray, memoryview, mmap.mmap)):
+            return etree.fromstring(xml_content)
+        if hasattr(xml_content, 'read'):
+            # O lxml lê o stream em blocos, sem o materializar como bytes
+            return etree.parse(xml_content).getroot()
+        parser = etree.XMLParser()
+        for chunk in xml_content:
+            parser.feed(chunk)
+        return parser.close()
     
     def validate_xml(self, xml_content, schema_path=None):
         """Valida XML contra um schema XSD se fornecido"""
         try:
             if schema_path and os.path.exists(schema_path):
-                with open(schema_path, 'r', encoding='utf-8') as schema_file:
-                    schema_doc = etree.parse(schema_file)
-                    schema = etree.XMLSchema(schema_doc)
-                    
-                xml_doc = etree.fromstring(xml_content.encode('utf-8'))
-                if schema.validate(xml_doc):
+                xml_doc = self._parse_xml(xml_content)
+                with self.compiled.use(file_key('xsd', schema_path), lambda: self._load_schema(schema_path)) as schema:
+                    is_valid = schema.validate(xml_doc)
+                    errors = [str(error) for error in schema.error_log]
+                
+                if is_valid:
                     logger.info("XML válido de acordo com o schema")
                     return True, "XML válido"
                 else:
-                    errors = [str(error) for error in schema.error_log]
                     logger.warning(f"XML inválido: {errors}")
                     return False, errors
             else:
                 # Validação básica de XML bem formado
-                ET.fromstring(xml_content)
+                self._parse_xml(xml_content)
                 logger.info("XML bem formado")
                 return True, "XML bem formado"
                 
-        except ET.ParseError as e:
+        except (ET.ParseError, etree.XMLSyntaxError) as e:
             logger.error(f"Erro de parsing XML: {e}")
             return False, str(e)
         except Exception as e:
             logger.error(f"Erro na validação: {e}")
             return False, str(e)
     
+    def _load_schema(self, schema_path):
+        with open(schema_path, 'r', encoding='utf-8') as schema_file:
+            return etree.XMLSchema(etree.parse(schema_file))
+    
+    def validate_xml_many(self, xml_contents):
+        """Verifica em paralelo se vários documentos XML estão bem formados"""
+        def check_well_formed(xml_content):
+            try:
+                self._parse_xml(xml_content)
+                return True, "XML bem formado"
+            except Exception as e:
+                return False, str(e)
+        
+        if not xml_contents:
+            return []
+        
+        workers = min(VALIDATION_WORKERS, len(xml_contents))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(check_well_formed, xml_contents))
+        
+        invalid = sum(1 for is_valid, _ in results if not is_valid)
+        logger.info(f"Lote de {len(results)} XMLs validado ({invalid} inválidos)")
+        return results
+    
+    def iter_validated_chunks(self, chunks):
+        """Valida XML bem formado em streaming, devolvendo os blocos à medida que são lidos"""
+        parser = etree.XMLPullParser(events=('end',))
+        
+        for chunk in chunks:
+            parser.feed(chunk)
+            
+            # Liberta os elementos já processados para manter a memória constante
+            for _, element in parser.read_events():
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            
+            yield chunk
+        
+        # Lança XMLSyntaxError se o documento estiver incompleto
+        parser.close()
+    
     def xml_to_json(self, xml_content):
         """Converte XML para JSON"""
         try:
@@ -53,7 +123,7 @@ class XMLConverter:
                 
                 # Adicionar atributos
                 if element.attrib:
-                    result['@attributes'] = element.attrib
+                    result['@attributes'] = dict(element.attrib)
                 
                 # Adicionar texto se existir
                 if element.text and element.text.strip():
@@ -62,8 +132,10 @@ class XMLConverter:
                     else:
                         result['#text'] = element.text.strip()
                 
-                # Processar elementos filhos
+                # Processar elementos filhos (ignora comentários e instruções de processamento)
                 for child in element:
+                    if not isinstance(child.tag, str):
+                        continue
                     child_data = xml_to_dict(child)
                     if child.tag in result:
                         # Se já existe, converter para lista
@@ -75,7 +147,7 @@ class XMLConverter:
                 
                 return result
             
-            root = ET.fromstring(xml_content)
+            root = self._parse_xml(xml_content)
             json_data = {root.tag: xml_to_dict(root)}
             
             logger.info("Conversão XML para JSON realizada com sucesso")
@@ -143,67 +215,24 @@ class XMLConverter:
             if not os.path.exists(xslt_path):
                 return False, f"Arquivo XSLT não encontrado: {xslt_path}"
             
-            # Carregar XML e XSLT
-            xml_doc = etree.fromstring(xml_content.encode('utf-8'))
-            xslt_doc = etree.parse(xslt_path)
-            transform = etree.XSLT(xslt_doc)
-            
-            # Aplicar transformação
-            result = transform(xml_doc)
+            # Carregar XML e XSLT (compilado uma vez por versão do ficheiro)
+            xml_doc = self._parse_xml(xml_content)
+            with self.compiled.use(file_key('xslt', xslt_path), lambda: etree.XSLT(etree.parse(xslt_path))) as transform:
+                # Aplicar transformação
+                result = str(transform(xml_doc))
             
             logger.info("Transformação XSLT aplicada com sucesso")
-            return True, str(result)
+            return True, result
             
         except Exception as e:
             logger.error(f"Erro na transformação XSLT: {e}")
             return False, str(e)
     
-    def csv_to_xml(self, csv_content, root_element="dataset", row_element="record"):
-        """Converte CSV para XML estruturado"""
+    def csv_to_xml(self, csv_content, root_element="dataset", row_element="record", progress=None):
+        """Converte CSV para XML estruturado - progress(linhas, total) é chamado durante a conversão"""
         try:
-            # Ler CSV usando pandas para melhor manipulação
-            df = pd.read_csv(StringIO(csv_content))
-            
-            # Criar elemento raiz
-            root = ET.Element(root_element)
-            root.set("source", "kaggle")
-            root.set("generated", datetime.now().isoformat())
-            root.set("records", str(len(df)))
-            
-            # Adicionar metadados
-            metadata = ET.SubElement(root, "metadata")
-            columns = ET.SubElement(metadata, "columns")
-            
-            for col in df.columns:
-                col_elem = ET.SubElement(columns, "column")
-                col_elem.set("name", str(col))
-                col_elem.set("type", str(df[col].dtype))
-                col_elem.set("non_null", str(df[col].notna().sum()))
-            
-            # Adicionar dados
-            data_elem = ET.SubElement(root, "data")
-            
-            for index, row in df.iterrows():
-                record = ET.SubElement(data_elem, row_element)
-                record.set("id", str(index))
-                
-                for col in df.columns:
-                    field = ET.SubElement(record, self._clean_column_name(col))
-                    value = row[col]
-                    
-                    if pd.isna(value):
-                        field.set("null", "true")
-                        field.text = ""
-                    else:
-                        field.text = str(value)
-            
-            # Converter para string formatada
-            xml_str = ET.tostring(root, encoding='unicode')
-            formatted_xml = etree.tostring(
-                etree.fromstring(xml_str), 
-                pretty_print=True, 
-                encoding='unicode'
-            )
+            root, df = self._csv_to_tree(csv_content, root_element, row_element, progress)
+            formatted_xml = etree.tostring(root, pretty_print=True, encoding='unicode')
             
             logger.info(f"CSV convertido para XML: {len(df)} registros")
             return True, formatted_xml
@@ -212,6 +241,82 @@ class XMLConverter:
             logger.error(f"Erro na conversão CSV para XML: {e}")
             return False, str(e)
     
+    def ingest_csv(self, csv_content, root_element="dataset", row_element="record"):
+        """Converte CSV para XML, gera o schema XSD e valida o XML contra ele sobre a mesma árvore"""
+        try:
+            root, df = self._csv_to_tree(csv_content, root_element, row_element)
+            xml_content = etree.tostring(root, pretty_print=True, encoding='unicode')
+            
+            # Schema no namespace do próprio documento, para que a validação seja aplicável
+            xsd_content = self._xsd_for_tree(root, etree.QName(root).namespace)
+            schema = etree.XMLSchema(etree.fromstring(xsd_content.encode('utf-8')))
+            is_valid = schema.validate(root)
+            
+            logger.info(f"CSV ingerido: {len(df)} registros, XML {'válido' if is_valid else 'inválido'}")
+            return True, {
+                'xml_content': xml_content,
+                'xsd_content': xsd_content,
+                'records': len(df),
+                'columns': [str(col) for col in df.columns],
+                'is_valid': is_valid,
+                'validation_result': "XML válido" if is_valid else [str(error) for error in schema.error_log]
+            }
+            
+        except Exception as e:
+            logger.error(f"Erro na ingestão CSV: {e}")
+            return False, str(e)
+    
+    def _csv_to_tree(self, csv_content, root_element, row_element, progress=None):
+        """Constrói a árvore lxml do XML a partir do CSV - devolve (raiz, DataFrame)"""
+        # pandas só é importado no primeiro CSV (o arranque dos servidores não paga o import)
+        import pandas as pd
+        
+        # Ler CSV usando pandas para melhor manipulação
+        df = pd.read_csv(StringIO(csv_content))
+        
+        # Criar elemento raiz
+        root = ET.Element(root_element)
+        root.set("source", "kaggle")
+        root.set("generated", datetime.now().isoformat())
+        root.set("records", str(len(df)))
+        
+        # Adicionar metadados
+        metadata = ET.SubElement(root, "metadata")
+        columns = ET.SubElement(metadata, "columns")
+        
+        for col in df.columns:
+            col_elem = ET.SubElement(columns, "column")
+            col_elem.set("name", str(col))
+            col_elem.set("type", str(df[col].dtype))
+            col_elem.set("non_null", str(df[col].notna().sum()))
+        
+        # Adicionar dados
+        data_elem = ET.SubElement(root, "data")
+        
+        total = len(df)
+        if progress:
+            progress(0, total)
+        
+        for position, (index, row) in enumerate(df.iterrows(), 1):
+            record = ET.SubElement(data_elem, row_element)
+            record.set("id", str(index))
+            
+            for col in df.columns:
+                field = ET.SubElement(record, self._clean_column_name(col))
+                value = row[col]
+                
+                if pd.isna(value):
+                    field.set("null", "true")
+                    field.text = ""
+                else:
+                    field.text = str(value)
+            
+            if progress and (position % CSV_PROGRESS_ROWS == 0 or position == total):
+                progress(position, total)
+        
+        # Passar para lxml (formatação na serialização, XPath/XSD sobre a mesma árvore)
+        return etree.fromstring(ET.tostring(root, encoding='unicode')), df
+    
     def _clean_column_name(self, column_name):
         """Limpa nomes de colunas para XML válido"""
         import re
@@ -223,18 +328,35 @@ class XMLConverter:
         return clean_name.lower()
     
     def generate_xsd_from_xml(self, xml_content, target_namespace="http://kaggle-data.local"):
-        """Gera schema XSD a partir de XML"""
+        """Gera schema XSD a partir de XML (sem target_namespace o schema não tem namespace)"""
         try:
-            root = ET.fromstring(xml_content)
+            root = self._parse_xml(xml_content)
+            xsd_content = self._xsd_for_tree(root, target_namespace)
+            
+            logger.info("XSD schema gerado com sucesso")
+            return True, xsd_content
             
-            # Criar XSD básico
-            xsd_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        except Exception as e:
+            logger.error(f"Erro ao gerar XSD: {e}")
+            return False, str(e)
+    
+    def _xsd_for_tree(self, root, target_namespace):
+        """Gera o XSD para a árvore já carregada"""
+        namespace_attributes = ""
+        if target_namespace:
+            namespace_attributes = f'''
            targetNamespace="{target_namespace}"
            xmlns="{target_namespace}"
-           elementFormDefault="qualified">
+           elementFormDefault="qualified"'''
+        
+        data = root.find('data')
+        row_tag = data[0].tag if data is not None and len(data) else "record"
+        
+        # Criar XSD básico
+        return f'''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"{namespace_attributes}>
 
-    <xs:element name="{root.tag}">
+    <xs:element name="{etree.QName(root).localname}">
         <xs:complexType>
             <xs:sequence>
                 <xs:element name="metadata" minOccurs="0">
@@ -259,7 +381,7 @@ class XMLConverter:
                 <xs:element name="data">
                     <xs:complexType>
                         <xs:sequence>
-                            <xs:element name="record" maxOccurs="unbounded">
+                            <xs:element name="{row_tag}" minOccurs="0" maxOccurs="unbounded">
                                 <xs:complexType>
                                     <xs:sequence>
                                         <xs:any maxOccurs="unbounded" processContents="lax"/>
@@ -278,19 +400,22 @@ class XMLConverter:
     </xs:element>
 
 </xs:schema>'''
-            
-            logger.info("XSD schema gerado com sucesso")
-            return True, xsd_content
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar XSD: {e}")
-            return False, str(e)
     
+    def check_xpath(self, xpath_expression):
+        """Valida a sintaxe da expressão XPath sem precisar do documento"""
+        try:
+            with self.compiled.use(('xpath', xpath_expression), lambda: etree.XPath(xpath_expression)):
+                return True, None
+        except etree.XPathSyntaxError as e:
+            logger.error(f"Expressão XPath inválida: {e}")
+            return False, str(e)
+
     def query_xml_xpath(self, xml_content, xpath_expression):
         """Executa consulta XPath sobre XML"""
         try:
-            doc = etree.fromstring(xml_content.encode('utf-8'))
-            results = doc.xpath(xpath_expression)
+            doc = self._parse_xml(xml_content)
+            with self.compiled.use(('xpath', xpath_expression), lambda: etree.XPath(xpath_expression)) as xpath:
+                results = xpath(doc)
             
             # Verificar se o resultado é um valor escalar (número, booleano, string)
             if isinstance(results, (int, float, bool, str)):
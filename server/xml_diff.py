@@ -0,0 +1,70 @@
+import difflib
+
+
+def _split_lines(content):
+    """Divide o conteúdo em linhas, preservando os terminadores"""
+    return content.splitlines(keepends=True)
+
+
+def compute_delta(old_content, new_content):
+    """Calcula o delta de linhas entre duas versões de um documento
+    
+    O delta é uma lista de operações aplicadas sobre as linhas da versão anterior:
+    {'op': 'copy', 'start': i, 'end': j} copia as linhas [i, j) da versão anterior
+    {'op': 'insert', 'lines': [...]} insere linhas novas
+    """
+    old_lines = _split_lines(old_content)
+    new_lines = _split_lines(new_content)
+    
+    # Prefixo e sufixo comuns são resolvidos sem difflib (edições pequenas em documentos grandes)
+    prefix = 0
+    max_prefix = min(len(old_lines), len(new_lines))
+    while prefix < max_prefix and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    
+    suffix = 0
+    max_suffix = max_prefix - prefix
+    while suffix < max_suffix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    
+    delta = []
+    if prefix:
+        delta.append({'op': 'copy', 'start': 0, 'end': prefix})
+    
+    old_middle = old_lines[prefix:len(old_lines) - suffix]
+    new_middle = new_lines[prefix:len(new_lines) - suffix]
+    matcher = difflib.SequenceMatcher(None, old_middle, new_middle)
+    
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append({'op': 'copy', 'start': prefix + i1, 'end': prefix + i2})
+        elif j2 > j1:
+            delta.append({'op': 'insert', 'lines': new_middle[j1:j2]})
+    
+    if suffix:
+        delta.append({'op': 'copy', 'start': len(old_lines) - suffix, 'end': len(old_lines)})
+    
+    return delta
+
+
+def apply_delta(base_content, delta):
+    """Reconstrói a versão seguinte aplicando o delta ao conteúdo da versão anterior"""
+    base_lines = _split_lines(base_content)
+    result = []
+    
+    for operation in delta:
+        if operation['op'] == 'copy':
+            result.extend(base_lines[operation['start']:operation['end']])
+        else:
+            result.extend(operation['lines'])
+    
+    return ''.join(result)
+
+
+def delta_size(delta):
+    """Tamanho aproximado (bytes) das linhas novas guardadas no delta"""
+    return sum(
+        len(line.encode('utf-8'))
+        for operation in delta if operation['op'] == 'insert'
+        for line in operation['lines']
+    )
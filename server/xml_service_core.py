@@ -0,0 +1,148 @@
+import logging
+
+from storage import StorageConnector, STORAGE_BACKEND, close_source
+from xml_converter import XMLConverter
+from cpu_pool import CPUPool
+from singleflight import SingleFlight
+from document_cache import DocumentCache, document_version
+from jobs import JobQueue, job_status
+from deadline import Deadline
+from path_summary import plan_summary_query
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Mensagem devolvida enquanto a fila de trabalhos não está disponível
+JOBS_UNAVAILABLE = "Fila de trabalhos indisponível (requer o armazenamento MongoDB ligado)"
+
+
+class ServiceError(Exception):
+    """Erro de uma operação do núcleo, com a mensagem a devolver ao cliente"""
+
+
+class XMLServiceCore:
+    """Núcleo dos serviços XML, independente do protocolo
+    
+    Guarda o que os front-ends XML-RPC e gRPC partilham: a ligação ao armazenamento
+    (e o pool de conexões do MongoClient), o conversor com os schemas/XPath compilados,
+    o pool de processos, o singleflight, a cache de documentos e a fila de trabalhos.
+    Cada front-end cria o seu núcleo se não lhe for dado um; o combined_server.py
+    dá o mesmo aos dois, para que as caches aquecidas sirvam ambos os protocolos.
+    """
+    
+    def __init__(self):
+        self.converter = XMLConverter()
+        # Parsing, XPath, JSON e validação podem correr num pool de processos (CPU_POOL_WORKERS)
+        self.cpu_pool = CPUPool(self.converter)
+        # Pedidos concorrentes idênticos (ex.: XPath de um dashboard) partilham a mesma execução
+        self.flights = SingleFlight()
+        # Árvores dos documentos usados recentemente (processamento fora do pool de processos)
+        self.documents = DocumentCache()
+        self.db = None
+        # Fila de trabalhos assíncronos (só com o armazenamento MongoDB)
+        self.jobs = None
+        self.connector = StorageConnector(self._storage_connected)
+        self.connector.start()
+    
+    def _storage_connected(self, db):
+        self.jobs = JobQueue(db) if db.name == 'mongo' else None
+        self.db = db
+        logger.info(f"Armazenamento ({db.name}) inicializado com sucesso")
+    
+    def close(self):
+        """Liberta o backend de armazenamento (escrevendo os logs pendentes) e o pool de processos"""
+        self.connector.stop()
+        self.cpu_pool.shutdown()
+        self.documents.clear()
+        if self.db:
+            self.db.disconnect()
+    
+    def ready_status(self):
+        """Estado de prontidão (armazenamento ligado) para Ready/ready"""
+        db = self.db
+        return {
+            "ready": db is not None and db.is_connected(),
+            "storage": db.name if db else STORAGE_BACKEND,
+            "message": self.connector.status_message(db),
+            "attempts": self.connector.attempts
+        }
+    
+    def run_on_document(self, method, xml_id, *args, deadline=None):
+        """Recupera o documento e executa converter.<method> sobre ele - devolve (success, result) ou None se não existir
+        
+        Pedidos concorrentes idênticos partilham a recuperação, o parsing e o resultado.
+        Fora do pool de processos a árvore fica na cache de documentos para os pedidos seguintes.
+        Caminhos simples e count() em query_xml_xpath são respondidos pelo resumo estrutural
+        quando possível, lido junto com o conteúdo (uma só leitura do documento).
+        Com deadline, o prazo do cliente limita a leitura no armazenamento e o cancelamento
+        é verificado entre a leitura, o parsing e a avaliação (Cancelled).
+        """
+        plan = plan_summary_query(args[0]) if method == 'query_xml_xpath' else None
+        
+        def compute(deadline=None):
+            deadline = deadline or Deadline()
+            
+            # Recuperar XML (mmap da cache local para documentos grandes)
+            deadline.check('fetch')
+            answer = None
+            try:
+                with self.db.timeout(deadline.remaining()):
+                    if plan:
+                        document, xml_content, answer = self.db.retrieve_xml_for_plan(xml_id, plan)
+                    else:
+                        document, xml_content = self.db.retrieve_xml_source(xml_id)
+            except Exception:
+                # Prazo esgotado durante a leitura: conta como trabalho abandonado
+                deadline.check('fetch')
+                raise
+            if not document:
+                return None
+            if answer is not None:
+                return True, answer
+            try:
+                if self.cpu_pool.offloads(method):
+                    return self.cpu_pool.run(method, xml_content, *args, deadline=deadline)
+                
+                def parse(source):
+                    deadline.check('parse')
+                    return self.converter._parse_xml(source)
+                
+                with self.documents.use(xml_id, document_version(document), xml_content, parse) as tree:
+                    deadline.check('evaluate')
+                    return getattr(self.converter, method)(tree if tree is not None else xml_content, *args)
+            finally:
+                # A árvore e o resultado não referenciam o conteúdo lido (mmap da cache local)
+                close_source(xml_content)
+        
+        return self.flights.do((method, xml_id) + args, compute, deadline=deadline)
+    
+    def list_xml(self, page_size=None, cursor=None, include_count=False, **filters):
+        """Lista os XMLs - devolve o dicionário de list_xml_page
+        
+        A paginação é opcional: sem page_size nem cursor são devolvidos todos os
+        documentos e o total, como antes de existir paginação.
+        """
+        if not page_size and not cursor:
+            files = list(self.db.iter_xml_files(**filters))
+            return {'files': files, 'total': len(files), 'next_cursor': None, 'has_more': False}
+        return self.db.list_xml_page(page_size=page_size, cursor=cursor, include_count=include_count, **filters)
+    
+    def log_conversion(self, xml_id, conversion_type, status, error_message=None):
+        """Regista o log de conversão (ignorado sem armazenamento ligado)"""
+        if self.db:
+            self.db.log_conversion(xml_id, conversion_type, status, error_message)
+    
+    def submit_job(self, job_type, params, chunks=()):
+        """Cria um trabalho assíncrono - devolve o job_id"""
+        if not self.jobs:
+            raise ServiceError(JOBS_UNAVAILABLE)
+        return self.jobs.submit(job_type, params, chunks)
+    
+    def job_status(self, job_id):
+        """Estado, progresso e resultado de um trabalho (jobs.job_status)"""
+        if not self.jobs:
+            raise ServiceError(JOBS_UNAVAILABLE)
+        job = self.jobs.get(job_id)
+        if not job:
+            raise ServiceError(f"Trabalho {job_id} não encontrado")
+        return job_status(job)
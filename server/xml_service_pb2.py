@@ -24,39 +24,97 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11xml_service.proto\x12\nxmlservice\"\x07\n\x05\x45mpty\"8\n\x0fStoreXMLRequest\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x13\n\x0bxml_content\x18\x02 \x01(\t\"D\n\x10StoreXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06xml_id\x18\x03 \x01(\t\"\x1f\n\rGetXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\"V\n\x0bXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x13\n\x0bxml_content\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"2\n\x0cXPathRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x12\n\nexpression\x18\x02 \x01(\t\"B\n\rXPathResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07results\x18\x02 \x03(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"Y\n\x0fListXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12&\n\x05\x66iles\x18\x02 \x03(\x0b\x32\x17.xmlservice.XMLFileInfo\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"C\n\x0bXMLFileInfo\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x12\n\ncreated_at\x18\x03 \x01(\t\"&\n\x14\x43onvertToJSONRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\"O\n\x15\x43onvertToJSONResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0cjson_content\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"9\n\x12ValidateXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x13\n\x0bschema_path\x18\x02 \x01(\t\"d\n\x13ValidateXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08is_valid\x18\x02 \x01(\x08\x12\x19\n\x11validation_result\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t2\xea\x03\n\nXMLService\x12\x45\n\x08StoreXML\x12\x1b.xmlservice.StoreXMLRequest\x1a\x1c.xmlservice.StoreXMLResponse\x12<\n\x06GetXML\x12\x19.xmlservice.GetXMLRequest\x1a\x17.xmlservice.XMLResponse\x12:\n\x08ListXMLs\x12\x11.xmlservice.Empty\x1a\x1b.xmlservice.ListXMLResponse\x12\x41\n\nQueryXPath\x12\x18.xmlservice.XPathRequest\x1a\x19.xmlservice.XPathResponse\x12T\n\rConvertToJSON\x12 .xmlservice.ConvertToJSONRequest\x1a!.xmlservice.ConvertToJSONResponse\x12N\n\x0bValidateXML\x12\x1e.xmlservice.ValidateXMLRequest\x1a\x1f.xmlservice.ValidateXMLResponse\x12\x32\n\x04Ping\x12\x11.xmlservice.Empty\x1a\x17.xmlservice.XMLResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11xml_service.proto\x12\nxmlservice\"\x07\n\x05\x45mpty\"8\n\x0fStoreXMLRequest\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x13\n\x0bxml_content\x18\x02 \x01(\t\"D\n\x10StoreXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06xml_id\x18\x03 \x01(\t\"F\n\x14StoreXMLBatchRequest\x12.\n\tdocuments\x18\x01 \x03(\x0b\x32\x1b.xmlservice.StoreXMLRequest\"Q\n\x0eStoreXMLResult\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0e\n\x06xml_id\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"\x92\x01\n\x15StoreXMLBatchResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12+\n\x07results\x18\x03 \x03(\x0b\x32\x1a.xmlservice.StoreXMLResult\x12\x14\n\x0cstored_count\x18\x04 \x01(\x05\x12\x14\n\x0c\x66\x61iled_count\x18\x05 \x01(\x05\"*\n\x08XMLChunk\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"\x1f\n\rGetXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\"g\n\x0bXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x13\n\x0bxml_content\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\x12\x0f\n\x07version\x18\x05 \x01(\x05\"7\n\x10UpdateXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x13\n\x0bxml_content\x18\x02 \x01(\t\"F\n\x11UpdateXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\x05\"7\n\x14GetXMLVersionRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\x05\"Q\n\x0eXMLVersionInfo\x12\x0f\n\x07version\x18\x01 \x01(\x05\x12\x0c\n\x04kind\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x03\x12\x12\n\ncreated_at\x18\x04 \x01(\t\"i\n\x17ListXMLVersionsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12,\n\x08versions\x18\x03 \x03(\x0b\x32\x1a.xmlservice.XMLVersionInfo\"2\n\x0cXPathRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x12\n\nexpression\x18\x02 \x01(\t\"B\n\rXPathResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07results\x18\x02 \x03(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"\xb7\x01\n\x0fListXMLsRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\x12\x17\n\x0f\x66ilename_prefix\x18\x03 \x01(\t\x12\x10\n\x08min_size\x18\x04 \x01(\x03\x12\x10\n\x08max_size\x18\x05 \x01(\x03\x12\x15\n\rcreated_after\x18\x06 \x01(\t\x12\x16\n\x0e\x63reated_before\x18\x07 \x01(\t\x12\x15\n\rinclude_count\x18\x08 \x01(\x08\"\x80\x01\n\x0fListXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12&\n\x05\x66iles\x18\x02 \x03(\x0b\x32\x17.xmlservice.XMLFileInfo\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\x12\x13\n\x0bnext_cursor\x18\x04 \x01(\t\x12\x10\n\x08has_more\x18\x05 \x01(\x08\"b\n\x0bXMLFileInfo\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x12\n\ncreated_at\x18\x03 \x01(\t\x12\x0c\n\x04size\x18\x04 \x01(\x03\x12\x0f\n\x07storage\x18\x05 \x01(\t\";\n\x08PathInfo\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x12\n\nattributes\x18\x03 \x03(\t\"\xb9\x01\n\x13\x44\x65scribeXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x10\n\x08\x66ilename\x18\x03 \x01(\t\x12\x0c\n\x04size\x18\x04 \x01(\x03\x12\x15\n\relement_count\x18\x05 \x01(\x05\x12\x11\n\tmax_depth\x18\x06 \x01(\x05\x12#\n\x05paths\x18\x07 \x03(\x0b\x32\x14.xmlservice.PathInfo\x12\x11\n\ttruncated\x18\x08 \x01(\x08\"&\n\x14\x43onvertToJSONRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\"O\n\x15\x43onvertToJSONResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0cjson_content\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"9\n\x12ValidateXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x13\n\x0bschema_path\x18\x02 \x01(\t\"d\n\x13ValidateXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08is_valid\x18\x02 \x01(\x08\x12\x19\n\x11validation_result\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"U\n\x08\x43SVChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x14\n\x0croot_element\x18\x02 \x01(\t\x12\x13\n\x0brow_element\x18\x03 \x01(\t\x12\x10\n\x08\x66ilename\x18\x04 \x01(\t\"\xa7\x01\n\x11IngestCSVResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06xml_id\x18\x03 \x01(\t\x12\x11\n\tschema_id\x18\x04 \x01(\t\x12\x0f\n\x07records\x18\x05 \x01(\x05\x12\x0f\n\x07\x63olumns\x18\x06 \x03(\t\x12\x10\n\x08is_valid\x18\x07 \x01(\x08\x12\x19\n\x11validation_result\x18\x08 \x01(\t\"W\n\x17\x43onvertJSONToXMLRequest\x12\x14\n\x0cjson_content\x18\x01 \x01(\t\x12\x14\n\x0croot_element\x18\x02 \x01(\t\x12\x10\n\x08\x66ilename\x18\x03 \x01(\t\"J\n\x13TransformXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x11\n\txslt_path\x18\x02 \x01(\t\x12\x10\n\x08\x66ilename\x18\x03 \x01(\t\"]\n\x14\x43onvertToXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bxml_content\x18\x03 \x01(\t\x12\x0e\n\x06xml_id\x18\x04 \x01(\t\">\n\x12GenerateXSDRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x18\n\x10target_namespace\x18\x02 \x01(\t\"L\n\x13GenerateXSDResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x13\n\x0bxsd_content\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"3\n\rXQueryRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x12\n\nexpression\x18\x02 \x01(\t\"\\\n\x0eXQueryResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07results\x18\x02 \x03(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x17\n\x0f\x63onverted_xpath\x18\x04 \x01(\t\"R\n\rReadyResponse\x12\r\n\x05ready\x18\x01 \x01(\x08\x12\x0f\n\x07storage\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x10\n\x08\x61ttempts\x18\x04 \x01(\x05\"\x89\x01\n\x08JobChunk\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x10\n\x08\x66ilename\x18\x03 \x01(\t\x12\x14\n\x0croot_element\x18\x04 \x01(\t\x12\x13\n\x0brow_element\x18\x05 \x01(\t\x12\x0f\n\x07xml_ids\x18\x06 \x03(\t\x12\x13\n\x0bschema_path\x18\x07 \x01(\t\"E\n\x11SubmitJobResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06job_id\x18\x03 \x01(\t\"\x1c\n\nJobRequest\x12\x0e\n\x06job_id\x18\x01 \x01(\t\"\x8f\x02\n\tJobStatus\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06job_id\x18\x03 \x01(\t\x12\x0c\n\x04type\x18\x04 \x01(\t\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x11\n\tprocessed\x18\x06 \x01(\x03\x12\r\n\x05total\x18\x07 \x01(\x03\x12\x13\n\x0b\x65ta_seconds\x18\x08 \x01(\x01\x12\x0e\n\x06xml_id\x18\t \x01(\t\x12\x13\n\x0bresult_json\x18\n \x01(\t\x12\r\n\x05\x65rror\x18\x0b \x01(\t\x12\x10\n\x08\x61ttempts\x18\x0c \x01(\x05\x12\x12\n\ncreated_at\x18\r \x01(\t\x12\x12\n\nupdated_at\x18\x0e \x01(\t\x12\r\n\x05phase\x18\x0f \x01(\t\"y\n\x0fMetricsResponse\x12\x37\n\x06values\x18\x01 \x03(\x0b\x32\'.xmlservice.MetricsResponse.ValuesEntry\x1a-\n\x0bValuesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x32\xdd\x0e\n\nXMLService\x12\x45\n\x08StoreXML\x12\x1b.xmlservice.StoreXMLRequest\x1a\x1c.xmlservice.StoreXMLResponse\x12T\n\rStoreXMLBatch\x12 .xmlservice.StoreXMLBatchRequest\x1a!.xmlservice.StoreXMLBatchResponse\x12<\n\x06GetXML\x12\x19.xmlservice.GetXMLRequest\x1a\x17.xmlservice.XMLResponse\x12H\n\tUpdateXML\x12\x1c.xmlservice.UpdateXMLRequest\x1a\x1d.xmlservice.UpdateXMLResponse\x12J\n\rGetXMLVersion\x12 .xmlservice.GetXMLVersionRequest\x1a\x17.xmlservice.XMLResponse\x12Q\n\x0fListXMLVersions\x12\x19.xmlservice.GetXMLRequest\x1a#.xmlservice.ListXMLVersionsResponse\x12\x46\n\x0eStoreXMLStream\x12\x14.xmlservice.XMLChunk\x1a\x1c.xmlservice.StoreXMLResponse(\x01\x12\x41\n\x0cGetXMLStream\x12\x19.xmlservice.GetXMLRequest\x1a\x14.xmlservice.XMLChunk0\x01\x12\x44\n\x08ListXMLs\x12\x1b.xmlservice.ListXMLsRequest\x1a\x1b.xmlservice.ListXMLResponse\x12H\n\x0eListXMLsStream\x12\x1b.xmlservice.ListXMLsRequest\x1a\x17.xmlservice.XMLFileInfo0\x01\x12I\n\x0b\x44\x65scribeXML\x12\x19.xmlservice.GetXMLRequest\x1a\x1f.xmlservice.DescribeXMLResponse\x12\x41\n\nQueryXPath\x12\x18.xmlservice.XPathRequest\x1a\x19.xmlservice.XPathResponse\x12T\n\rConvertToJSON\x12 .xmlservice.ConvertToJSONRequest\x1a!.xmlservice.ConvertToJSONResponse\x12N\n\x0bValidateXML\x12\x1e.xmlservice.ValidateXMLRequest\x1a\x1f.xmlservice.ValidateXMLResponse\x12K\n\x0f\x43onvertCSVToXML\x12\x14.xmlservice.CSVChunk\x1a .xmlservice.ConvertToXMLResponse(\x01\x12\x42\n\tIngestCSV\x12\x14.xmlservice.CSVChunk\x1a\x1d.xmlservice.IngestCSVResponse(\x01\x12Y\n\x10\x43onvertJSONToXML\x12#.xmlservice.ConvertJSONToXMLRequest\x1a .xmlservice.ConvertToXMLResponse\x12Q\n\x0cTransformXML\x12\x1f.xmlservice.TransformXMLRequest\x1a .xmlservice.ConvertToXMLResponse\x12N\n\x0bGenerateXSD\x12\x1e.xmlservice.GenerateXSDRequest\x1a\x1f.xmlservice.GenerateXSDResponse\x12\x44\n\x0bQueryXQuery\x12\x19.xmlservice.XQueryRequest\x1a\x1a.xmlservice.XQueryResponse\x12\x32\n\x04Ping\x12\x11.xmlservice.Empty\x1a\x17.xmlservice.XMLResponse\x12\x35\n\x05Ready\x12\x11.xmlservice.Empty\x1a\x19.xmlservice.ReadyResponse\x12<\n\nGetMetrics\x12\x11.xmlservice.Empty\x1a\x1b.xmlservice.MetricsResponse\x12\x42\n\tSubmitJob\x12\x14.xmlservice.JobChunk\x1a\x1d.xmlservice.SubmitJobResponse(\x01\x12=\n\x0cGetJobStatus\x12\x16.xmlservice.JobRequest\x1a\x15.xmlservice.JobStatus\x12;\n\x08WatchJob\x12\x16.xmlservice.JobRequest\x1a\x15.xmlservice.JobStatus0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'xml_service_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_METRICSRESPONSE_VALUESENTRY']._loaded_options = None
+  _globals['_METRICSRESPONSE_VALUESENTRY']._serialized_options = b'8\001'
   _globals['_EMPTY']._serialized_start=33
   _globals['_EMPTY']._serialized_end=40
   _globals['_STOREXMLREQUEST']._serialized_start=42
   _globals['_STOREXMLREQUEST']._serialized_end=98
   _globals['_STOREXMLRESPONSE']._serialized_start=100
   _globals['_STOREXMLRESPONSE']._serialized_end=168
-  _globals['_GETXMLREQUEST']._serialized_start=170
-  _globals['_GETXMLREQUEST']._serialized_end=201
-  _globals['_XMLRESPONSE']._serialized_start=203
-  _globals['_XMLRESPONSE']._serialized_end=289
-  _globals['_XPATHREQUEST']._serialized_start=291
-  _globals['_XPATHREQUEST']._serialized_end=341
-  _globals['_XPATHRESPONSE']._serialized_start=343
-  _globals['_XPATHRESPONSE']._serialized_end=409
-  _globals['_LISTXMLRESPONSE']._serialized_start=411
-  _globals['_LISTXMLRESPONSE']._serialized_end=500
-  _globals['_XMLFILEINFO']._serialized_start=502
-  _globals['_XMLFILEINFO']._serialized_end=569
-  _globals['_CONVERTTOJSONREQUEST']._serialized_start=571
-  _globals['_CONVERTTOJSONREQUEST']._serialized_end=609
-  _globals['_CONVERTTOJSONRESPONSE']._serialized_start=611
-  _globals['_CONVERTTOJSONRESPONSE']._serialized_end=690
-  _globals['_VALIDATEXMLREQUEST']._serialized_start=692
-  _globals['_VALIDATEXMLREQUEST']._serialized_end=749
-  _globals['_VALIDATEXMLRESPONSE']._serialized_start=751
-  _globals['_VALIDATEXMLRESPONSE']._serialized_end=851
-  _globals['_XMLSERVICE']._serialized_start=854
-  _globals['_XMLSERVICE']._serialized_end=1344
+  _globals['_STOREXMLBATCHREQUEST']._serialized_start=170
+  _globals['_STOREXMLBATCHREQUEST']._serialized_end=240
+  _globals['_STOREXMLRESULT']._serialized_start=242
+  _globals['_STOREXMLRESULT']._serialized_end=323
+  _globals['_STOREXMLBATCHRESPONSE']._serialized_start=326
+  _globals['_STOREXMLBATCHRESPONSE']._serialized_end=472
+  _globals['_XMLCHUNK']._serialized_start=474
+  _globals['_XMLCHUNK']._serialized_end=516
+  _globals['_GETXMLREQUEST']._serialized_start=518
+  _globals['_GETXMLREQUEST']._serialized_end=549
+  _globals['_XMLRESPONSE']._serialized_start=551
+  _globals['_XMLRESPONSE']._serialized_end=654
+  _globals['_UPDATEXMLREQUEST']._serialized_start=656
+  _globals['_UPDATEXMLREQUEST']._serialized_end=711
+  _globals['_UPDATEXMLRESPONSE']._serialized_start=713
+  _globals['_UPDATEXMLRESPONSE']._serialized_end=783
+  _globals['_GETXMLVERSIONREQUEST']._serialized_start=785
+  _globals['_GETXMLVERSIONREQUEST']._serialized_end=840
+  _globals['_XMLVERSIONINFO']._serialized_start=842
+  _globals['_XMLVERSIONINFO']._serialized_end=923
+  _globals['_LISTXMLVERSIONSRESPONSE']._serialized_start=925
+  _globals['_LISTXMLVERSIONSRESPONSE']._serialized_end=1030
+  _globals['_XPATHREQUEST']._serialized_start=1032
+  _globals['_XPATHREQUEST']._serialized_end=1082
+  _globals['_XPATHRESPONSE']._serialized_start=1084
+  _globals['_XPATHRESPONSE']._serialized_end=1150
+  _globals['_LISTXMLSREQUEST']._serialized_start=1153
+  _globals['_LISTXMLSREQUEST']._serialized_end=1336
+  _globals['_LISTXMLRESPONSE']._serialized_start=1339
+  _globals['_LISTXMLRESPONSE']._serialized_end=1467
+  _globals['_XMLFILEINFO']._serialized_start=1469
+  _globals['_XMLFILEINFO']._serialized_end=1567
+  _globals['_PATHINFO']._serialized_start=1569
+  _globals['_PATHINFO']._serialized_end=1628
+  _globals['_DESCRIBEXMLRESPONSE']._serialized_start=1631
+  _globals['_DESCRIBEXMLRESPONSE']._serialized_end=1816
+  _globals['_CONVERTTOJSONREQUEST']._serialized_start=1818
+  _globals['_CONVERTTOJSONREQUEST']._serialized_end=1856
+  _globals['_CONVERTTOJSONRESPONSE']._serialized_start=1858
+  _globals['_CONVERTTOJSONRESPONSE']._serialized_end=1937
+  _globals['_VALIDATEXMLREQUEST']._serialized_start=1939
+  _globals['_VALIDATEXMLREQUEST']._serialized_end=1996
+  _globals['_VALIDATEXMLRESPONSE']._serialized_start=1998
+  _globals['_VALIDATEXMLRESPONSE']._serialized_end=2098
+  _globals['_CSVCHUNK']._serialized_start=2100
+  _globals['_CSVCHUNK']._serialized_end=2185
+  _globals['_INGESTCSVRESPONSE']._serialized_start=2188
+  _globals['_INGESTCSVRESPONSE']._serialized_end=2355
+  _globals['_CONVERTJSONTOXMLREQUEST']._serialized_start=2357
+  _globals['_CONVERTJSONTOXMLREQUEST']._serialized_end=2444
+  _globals['_TRANSFORMXMLREQUEST']._serialized_start=2446
+  _globals['_TRANSFORMXMLREQUEST']._serialized_end=2520
+  _globals['_CONVERTTOXMLRESPONSE']._serialized_start=2522
+  _globals['_CONVERTTOXMLRESPONSE']._serialized_end=2615
+  _globals['_GENERATEXSDREQUEST']._serialized_start=2617
+  _globals['_GENERATEXSDREQUEST']._serialized_end=2679
+  _globals['_GENERATEXSDRESPONSE']._serialized_start=2681
+  _globals['_GENERATEXSDRESPONSE']._serialized_end=2757
+  _globals['_XQUERYREQUEST']._serialized_start=2759
+  _globals['_XQUERYREQUEST']._serialized_end=2810
+  _globals['_XQUERYRESPONSE']._serialized_start=2812
+  _globals['_XQUERYRESPONSE']._serialized_end=2904
+  _globals['_READYRESPONSE']._serialized_start=2906
+  _globals['_READYRESPONSE']._serialized_end=2988
+  _globals['_JOBCHUNK']._serialized_start=2991
+  _globals['_JOBCHUNK']._serialized_end=3128
+  _globals['_SUBMITJOBRESPONSE']._serialized_start=3130
+  _globals['_SUBMITJOBRESPONSE']._serialized_end=3199
+  _globals['_JOBREQUEST']._serialized_start=3201
+  _globals['_JOBREQUEST']._serialized_end=3229
+  _globals['_JOBSTATUS']._serialized_start=3232
+  _globals['_JOBSTATUS']._serialized_end=3503
+  _globals['_METRICSRESPONSE']._serialized_start=3505
+  _globals['_METRICSRESPONSE']._serialized_end=3626
+  _globals['_METRICSRESPONSE_VALUESENTRY']._serialized_start=3581
+  _globals['_METRICSRESPONSE_VALUESENTRY']._serialized_end=3626
+  _globals['_XMLSERVICE']._serialized_start=3629
+  _globals['_XMLSERVICE']._serialized_end=5514
 # @@protoc_insertion_point(module_scope)
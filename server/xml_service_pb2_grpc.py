@@ -40,16 +40,56 @@ class XMLServiceStub(object):
                 request_serializer=xml__service__pb2.StoreXMLRequest.SerializeToString,
                 response_deserializer=xml__service__pb2.StoreXMLResponse.FromString,
                 _registered_method=True)
+        self.StoreXMLBatch = channel.unary_unary(
+                '/xmlservice.XMLService/StoreXMLBatch',
+                request_serializer=xml__service__pb2.StoreXMLBatchRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.StoreXMLBatchResponse.FromString,
+                _registered_method=True)
         self.GetXML = channel.unary_unary(
                 '/xmlservice.XMLService/GetXML',
                 request_serializer=xml__service__pb2.GetXMLRequest.SerializeToString,
                 response_deserializer=xml__service__pb2.XMLResponse.FromString,
                 _registered_method=True)
+        self.UpdateXML = channel.unary_unary(
+                '/xmlservice.XMLService/UpdateXML',
+                request_serializer=xml__service__pb2.UpdateXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.UpdateXMLResponse.FromString,
+                _registered_method=True)
+        self.GetXMLVersion = channel.unary_unary(
+                '/xmlservice.XMLService/GetXMLVersion',
+                request_serializer=xml__service__pb2.GetXMLVersionRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.XMLResponse.FromString,
+                _registered_method=True)
+        self.ListXMLVersions = channel.unary_unary(
+                '/xmlservice.XMLService/ListXMLVersions',
+                request_serializer=xml__service__pb2.GetXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.ListXMLVersionsResponse.FromString,
+                _registered_method=True)
+        self.StoreXMLStream = channel.stream_unary(
+                '/xmlservice.XMLService/StoreXMLStream',
+                request_serializer=xml__service__pb2.XMLChunk.SerializeToString,
+                response_deserializer=xml__service__pb2.StoreXMLResponse.FromString,
+                _registered_method=True)
+        self.GetXMLStream = channel.unary_stream(
+                '/xmlservice.XMLService/GetXMLStream',
+                request_serializer=xml__service__pb2.GetXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.XMLChunk.FromString,
+                _registered_method=True)
         self.ListXMLs = channel.unary_unary(
                 '/xmlservice.XMLService/ListXMLs',
-                request_serializer=xml__service__pb2.Empty.SerializeToString,
+                request_serializer=xml__service__pb2.ListXMLsRequest.SerializeToString,
                 response_deserializer=xml__service__pb2.ListXMLResponse.FromString,
                 _registered_method=True)
+        self.ListXMLsStream = channel.unary_stream(
+                '/xmlservice.XMLService/ListXMLsStream',
+                request_serializer=xml__service__pb2.ListXMLsRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.XMLFileInfo.FromString,
+                _registered_method=True)
+        self.DescribeXML = channel.unary_unary(
+                '/xmlservice.XMLService/DescribeXML',
+                request_serializer=xml__service__pb2.GetXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.DescribeXMLResponse.FromString,
+                _registered_method=True)
         self.QueryXPath = channel.unary_unary(
                 '/xmlservice.XMLService/QueryXPath',
                 request_serializer=xml__service__pb2.XPathRequest.SerializeToString,
@@ -65,11 +105,66 @@ class XMLServiceStub(object):
                 request_serializer=xml__service__pb2.ValidateXMLRequest.SerializeToString,
                 response_deserializer=xml__service__pb2.ValidateXMLResponse.FromString,
                 _registered_method=True)
+        self.ConvertCSVToXML = channel.stream_unary(
+                '/xmlservice.XMLService/ConvertCSVToXML',
+                request_serializer=xml__service__pb2.CSVChunk.SerializeToString,
+                response_deserializer=xml__service__pb2.ConvertToXMLResponse.FromString,
+                _registered_method=True)
+        self.IngestCSV = channel.stream_unary(
+                '/xmlservice.XMLService/IngestCSV',
+                request_serializer=xml__service__pb2.CSVChunk.SerializeToString,
+                response_deserializer=xml__service__pb2.IngestCSVResponse.FromString,
+                _registered_method=True)
+        self.ConvertJSONToXML = channel.unary_unary(
+                '/xmlservice.XMLService/ConvertJSONToXML',
+                request_serializer=xml__service__pb2.ConvertJSONToXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.ConvertToXMLResponse.FromString,
+                _registered_method=True)
+        self.TransformXML = channel.unary_unary(
+                '/xmlservice.XMLService/TransformXML',
+                request_serializer=xml__service__pb2.TransformXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.ConvertToXMLResponse.FromString,
+                _registered_method=True)
+        self.GenerateXSD = channel.unary_unary(
+                '/xmlservice.XMLService/GenerateXSD',
+                request_serializer=xml__service__pb2.GenerateXSDRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.GenerateXSDResponse.FromString,
+                _registered_method=True)
+        self.QueryXQuery = channel.unary_unary(
+                '/xmlservice.XMLService/QueryXQuery',
+                request_serializer=xml__service__pb2.XQueryRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.XQueryResponse.FromString,
+                _registered_method=True)
         self.Ping = channel.unary_unary(
                 '/xmlservice.XMLService/Ping',
                 request_serializer=xml__service__pb2.Empty.SerializeToString,
                 response_deserializer=xml__service__pb2.XMLResponse.FromString,
                 _registered_method=True)
+        self.Ready = channel.unary_unary(
+                '/xmlservice.XMLService/Ready',
+                request_serializer=xml__service__pb2.Empty.SerializeToString,
+                response_deserializer=xml__service__pb2.ReadyResponse.FromString,
+                _registered_method=True)
+        self.GetMetrics = channel.unary_unary(
+                '/xmlservice.XMLService/GetMetrics',
+                request_serializer=xml__service__pb2.Empty.SerializeToString,
+                response_deserializer=xml__service__pb2.MetricsResponse.FromString,
+                _registered_method=True)
+        self.SubmitJob = channel.stream_unary(
+                '/xmlservice.XMLService/SubmitJob',
+                request_serializer=xml__service__pb2.JobChunk.SerializeToString,
+                response_deserializer=xml__service__pb2.SubmitJobResponse.FromString,
+                _registered_method=True)
+        self.GetJobStatus = channel.unary_unary(
+                '/xmlservice.XMLService/GetJobStatus',
+                request_serializer=xml__service__pb2.JobRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.JobStatus.FromString,
+                _registered_method=True)
+        self.WatchJob = channel.unary_stream(
+                '/xmlservice.XMLService/WatchJob',
+                request_serializer=xml__service__pb2.JobRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.JobStatus.FromString,
+                _registered_method=True)
 
 
 class XMLServiceServicer(object):
@@ -83,6 +178,13 @@ class XMLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StoreXMLBatch(self, request, context):
+        """Armazena vários documentos XML numa só chamada (insert_many)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetXML(self, request, context):
         """Recupera um documento XML pelo ID
         """
@@ -90,8 +192,57 @@ class XMLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def UpdateXML(self, request, context):
+        """Atualiza um documento XML guardando um delta face à versão anterior
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetXMLVersion(self, request, context):
+        """Recupera uma versão específica de um documento XML
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListXMLVersions(self, request, context):
+        """Lista as versões de um documento XML
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StoreXMLStream(self, request_iterator, context):
+        """Armazena um documento XML enviado em blocos (sem limite de 4MB)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetXMLStream(self, request, context):
+        """Recupera um documento XML em blocos de tamanho fixo
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ListXMLs(self, request, context):
-        """Lista todos os XMLs armazenados
+        """Lista os XMLs armazenados (uma página por chamada)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListXMLsStream(self, request, context):
+        """Lista os XMLs armazenados em streaming (um XMLFileInfo por mensagem)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DescribeXML(self, request, context):
+        """Descreve a estrutura de um documento (caminhos, ocorrências e atributos)
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -118,8 +269,85 @@ class XMLServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ConvertCSVToXML(self, request_iterator, context):
+        """Converte CSV enviado em blocos para XML (opcionalmente armazenado)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def IngestCSV(self, request_iterator, context):
+        """CSV->XML->armazenamento->XSD->validação num só pedido (filename obrigatório)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ConvertJSONToXML(self, request, context):
+        """Converte JSON para XML (opcionalmente armazenado)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TransformXML(self, request, context):
+        """Aplica uma transformação XSLT a XML armazenado
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GenerateXSD(self, request, context):
+        """Gera schema XSD a partir de XML armazenado
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def QueryXQuery(self, request, context):
+        """Executa consulta XQuery sobre XML armazenado
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Ping(self, request, context):
-        """Ping para testar conectividade
+        """Ping para testar conectividade (o servidor está vivo)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Ready(self, request, context):
+        """Prontidão: o servidor está pronto quando o armazenamento está ligado
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Métricas do processo (ex.: singleflight_coalesced, cpu_pool_tasks)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubmitJob(self, request_iterator, context):
+        """Trabalhos assíncronos (CSV→XML, validação em lote): devolve o job_id sem esperar pela execução
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetJobStatus(self, request, context):
+        """Estado, progresso e resultado de um trabalho
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchJob(self, request, context):
+        """Envia o estado do trabalho sempre que muda, até terminar
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -133,16 +361,56 @@ def add_XMLServiceServicer_to_server(servicer, server):
                     request_deserializer=xml__service__pb2.StoreXMLRequest.FromString,
                     response_serializer=xml__service__pb2.StoreXMLResponse.SerializeToString,
             ),
+            'StoreXMLBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.StoreXMLBatch,
+                    request_deserializer=xml__service__pb2.StoreXMLBatchRequest.FromString,
+                    response_serializer=xml__service__pb2.StoreXMLBatchResponse.SerializeToString,
+            ),
             'GetXML': grpc.unary_unary_rpc_method_handler(
                     servicer.GetXML,
                     request_deserializer=xml__service__pb2.GetXMLRequest.FromString,
                     response_serializer=xml__service__pb2.XMLResponse.SerializeToString,
             ),
+            'UpdateXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateXML,
+                    request_deserializer=xml__service__pb2.UpdateXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.UpdateXMLResponse.SerializeToString,
+            ),
+            'GetXMLVersion': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetXMLVersion,
+                    request_deserializer=xml__service__pb2.GetXMLVersionRequest.FromString,
+                    response_serializer=xml__service__pb2.XMLResponse.SerializeToString,
+            ),
+            'ListXMLVersions': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListXMLVersions,
+                    request_deserializer=xml__service__pb2.GetXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.ListXMLVersionsResponse.SerializeToString,
+            ),
+            'StoreXMLStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.StoreXMLStream,
+                    request_deserializer=xml__service__pb2.XMLChunk.FromString,
+                    response_serializer=xml__service__pb2.StoreXMLResponse.SerializeToString,
+            ),
+            'GetXMLStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetXMLStream,
+                    request_deserializer=xml__service__pb2.GetXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.XMLChunk.SerializeToString,
+            ),
             'ListXMLs': grpc.unary_unary_rpc_method_handler(
                     servicer.ListXMLs,
-                    request_deserializer=xml__service__pb2.Empty.FromString,
+                    request_deserializer=xml__service__pb2.ListXMLsRequest.FromString,
                     response_serializer=xml__service__pb2.ListXMLResponse.SerializeToString,
             ),
+            'ListXMLsStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListXMLsStream,
+                    request_deserializer=xml__service__pb2.ListXMLsRequest.FromString,
+                    response_serializer=xml__service__pb2.XMLFileInfo.SerializeToString,
+            ),
+            'DescribeXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.DescribeXML,
+                    request_deserializer=xml__service__pb2.GetXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.DescribeXMLResponse.SerializeToString,
+            ),
             'QueryXPath': grpc.unary_unary_rpc_method_handler(
                     servicer.QueryXPath,
                     request_deserializer=xml__service__pb2.XPathRequest.FromString,
@@ -158,11 +426,66 @@ def add_XMLServiceServicer_to_server(servicer, server):
                     request_deserializer=xml__service__pb2.ValidateXMLRequest.FromString,
                     response_serializer=xml__service__pb2.ValidateXMLResponse.SerializeToString,
             ),
+            'ConvertCSVToXML': grpc.stream_unary_rpc_method_handler(
+                    servicer.ConvertCSVToXML,
+                    request_deserializer=xml__service__pb2.CSVChunk.FromString,
+                    response_serializer=xml__service__pb2.ConvertToXMLResponse.SerializeToString,
+            ),
+            'IngestCSV': grpc.stream_unary_rpc_method_handler(
+                    servicer.IngestCSV,
+                    request_deserializer=xml__service__pb2.CSVChunk.FromString,
+                    response_serializer=xml__service__pb2.IngestCSVResponse.SerializeToString,
+            ),
+            'ConvertJSONToXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.ConvertJSONToXML,
+                    request_deserializer=xml__service__pb2.ConvertJSONToXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.ConvertToXMLResponse.SerializeToString,
+            ),
+            'TransformXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.TransformXML,
+                    request_deserializer=xml__service__pb2.TransformXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.ConvertToXMLResponse.SerializeToString,
+            ),
+            'GenerateXSD': grpc.unary_unary_rpc_method_handler(
+                    servicer.GenerateXSD,
+                    request_deserializer=xml__service__pb2.GenerateXSDRequest.FromString,
+                    response_serializer=xml__service__pb2.GenerateXSDResponse.SerializeToString,
+            ),
+            'QueryXQuery': grpc.unary_unary_rpc_method_handler(
+                    servicer.QueryXQuery,
+                    request_deserializer=xml__service__pb2.XQueryRequest.FromString,
+                    response_serializer=xml__service__pb2.XQueryResponse.SerializeToString,
+            ),
             'Ping': grpc.unary_unary_rpc_method_handler(
                     servicer.Ping,
                     request_deserializer=xml__service__pb2.Empty.FromString,
                     response_serializer=xml__service__pb2.XMLResponse.SerializeToString,
             ),
+            'Ready': grpc.unary_unary_rpc_method_handler(
+                    servicer.Ready,
+                    request_deserializer=xml__service__pb2.Empty.FromString,
+                    response_serializer=xml__service__pb2.ReadyResponse.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=xml__service__pb2.Empty.FromString,
+                    response_serializer=xml__service__pb2.MetricsResponse.SerializeToString,
+            ),
+            'SubmitJob': grpc.stream_unary_rpc_method_handler(
+                    servicer.SubmitJob,
+                    request_deserializer=xml__service__pb2.JobChunk.FromString,
+                    response_serializer=xml__service__pb2.SubmitJobResponse.SerializeToString,
+            ),
+            'GetJobStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetJobStatus,
+                    request_deserializer=xml__service__pb2.JobRequest.FromString,
+                    response_serializer=xml__service__pb2.JobStatus.SerializeToString,
+            ),
+            'WatchJob': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchJob,
+                    request_deserializer=xml__service__pb2.JobRequest.FromString,
+                    response_serializer=xml__service__pb2.JobStatus.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'xmlservice.XMLService', rpc_method_handlers)
@@ -202,6 +525,33 @@ class XMLService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StoreXMLBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/StoreXMLBatch',
+            xml__service__pb2.StoreXMLBatchRequest.SerializeToString,
+            xml__service__pb2.StoreXMLBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetXML(request,
             target,
@@ -230,7 +580,7 @@ class XMLService(object):
             _registered_method=True)
 
     @staticmethod
-    def ListXMLs(request,
+    def UpdateXML(request,
             target,
             options=(),
             channel_credentials=None,
@@ -243,9 +593,9 @@ class XMLService(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/xmlservice.XMLService/ListXMLs',
-            xml__service__pb2.Empty.SerializeToString,
-            xml__service__pb2.ListXMLResponse.FromString,
+            '/xmlservice.XMLService/UpdateXML',
+            xml__service__pb2.UpdateXMLRequest.SerializeToString,
+            xml__service__pb2.UpdateXMLResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -257,7 +607,7 @@ class XMLService(object):
             _registered_method=True)
 
     @staticmethod
-    def QueryXPath(request,
+    def GetXMLVersion(request,
             target,
             options=(),
             channel_credentials=None,
@@ -270,9 +620,9 @@ class XMLService(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/xmlservice.XMLService/QueryXPath',
-            xml__service__pb2.XPathRequest.SerializeToString,
-            xml__service__pb2.XPathResponse.FromString,
+            '/xmlservice.XMLService/GetXMLVersion',
+            xml__service__pb2.GetXMLVersionRequest.SerializeToString,
+            xml__service__pb2.XMLResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -284,7 +634,7 @@ class XMLService(object):
             _registered_method=True)
 
     @staticmethod
-    def ConvertToJSON(request,
+    def ListXMLVersions(request,
             target,
             options=(),
             channel_credentials=None,
@@ -297,9 +647,9 @@ class XMLService(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/xmlservice.XMLService/ConvertToJSON',
-            xml__service__pb2.ConvertToJSONRequest.SerializeToString,
-            xml__service__pb2.ConvertToJSONResponse.FromString,
+            '/xmlservice.XMLService/ListXMLVersions',
+            xml__service__pb2.GetXMLRequest.SerializeToString,
+            xml__service__pb2.ListXMLVersionsResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -311,7 +661,7 @@ class XMLService(object):
             _registered_method=True)
 
     @staticmethod
-    def ValidateXML(request,
+    def StoreXMLStream(request_iterator,
             target,
             options=(),
             channel_credentials=None,
@@ -321,12 +671,39 @@ class XMLService(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/xmlservice.XMLService/StoreXMLStream',
+            xml__service__pb2.XMLChunk.SerializeToString,
+            xml__service__pb2.StoreXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetXMLStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
             request,
             target,
-            '/xmlservice.XMLService/ValidateXML',
-            xml__service__pb2.ValidateXMLRequest.SerializeToString,
-            xml__service__pb2.ValidateXMLResponse.FromString,
+            '/xmlservice.XMLService/GetXMLStream',
+            xml__service__pb2.GetXMLRequest.SerializeToString,
+            xml__service__pb2.XMLChunk.FromString,
             options,
             channel_credentials,
             insecure,
@@ -338,7 +715,7 @@ class XMLService(object):
             _registered_method=True)
 
     @staticmethod
-    def Ping(request,
+    def ListXMLs(request,
             target,
             options=(),
             channel_credentials=None,
@@ -351,9 +728,468 @@ class XMLService(object):
         return grpc.experimental.unary_unary(
             request,
             target,
-            '/xmlservice.XMLService/Ping',
-            xml__service__pb2.Empty.SerializeToString,
-            xml__service__pb2.XMLResponse.FromString,
+            '/xmlservice.XMLService/ListXMLs',
+            xml__service__pb2.ListXMLsRequest.SerializeToString,
+            xml__service__pb2.ListXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListXMLsStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/xmlservice.XMLService/ListXMLsStream',
+            xml__service__pb2.ListXMLsRequest.SerializeToString,
+            xml__service__pb2.XMLFileInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DescribeXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/DescribeXML',
+            xml__service__pb2.GetXMLRequest.SerializeToString,
+            xml__service__pb2.DescribeXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryXPath(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/QueryXPath',
+            xml__service__pb2.XPathRequest.SerializeToString,
+            xml__service__pb2.XPathResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ConvertToJSON(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/ConvertToJSON',
+            xml__service__pb2.ConvertToJSONRequest.SerializeToString,
+            xml__service__pb2.ConvertToJSONResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ValidateXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/ValidateXML',
+            xml__service__pb2.ValidateXMLRequest.SerializeToString,
+            xml__service__pb2.ValidateXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ConvertCSVToXML(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/xmlservice.XMLService/ConvertCSVToXML',
+            xml__service__pb2.CSVChunk.SerializeToString,
+            xml__service__pb2.ConvertToXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def IngestCSV(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/xmlservice.XMLService/IngestCSV',
+            xml__service__pb2.CSVChunk.SerializeToString,
+            xml__service__pb2.IngestCSVResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ConvertJSONToXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/ConvertJSONToXML',
+            xml__service__pb2.ConvertJSONToXMLRequest.SerializeToString,
+            xml__service__pb2.ConvertToXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TransformXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/TransformXML',
+            xml__service__pb2.TransformXMLRequest.SerializeToString,
+            xml__service__pb2.ConvertToXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GenerateXSD(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/GenerateXSD',
+            xml__service__pb2.GenerateXSDRequest.SerializeToString,
+            xml__service__pb2.GenerateXSDResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def QueryXQuery(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/QueryXQuery',
+            xml__service__pb2.XQueryRequest.SerializeToString,
+            xml__service__pb2.XQueryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Ping(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/Ping',
+            xml__service__pb2.Empty.SerializeToString,
+            xml__service__pb2.XMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Ready(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/Ready',
+            xml__service__pb2.Empty.SerializeToString,
+            xml__service__pb2.ReadyResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/GetMetrics',
+            xml__service__pb2.Empty.SerializeToString,
+            xml__service__pb2.MetricsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SubmitJob(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/xmlservice.XMLService/SubmitJob',
+            xml__service__pb2.JobChunk.SerializeToString,
+            xml__service__pb2.SubmitJobResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetJobStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.XMLService/GetJobStatus',
+            xml__service__pb2.JobRequest.SerializeToString,
+            xml__service__pb2.JobStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchJob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/xmlservice.XMLService/WatchJob',
+            xml__service__pb2.JobRequest.SerializeToString,
+            xml__service__pb2.JobStatus.FromString,
             options,
             channel_credentials,
             insecure,
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: xml_service_v2.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'xml_service_v2.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+import xml_service_pb2 as xml__service__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14xml_service_v2.proto\x12\rxmlservice.v2\x1a\x11xml_service.proto\"8\n\x0fStoreXMLRequest\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x13\n\x0bxml_content\x18\x02 \x01(\x0c\"I\n\x14StoreXMLBatchRequest\x12\x31\n\tdocuments\x18\x01 \x03(\x0b\x32\x1e.xmlservice.v2.StoreXMLRequest\"g\n\x0bXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x13\n\x0bxml_content\x18\x03 \x01(\x0c\x12\x0f\n\x07message\x18\x04 \x01(\t\x12\x0f\n\x07version\x18\x05 \x01(\x05\"7\n\x10UpdateXMLRequest\x12\x0e\n\x06xml_id\x18\x01 \x01(\t\x12\x13\n\x0bxml_content\x18\x02 \x01(\x0c\"O\n\x15\x43onvertToJSONResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x14\n\x0cjson_content\x18\x02 \x01(\x0c\x12\x0f\n\x07message\x18\x03 \x01(\t\"W\n\x17\x43onvertJSONToXMLRequest\x12\x14\n\x0cjson_content\x18\x01 \x01(\x0c\x12\x14\n\x0croot_element\x18\x02 \x01(\t\x12\x10\n\x08\x66ilename\x18\x03 \x01(\t\"]\n\x14\x43onvertToXMLResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bxml_content\x18\x03 \x01(\x0c\x12\x0e\n\x06xml_id\x18\x04 \x01(\t2\x9c\x05\n\nXMLService\x12H\n\x08StoreXML\x12\x1e.xmlservice.v2.StoreXMLRequest\x1a\x1c.xmlservice.StoreXMLResponse\x12W\n\rStoreXMLBatch\x12#.xmlservice.v2.StoreXMLBatchRequest\x1a!.xmlservice.StoreXMLBatchResponse\x12?\n\x06GetXML\x12\x19.xmlservice.GetXMLRequest\x1a\x1a.xmlservice.v2.XMLResponse\x12K\n\tUpdateXML\x12\x1f.xmlservice.v2.UpdateXMLRequest\x1a\x1d.xmlservice.UpdateXMLResponse\x12M\n\rGetXMLVersion\x12 .xmlservice.GetXMLVersionRequest\x1a\x1a.xmlservice.v2.XMLResponse\x12W\n\rConvertToJSON\x12 .xmlservice.ConvertToJSONRequest\x1a$.xmlservice.v2.ConvertToJSONResponse\x12_\n\x10\x43onvertJSONToXML\x12&.xmlservice.v2.ConvertJSONToXMLRequest\x1a#.xmlservice.v2.ConvertToXMLResponse\x12T\n\x0cTransformXML\x12\x1f.xmlservice.TransformXMLRequest\x1a#.xmlservice.v2.ConvertToXMLResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'xml_service_v2_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_STOREXMLREQUEST']._serialized_start=58
+  _globals['_STOREXMLREQUEST']._serialized_end=114
+  _globals['_STOREXMLBATCHREQUEST']._serialized_start=116
+  _globals['_STOREXMLBATCHREQUEST']._serialized_end=189
+  _globals['_XMLRESPONSE']._serialized_start=191
+  _globals['_XMLRESPONSE']._serialized_end=294
+  _globals['_UPDATEXMLREQUEST']._serialized_start=296
+  _globals['_UPDATEXMLREQUEST']._serialized_end=351
+  _globals['_CONVERTTOJSONRESPONSE']._serialized_start=353
+  _globals['_CONVERTTOJSONRESPONSE']._serialized_end=432
+  _globals['_CONVERTJSONTOXMLREQUEST']._serialized_start=434
+  _globals['_CONVERTJSONTOXMLREQUEST']._serialized_end=521
+  _globals['_CONVERTTOXMLRESPONSE']._serialized_start=523
+  _globals['_CONVERTTOXMLRESPONSE']._serialized_end=616
+  _globals['_XMLSERVICE']._serialized_start=619
+  _globals['_XMLSERVICE']._serialized_end=1287
+# @@protoc_insertion_point(module_scope)
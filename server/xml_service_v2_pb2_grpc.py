@@ -0,0 +1,413 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+import xml_service_pb2 as xml__service__pb2
+import xml_service_v2_pb2 as xml__service__v2__pb2
+
+GRPC_GENERATED_VERSION = '1.76.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in xml_service_v2_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class XMLServiceStub(object):
+    """Operações com conteúdo do serviço XMLService, com conteúdos em bytes
+    (as restantes operações mantêm-se em xmlservice.XMLService)
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.StoreXML = channel.unary_unary(
+                '/xmlservice.v2.XMLService/StoreXML',
+                request_serializer=xml__service__v2__pb2.StoreXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.StoreXMLResponse.FromString,
+                _registered_method=True)
+        self.StoreXMLBatch = channel.unary_unary(
+                '/xmlservice.v2.XMLService/StoreXMLBatch',
+                request_serializer=xml__service__v2__pb2.StoreXMLBatchRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.StoreXMLBatchResponse.FromString,
+                _registered_method=True)
+        self.GetXML = channel.unary_unary(
+                '/xmlservice.v2.XMLService/GetXML',
+                request_serializer=xml__service__pb2.GetXMLRequest.SerializeToString,
+                response_deserializer=xml__service__v2__pb2.XMLResponse.FromString,
+                _registered_method=True)
+        self.UpdateXML = channel.unary_unary(
+                '/xmlservice.v2.XMLService/UpdateXML',
+                request_serializer=xml__service__v2__pb2.UpdateXMLRequest.SerializeToString,
+                response_deserializer=xml__service__pb2.UpdateXMLResponse.FromString,
+                _registered_method=True)
+        self.GetXMLVersion = channel.unary_unary(
+                '/xmlservice.v2.XMLService/GetXMLVersion',
+                request_serializer=xml__service__pb2.GetXMLVersionRequest.SerializeToString,
+                response_deserializer=xml__service__v2__pb2.XMLResponse.FromString,
+                _registered_method=True)
+        self.ConvertToJSON = channel.unary_unary(
+                '/xmlservice.v2.XMLService/ConvertToJSON',
+                request_serializer=xml__service__pb2.ConvertToJSONRequest.SerializeToString,
+                response_deserializer=xml__service__v2__pb2.ConvertToJSONResponse.FromString,
+                _registered_method=True)
+        self.ConvertJSONToXML = channel.unary_unary(
+                '/xmlservice.v2.XMLService/ConvertJSONToXML',
+                request_serializer=xml__service__v2__pb2.ConvertJSONToXMLRequest.SerializeToString,
+                response_deserializer=xml__service__v2__pb2.ConvertToXMLResponse.FromString,
+                _registered_method=True)
+        self.TransformXML = channel.unary_unary(
+                '/xmlservice.v2.XMLService/TransformXML',
+                request_serializer=xml__service__pb2.TransformXMLRequest.SerializeToString,
+                response_deserializer=xml__service__v2__pb2.ConvertToXMLResponse.FromString,
+                _registered_method=True)
+
+
+class XMLServiceServicer(object):
+    """Operações com conteúdo do serviço XMLService, com conteúdos em bytes
+    (as restantes operações mantêm-se em xmlservice.XMLService)
+    """
+
+    def StoreXML(self, request, context):
+        """Armazena um documento XML
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StoreXMLBatch(self, request, context):
+        """Armazena vários documentos XML numa só chamada (insert_many)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetXML(self, request, context):
+        """Recupera um documento XML pelo ID
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdateXML(self, request, context):
+        """Atualiza um documento XML guardando um delta face à versão anterior
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetXMLVersion(self, request, context):
+        """Recupera uma versão específica de um documento XML
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ConvertToJSON(self, request, context):
+        """Converte XML armazenado para JSON
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ConvertJSONToXML(self, request, context):
+        """Converte JSON para XML (opcionalmente armazenado)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TransformXML(self, request, context):
+        """Aplica uma transformação XSLT a XML armazenado
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_XMLServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'StoreXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.StoreXML,
+                    request_deserializer=xml__service__v2__pb2.StoreXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.StoreXMLResponse.SerializeToString,
+            ),
+            'StoreXMLBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.StoreXMLBatch,
+                    request_deserializer=xml__service__v2__pb2.StoreXMLBatchRequest.FromString,
+                    response_serializer=xml__service__pb2.StoreXMLBatchResponse.SerializeToString,
+            ),
+            'GetXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetXML,
+                    request_deserializer=xml__service__pb2.GetXMLRequest.FromString,
+                    response_serializer=xml__service__v2__pb2.XMLResponse.SerializeToString,
+            ),
+            'UpdateXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdateXML,
+                    request_deserializer=xml__service__v2__pb2.UpdateXMLRequest.FromString,
+                    response_serializer=xml__service__pb2.UpdateXMLResponse.SerializeToString,
+            ),
+            'GetXMLVersion': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetXMLVersion,
+                    request_deserializer=xml__service__pb2.GetXMLVersionRequest.FromString,
+                    response_serializer=xml__service__v2__pb2.XMLResponse.SerializeToString,
+            ),
+            'ConvertToJSON': grpc.unary_unary_rpc_method_handler(
+                    servicer.ConvertToJSON,
+                    request_deserializer=xml__service__pb2.ConvertToJSONRequest.FromString,
+                    response_serializer=xml__service__v2__pb2.ConvertToJSONResponse.SerializeToString,
+            ),
+            'ConvertJSONToXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.ConvertJSONToXML,
+                    request_deserializer=xml__service__v2__pb2.ConvertJSONToXMLRequest.FromString,
+                    response_serializer=xml__service__v2__pb2.ConvertToXMLResponse.SerializeToString,
+            ),
+            'TransformXML': grpc.unary_unary_rpc_method_handler(
+                    servicer.TransformXML,
+                    request_deserializer=xml__service__pb2.TransformXMLRequest.FromString,
+                    response_serializer=xml__service__v2__pb2.ConvertToXMLResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'xmlservice.v2.XMLService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('xmlservice.v2.XMLService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class XMLService(object):
+    """Operações com conteúdo do serviço XMLService, com conteúdos em bytes
+    (as restantes operações mantêm-se em xmlservice.XMLService)
+    """
+
+    @staticmethod
+    def StoreXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/StoreXML',
+            xml__service__v2__pb2.StoreXMLRequest.SerializeToString,
+            xml__service__pb2.StoreXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StoreXMLBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/StoreXMLBatch',
+            xml__service__v2__pb2.StoreXMLBatchRequest.SerializeToString,
+            xml__service__pb2.StoreXMLBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/GetXML',
+            xml__service__pb2.GetXMLRequest.SerializeToString,
+            xml__service__v2__pb2.XMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UpdateXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/UpdateXML',
+            xml__service__v2__pb2.UpdateXMLRequest.SerializeToString,
+            xml__service__pb2.UpdateXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetXMLVersion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/GetXMLVersion',
+            xml__service__pb2.GetXMLVersionRequest.SerializeToString,
+            xml__service__v2__pb2.XMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ConvertToJSON(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/ConvertToJSON',
+            xml__service__pb2.ConvertToJSONRequest.SerializeToString,
+            xml__service__v2__pb2.ConvertToJSONResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ConvertJSONToXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/ConvertJSONToXML',
+            xml__service__v2__pb2.ConvertJSONToXMLRequest.SerializeToString,
+            xml__service__v2__pb2.ConvertToXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TransformXML(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xmlservice.v2.XMLService/TransformXML',
+            xml__service__pb2.TransformXMLRequest.SerializeToString,
+            xml__service__v2__pb2.ConvertToXMLResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,64 +1,386 @@
-from xmlrpc.server import SimpleXMLRPCServer
+from xmlrpc.server import SimpleXMLRPCServer, SimpleXMLRPCRequestHandler
+from xmlrpc.client import gzip_decode, Binary, Fault
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
+import time
+import socket
+import selectors
 from datetime import datetime
 import json
-import time
+import signal
+import threading
+import zlib
+import functools
+import collections
 
-from db_utils import get_db_connection, DatabaseConnection
-from xml_converter import XMLConverter
+from xml_service_core import XMLServiceCore, ServiceError
+from storage import close_source
+from admission import AdmissionController, AdmissionRejected, ADMISSION_ENABLED
+from metrics import metrics
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class XMLRPCServerHandler:
-    def __init__(self):
-        self.xml_converter = XMLConverter()
-        self.db = None
-        self.init_database()
-    
-    def init_database(self):
-        """Inicializa a conexão com a base de dados MongoDB e cria índices"""
-        max_retries = 10
-        retry_delay = 5
-        
-        for attempt in range(max_retries):
+# Porta do servidor XML-RPC
+XMLRPC_PORT = int(os.getenv('XMLRPC_PORT', 8000))
+
+# Threads que atendem pedidos em paralelo (0 = servidor single-threaded original)
+XMLRPC_WORKERS = int(os.getenv('XMLRPC_WORKERS', 16))
+
+# Tempo (s) que uma conexão keep-alive pode ficar inativa (em espera no selector, sem ocupar uma thread)
+XMLRPC_KEEPALIVE_TIMEOUT = float(os.getenv('XMLRPC_KEEPALIVE_TIMEOUT', 5))
+
+# Respostas maiores que o limite (bytes) são comprimidas com gzip se o cliente aceitar
+XMLRPC_GZIP_THRESHOLD = int(os.getenv('XMLRPC_GZIP_THRESHOLD', 1400))
+
+# Tamanho máximo de um pedido gzip depois de descomprimido
+XMLRPC_MAX_DECODED_SIZE = int(os.getenv('XMLRPC_MAX_DECODED_SIZE', 256 * 1024 * 1024))  # 256MB
+
+# Nível de compressão dos conteúdos enviados com transfer="zlib"
+XMLRPC_ZLIB_LEVEL = int(os.getenv('XMLRPC_ZLIB_LEVEL', 6))
+
+# Formatos de transferência de conteúdo XML/CSV, escolhidos pelo cliente em cada chamada:
+#   string - <string> XML-RPC (escapado), o formato original
+#   binary - xmlrpc.client.Binary com os bytes UTF-8 (base64, sem escapes)
+#   zlib   - xmlrpc.client.Binary com os bytes UTF-8 comprimidos com zlib
+TRANSFER_FORMATS = (None, 'string', 'binary', 'zlib')
+
+# Classe de admissão de cada método (ping, ready e get_server_status não são limitados)
+XMLRPC_METHOD_CLASSES = {
+    'store_xml': 'write',
+    'store_xml_batch': 'write',
+    'update_xml': 'write',
+    'retrieve_xml': 'read',
+    'retrieve_xml_version': 'read',
+    'list_xml_versions': 'read',
+    'list_xml_files': 'read',
+    'describe_xml': 'read',
+    'convert_xml_to_json': 'cpu',
+    'convert_json_to_xml': 'cpu',
+    'validate_xml_content': 'cpu',
+    'convert_csv_to_xml': 'cpu',
+    'generate_xsd_schema': 'cpu',
+    'ingest_csv': 'cpu',
+    'query_xml_xpath': 'cpu',
+    'query_xml_xquery': 'cpu',
+    'submit_job': 'write',
+    'get_job_status': 'read'
+}
+
+# Código do Fault devolvido a pedidos rejeitados por sobrecarga (como o HTTP 429)
+XMLRPC_OVERLOADED_FAULT = 429
+
+
+def _check_transfer(transfer):
+    if transfer not in TRANSFER_FORMATS:
+        raise ValueError(f"Formato de transferência inválido: {transfer} (string, binary ou zlib)")
+
+
+def _decode_payload(value, transfer=None):
+    """Converte um conteúdo recebido (str ou Binary) para str"""
+    _check_transfer(transfer)
+    if not isinstance(value, Binary):
+        return value
+    
+    data = value.data
+    if transfer == 'zlib':
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(data, XMLRPC_MAX_DECODED_SIZE)
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Conteúdo descomprimido excede {XMLRPC_MAX_DECODED_SIZE} bytes")
+    return data.decode('utf-8')
+
+
+def _encode_payload(content, transfer=None):
+    """Prepara um conteúdo (str ou buffer) para envio no formato pedido pelo cliente"""
+    _check_transfer(transfer)
+    if transfer in (None, 'string'):
+        return content if isinstance(content, str) else bytes(content).decode('utf-8')
+    
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if transfer == 'zlib':
+        return Binary(zlib.compress(data, XMLRPC_ZLIB_LEVEL))
+    return Binary(bytes(data))
+
+
+def _payload_size(value):
+    """Bytes de conteúdo (str/Binary) nos parâmetros de uma chamada"""
+    if isinstance(value, Binary):
+        return len(value.data)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_payload_size(item) for item in value.values())
+    return 0
+
+
+def _admitted(function, method_class, controller):
+    """Método com controlo de admissão: sem vaga, devolve um Fault com a espera sugerida"""
+    @functools.wraps(function)
+    def call(*params):
+        try:
+            ticket = controller.acquire(method_class, _payload_size(params))
+        except AdmissionRejected as e:
+            raise Fault(XMLRPC_OVERLOADED_FAULT, f"{e} [retry_after={e.retry_after:.1f}]")
+        try:
+            return function(*params)
+        finally:
+            controller.release(ticket)
+    return call
+
+
+class GzipRequestHandler(SimpleXMLRPCRequestHandler):
+    """Aceita pedidos comprimidos com gzip e comprime respostas acima de XMLRPC_GZIP_THRESHOLD"""
+    
+    encode_threshold = XMLRPC_GZIP_THRESHOLD
+    
+    def decode_request_content(self, data):
+        # O limite por omissão do xmlrpc (20MB) é inferior aos documentos GridFS
+        encoding = self.headers.get("content-encoding", "identity").lower()
+        if encoding != "gzip":
+            return super().decode_request_content(data)
+        try:
+            return gzip_decode(data, max_decode=XMLRPC_MAX_DECODED_SIZE)
+        except ValueError:
+            self.send_response(400, "error decoding gzip content")
+            self.send_header("Content-length", "0")
+            self.end_headers()
+            return None
+
+
+class KeepAliveRequestHandler(GzipRequestHandler):
+    """HTTP/1.1: o cliente reutiliza a conexão TCP entre chamadas
+    
+    A thread só atende os pedidos que já chegaram; a espera pelo seguinte é feita
+    pelo servidor (PooledXMLRPCServer), sem ocupar uma thread do pool.
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    timeout = XMLRPC_KEEPALIVE_TIMEOUT
+    
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._request_pending():
+            self.handle_one_request()
+    
+    def _request_pending(self):
+        """Verifica, sem bloquear, se o pedido seguinte já chegou (dados no buffer ou no socket)"""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+
+class _IdleConnections:
+    """Conexões keep-alive à espera do pedido seguinte, vigiadas por um selector numa só thread
+    
+    Quando chega um pedido a conexão é entregue a dispatch (pool de threads); as
+    inativas há mais de timeout segundos são fechadas com close. dispatch nunca
+    bloqueia: sem thread livre devolve False e a conexão fica em espera (_ready) até
+    o servidor chamar wake ao libertar uma thread - a thread do selector não pára.
+    """
+    
+    def __init__(self, timeout, dispatch, close):
+        self.timeout = timeout
+        self._dispatch = dispatch
+        self._close = close
+        self._lock = threading.Lock()
+        self._parked = []
+        self._ready = collections.deque()
+        self._closed = False
+        self._selector = selectors.DefaultSelector()
+        # Acorda o selector quando há conexões novas a vigiar ou no encerramento
+        self._wakeup, self._notify = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._selector.register(self._wakeup, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run, name='xmlrpc-idle', daemon=True)
+        self._thread.start()
+    
+    def park(self, request, client_address):
+        """Passa a vigiar a conexão - False se já estiver encerrado (o chamador fecha-a)"""
+        with self._lock:
+            if self._closed:
+                return False
+            self._parked.append((request, client_address))
+        self._notify.send(b'\0')
+        return True
+    
+    def wake(self):
+        """Uma thread do pool ficou livre: volta a tentar entregar as conexões em espera"""
+        if self._ready:
             try:
-                self.db = get_db_connection()
-                if self.db:
-                    self.db.create_indexes()
-                    logger.info("Base de dados MongoDB inicializada com sucesso")
-                    return
-                else:
-                    logger.warning(f"Tentativa {attempt + 1} de conexão falhou")
-            except Exception as e:
-                logger.error(f"Erro na tentativa {attempt + 1}: {e}")
+                self._notify.send(b'\0')
+            except OSError:
+                pass
+    
+    def _run(self):
+        expires = {}
+        while True:
+            wait = min(expires.values(), default=None)
+            events = self._selector.select(None if wait is None else max(wait - time.monotonic(), 0))
+            with self._lock:
+                parked, self._parked = self._parked, []
+                closed = self._closed
+            if closed:
+                break
+            
+            for request, client_address in parked:
+                self._selector.register(request, selectors.EVENT_READ, client_address)
+                expires[request] = time.monotonic() + self.timeout
             
-            if attempt < max_retries - 1:
-                logger.info(f"Aguardando {retry_delay} segundos antes da próxima tentativa...")
-                time.sleep(retry_delay)
+            for key, _ in events:
+                if key.fileobj is self._wakeup:
+                    try:
+                        self._wakeup.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                # Pedido (ou fim da conexão) a chegar: volta ao pool de threads
+                self._selector.unregister(key.fileobj)
+                del expires[key.fileobj]
+                self._ready.append((key.fileobj, key.data))
+            
+            # Por ordem de chegada, enquanto houver threads livres
+            while self._ready and self._dispatch(*self._ready[0]):
+                self._ready.popleft()
+            
+            now = time.monotonic()
+            for request, expires_at in list(expires.items()):
+                if expires_at <= now:
+                    self._selector.unregister(request)
+                    del expires[request]
+                    self._close(request)
+        
+        for request in list(expires) + [request for request, _ in parked + list(self._ready)]:
+            self._close(request)
+        self._selector.close()
+        self._wakeup.close()
+        self._notify.close()
+    
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._notify.send(b'\0')
+        self._thread.join()
+
+
+class PooledXMLRPCServer(SimpleXMLRPCServer):
+    """Servidor XML-RPC que atende os pedidos num pool limitado de threads
+    
+    Quando todas as threads estão ocupadas o ciclo de accept espera por uma livre,
+    deixando as novas conexões na fila do socket em vez de criar threads sem limite.
+    Entre pedidos, as conexões keep-alive esperam num selector (_IdleConnections) e
+    não numa thread: XMLRPC_WORKERS limita os pedidos em processamento, não as
+    conexões abertas, e deve acompanhar o paralelismo útil (CPU, pool de processos,
+    ligações ao MongoDB) e não o número de clientes.
+    """
+    
+    request_queue_size = 128
+    
+    def __init__(self, addr, workers=XMLRPC_WORKERS, **kwargs):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='xmlrpc')
+        self._slots = threading.BoundedSemaphore(workers)
+        super().__init__(addr, requestHandler=KeepAliveRequestHandler, **kwargs)
+        self._idle = _IdleConnections(XMLRPC_KEEPALIVE_TIMEOUT, self._dispatch_ready, self.shutdown_request)
+    
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        self._submit(request, client_address)
+    
+    def _dispatch_ready(self, request, client_address):
+        """Entrega pedida pelo selector: sem thread livre devolve False em vez de esperar"""
+        if not self._slots.acquire(blocking=False):
+            return False
+        self._submit(request, client_address)
+        return True
+    
+    def _submit(self, request, client_address):
+        try:
+            self._executor.submit(self._process_in_worker, request, client_address)
+        except RuntimeError:
+            # Pool já encerrado (servidor a parar)
+            self._slots.release()
+            self.shutdown_request(request)
+    
+    def _process_in_worker(self, request, client_address):
+        keep_alive = False
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+            keep_alive = not handler.close_connection
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self._slots.release()
+            self._idle.wake()
         
-        logger.error("Não foi possível estabelecer conexão com a base de dados")
+        # Inativa, a conexão espera pelo pedido seguinte no selector e não numa thread do pool
+        if not (keep_alive and self._idle.park(request, client_address)):
+            self.shutdown_request(request)
+    
+    def server_close(self):
+        self._idle.close()
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+class XMLRPCServerHandler:
+    def __init__(self, core=None):
+        # Armazenamento, conversor, pool de processos e caches (partilhados com o gRPC no combined_server.py)
+        self.core = core or XMLServiceCore()
+        self._owns_core = core is None
+    
+    @property
+    def db(self):
+        return self.core.db
+    
+    @property
+    def xml_converter(self):
+        return self.core.converter
+    
+    @property
+    def cpu_pool(self):
+        return self.core.cpu_pool
+    
+    def close(self):
+        """Liberta o núcleo (armazenamento e pool de processos), se não for partilhado"""
+        if self._owns_core:
+            self.core.close()
     
     def ping(self):
         """Método para testar se o servidor está ativo"""
         return "pong"
     
+    def ready(self):
+        """Indica se o servidor está pronto (armazenamento ligado); o ping só indica que está vivo"""
+        return self.core.ready_status()
+    
     def get_server_status(self):
         """Retorna o status do servidor"""
-        db_status = "conectado" if self.db and self.db.client else "desconectado"
+        db_status = "conectado" if self.db and self.db.is_connected() else "desconectado"
         return {
             "status": "ativo",
             "timestamp": datetime.now().isoformat(),
-            "database": db_status
+            "database": db_status,
+            "storage": self.db.name if self.db else None,
+            "metrics": metrics.snapshot()
         }
     
-    def store_xml(self, filename, xml_content):
-        """Armazena XML na base de dados"""
+    def store_xml(self, filename, xml_content, transfer=None):
+        """Armazena XML na base de dados (xml_content como str ou Binary, ver TRANSFER_FORMATS)"""
         try:
             if not self.db:
                 return {"success": False, "error": "Conexão com base de dados não disponível"}
             
+            xml_content = _decode_payload(xml_content, transfer)
+            
             # Validar XML
             is_valid, validation_result = self.xml_converter.validate_xml(xml_content)
             if not is_valid:
@@ -79,18 +401,77 @@ class XMLRPCServerHandler:
                 }
             else:
                 return {"success": False, "error": "Erro ao inserir na base de dados"}
-                
+        
         except Exception as e:
             logger.error(f"Erro ao armazenar XML: {e}")
             return {"success": False, "error": str(e)}
     
-    def retrieve_xml(self, xml_id):
+    def store_xml_batch(self, documents, transfer=None):
+        """Armazena vários XMLs numa só chamada - documents: lista de {filename, xml_content}"""
+        try:
+            if not self.db:
+                return {"success": False, "error": "Conexão com base de dados não disponível"}
+            
+            documents = [
+                {"filename": document["filename"], "xml_content": _decode_payload(document["xml_content"], transfer)}
+                for document in documents
+            ]
+            
+            # Validar todos os XMLs em paralelo
+            validations = self.xml_converter.validate_xml_many(
+                [document["xml_content"] for document in documents]
+            )
+            
+            results = [None] * len(documents)
+            valid_indexes = []
+            for index, (is_valid, validation_result) in enumerate(validations):
+                if is_valid:
+                    valid_indexes.append(index)
+                else:
+                    results[index] = {
+                        "index": index,
+                        "success": False,
+                        "error": f"XML inválido: {validation_result}"
+                    }
+            
+            # Inserir os documentos válidos com insert_many
+            inserted = self.db.insert_xml_many(
+                [(documents[index]["filename"], documents[index]["xml_content"]) for index in valid_indexes]
+            )
+            for index, outcome in zip(valid_indexes, inserted):
+                if outcome["xml_id"]:
+                    results[index] = {"index": index, "success": True, "xml_id": outcome["xml_id"]}
+                else:
+                    results[index] = {"index": index, "success": False, "error": outcome["error"]}
+            
+            stored_count = sum(1 for result in results if result["success"])
+            logger.info(f"Lote armazenado ({stored_count}/{len(documents)} documentos)")
+            return {
+                "success": True,
+                "results": results,
+                "stored_count": stored_count,
+                "failed_count": len(documents) - stored_count
+            }
+        
+        except Exception as e:
+            logger.error(f"Erro ao armazenar lote de XMLs: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def retrieve_xml(self, xml_id, transfer=None):
         """Recupera XML da base de dados MongoDB pelo ID"""
         try:
             if not self.db:
                 return {"success": False, "error": "Conexão com base de dados não disponível"}
             
-            document = self.db.retrieve_xml(xml_id)
+            _check_transfer(transfer)
+            if transfer in (None, 'string'):
+                document = self.db.retrieve_xml(xml_id)
+            else:
+                # Em binário o conteúdo segue do buffer (mmap/bytes) sem passar por str
+                document, source = self.db.retrieve_xml_source(xml_id)
+                if document:
+                    document["content"] = _encode_payload(source, transfer)
+                    close_source(source)
             
             if document:
                 return {
@@ -99,41 +480,126 @@ class XMLRPCServerHandler:
                 }
             else:
                 return {"success": False, "error": f"XML com ID {xml_id} não encontrado"}
-                
+        
         except Exception as e:
             logger.error(f"Erro ao recuperar XML: {e}")
             return {"success": False, "error": str(e)}
     
-    def list_xml_files(self):
-        """Lista todos os arquivos XML armazenados no MongoDB"""
+    def update_xml(self, xml_id, xml_content, transfer=None):
+        """Atualiza XML armazenado criando uma nova versão (delta face à anterior)"""
         try:
             if not self.db:
                 return {"success": False, "error": "Conexão com base de dados não disponível"}
             
-            files = self.db.list_xml_files()
+            xml_content = _decode_payload(xml_content, transfer)
+            
+            # Validar XML
+            is_valid, validation_result = self.xml_converter.validate_xml(xml_content)
+            if not is_valid:
+                return {
+                    "success": False,
+                    "error": f"XML inválido: {validation_result}"
+                }
+            
+            version = self.db.update_xml(xml_id, xml_content)
+            if version is None:
+                return {"success": False, "error": f"XML com ID {xml_id} não encontrado"}
+            
+            logger.info(f"XML {xml_id} atualizado para a versão {version}")
+            return {
+                "success": True,
+                "message": "XML atualizado com sucesso",
+                "version": version
+            }
+        
+        except Exception as e:
+            logger.error(f"Erro ao atualizar XML: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def retrieve_xml_version(self, xml_id, version, transfer=None):
+        """Recupera uma versão específica de um XML armazenado"""
+        try:
+            if not self.db:
+                return {"success": False, "error": "Conexão com base de dados não disponível"}
+            
+            document = self.db.retrieve_xml_version(xml_id, version)
+            
+            if document:
+                document["content"] = _encode_payload(document["content"], transfer)
+                return {
+                    "success": True,
+                    "data": document
+                }
+            else:
+                return {"success": False, "error": f"Versão {version} do XML {xml_id} não encontrada"}
+        
+        except Exception as e:
+            logger.error(f"Erro ao recuperar versão do XML: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def list_xml_versions(self, xml_id):
+        """Lista as versões de um XML armazenado"""
+        try:
+            if not self.db:
+                return {"success": False, "error": "Conexão com base de dados não disponível"}
+            
+            history = self.db.list_xml_versions(xml_id)
+            if history is None:
+                return {"success": False, "error": f"XML com ID {xml_id} não encontrado"}
+            
+            return {
+                "success": True,
+                "versions": history,
+                "count": len(history)
+            }
+        
+        except Exception as e:
+            logger.error(f"Erro ao listar versões do XML: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def list_xml_files(self, options=None):
+        """Lista os arquivos XML armazenados no MongoDB (todos, ou uma página com page_size/cursor)"""
+        try:
+            if not self.db:
+                return {"success": False, "error": "Conexão com base de dados não disponível"}
+            
+            # Opções: page_size, cursor, filename_prefix, min_size, max_size,
+            # created_after, created_before, include_count
+            options = options or {}
+            page = self.core.list_xml(
+                page_size=options.get("page_size"),
+                cursor=options.get("cursor"),
+                include_count=options.get("include_count", False),
+                filename_prefix=options.get("filename_prefix"),
+                min_size=options.get("min_size"),
+                max_size=options.get("max_size"),
+                created_after=options.get("created_after"),
+                created_before=options.get("created_before")
+            )
+            files = page["files"]
             
             return {
                 "success": True,
                 "files": files,
-                "count": len(files)
+                "count": page["total"] if page["total"] is not None else len(files),
+                "next_cursor": page["next_cursor"],
+                "has_more": page["has_more"]
             }
-                
+        
         except Exception as e:
             logger.error(f"Erro ao listar arquivos XML: {e}")
             return {"success": False, "error": str(e)}
     
-    def convert_xml_to_json(self, xml_id):
-        """Converte XML armazenado para JSON"""
+    def convert_xml_to_json(self, xml_id, transfer=None):
+        """Converte XML armazenado para JSON - json_content no formato de transfer"""
         try:
-            # Recuperar XML
-            xml_result = self.retrieve_xml(xml_id)
+            _check_transfer(transfer)
+            
+            # Recuperar XML e converter para JSON
+            xml_result, outcome = self._run_on_source('xml_to_json', xml_id)
             if not xml_result["success"]:
                 return xml_result
-            
-            xml_content = xml_result["data"]["content"]
-            
-            # Converter para JSON
-            success, result = self.xml_converter.xml_to_json(xml_content)
+            success, result = outcome
             
             if success:
                 # Log da conversão
@@ -141,7 +607,7 @@ class XMLRPCServerHandler:
                 
                 return {
                     "success": True,
-                    "json_content": result,
+                    "json_content": _encode_payload(result, transfer),
                     "message": "Conversão para JSON realizada com sucesso"
                 }
             else:
@@ -152,20 +618,21 @@ class XMLRPCServerHandler:
                     "success": False,
                     "error": f"Erro na conversão: {result}"
                 }
-                
+        
         except Exception as e:
             logger.error(f"Erro no processo de conversão XML para JSON: {e}")
             return {"success": False, "error": str(e)}
     
-    def convert_json_to_xml(self, json_content, root_element="root"):
+    def convert_json_to_xml(self, json_content, root_element="root", transfer=None):
         """Converte JSON para XML"""
         try:
-            success, result = self.xml_converter.json_to_xml(json_content, root_element)
+            json_content = _decode_payload(json_content, transfer)
+            success, result = self.cpu_pool.run('json_to_xml', json_content, root_element)
             
             if success:
                 return {
                     "success": True,
-                    "xml_content": result,
+                    "xml_content": _encode_payload(result, transfer),
                     "message": "Conversão para XML realizada com sucesso"
                 }
             else:
@@ -173,7 +640,7 @@ class XMLRPCServerHandler:
                     "success": False,
                     "error": f"Erro na conversão: {result}"
                 }
-                
+        
         except Exception as e:
             logger.error(f"Erro no processo de conversão JSON para XML: {e}")
             return {"success": False, "error": str(e)}
@@ -181,19 +648,15 @@ class XMLRPCServerHandler:
     def validate_xml_content(self, xml_id, schema_filename=None):
         """Valida conteúdo XML armazenado"""
         try:
-            # Recuperar XML
-            xml_result = self.retrieve_xml(xml_id)
-            if not xml_result["success"]:
-                return xml_result
-            
-            xml_content = xml_result["data"]["content"]
-            
-            # Validar XML
             schema_path = None
             if schema_filename:
                 schema_path = os.path.join(self.xml_converter.xml_schemas_path, schema_filename)
             
-            is_valid, validation_result = self.xml_converter.validate_xml(xml_content, schema_path)
+            # Recuperar e validar XML (schema compilado e árvore do documento reutilizados entre pedidos)
+            xml_result, outcome = self._run_on_source('validate_xml', xml_id, schema_path)
+            if not xml_result["success"]:
+                return xml_result
+            is_valid, validation_result = outcome
             
             # Log da validação
             if is_valid:
@@ -206,20 +669,21 @@ class XMLRPCServerHandler:
                 "is_valid": is_valid,
                 "validation_result": validation_result
             }
-                
+        
         except Exception as e:
             logger.error(f"Erro na validação XML: {e}")
             return {"success": False, "error": str(e)}
     
-    def convert_csv_to_xml(self, csv_content, root_element="dataset", row_element="record"):
-        """Converte dados CSV (estilo Kaggle) para XML"""
+    def convert_csv_to_xml(self, csv_content, root_element="dataset", row_element="record", transfer=None):
+        """Converte dados CSV (estilo Kaggle) para XML - csv_content e xml_content no formato de transfer"""
         try:
-            success, result = self.xml_converter.csv_to_xml(csv_content, root_element, row_element)
+            csv_content = _decode_payload(csv_content, transfer)
+            success, result = self.cpu_pool.run('csv_to_xml', csv_content, root_element, row_element)
             
             if success:
                 return {
                     "success": True,
-                    "xml_content": result,
+                    "xml_content": _encode_payload(result, transfer),
                     "message": "Conversão CSV para XML realizada com sucesso"
                 }
             else:
@@ -227,23 +691,60 @@ class XMLRPCServerHandler:
                     "success": False,
                     "error": f"Erro na conversão: {result}"
                 }
-                
+        
         except Exception as e:
             logger.error(f"Erro no processo de conversão CSV para XML: {e}")
             return {"success": False, "error": str(e)}
     
-    def generate_xsd_schema(self, xml_id, target_namespace="http://kaggle-data.local"):
+    def ingest_csv(self, csv_content, filename, root_element="dataset", row_element="record", transfer=None):
+        """Converte CSV, armazena o XML e o XSD gerado e valida num só pedido - devolve apenas os IDs e o resumo"""
+        try:
+            if not self.db:
+                return {"success": False, "error": "Conexão com base de dados não disponível"}
+            
+            csv_content = _decode_payload(csv_content, transfer)
+            
+            # Conversão, geração do XSD e validação sobre a mesma árvore
+            success, result = self.cpu_pool.run('ingest_csv', csv_content, root_element, row_element)
+            if not success:
+                return {
+                    "success": False,
+                    "error": f"Erro na conversão: {result}"
+                }
+            
+            xml_id = self.db.insert_xml(filename, result['xml_content'])
+            schema_id = self.db.insert_xml(f"{os.path.splitext(filename)[0]}.xsd", result['xsd_content'])
+            
+            self._log_conversion(xml_id, "csv_ingest", "success")
+            if not result['is_valid']:
+                self._log_conversion(xml_id, "xml_validation", "warning", result['validation_result'])
+            
+            logger.info(f"CSV ingerido com ID: {xml_id} (schema {schema_id})")
+            return {
+                "success": True,
+                "message": "CSV convertido, armazenado e validado com sucesso",
+                "xml_id": xml_id,
+                "schema_id": schema_id,
+                "records": result['records'],
+                "columns": result['columns'],
+                "is_valid": result['is_valid'],
+                "validation_result": result['validation_result']
+            }
+        
+        except Exception as e:
+            logger.error(f"Erro na ingestão CSV: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def generate_xsd_schema(self, xml_id, target_namespace="http://kaggle-data.local", transfer=None):
         """Gera schema XSD a partir de XML armazenado"""
         try:
-            # Recuperar XML
-            xml_result = self.retrieve_xml(xml_id)
+            _check_transfer(transfer)
+            
+            # Recuperar XML e gerar XSD
+            xml_result, outcome = self._run_on_source('generate_xsd_from_xml', xml_id, target_namespace)
             if not xml_result["success"]:
                 return xml_result
-            
-            xml_content = xml_result["data"]["content"]
-            
-            # Gerar XSD
-            success, result = self.xml_converter.generate_xsd_from_xml(xml_content, target_namespace)
+            success, result = outcome
             
             if success:
                 # Log da conversão
@@ -251,7 +752,7 @@ class XMLRPCServerHandler:
                 
                 return {
                     "success": True,
-                    "xsd_content": result,
+                    "xsd_content": _encode_payload(result, transfer),
                     "message": "Schema XSD gerado com sucesso"
                 }
             else:
@@ -262,23 +763,52 @@ class XMLRPCServerHandler:
                     "success": False,
                     "error": f"Erro na geração XSD: {result}"
                 }
-                
+        
         except Exception as e:
             logger.error(f"Erro no processo de geração XSD: {e}")
             return {"success": False, "error": str(e)}
     
+    def describe_xml(self, xml_id):
+        """Descreve a estrutura de um documento XML (caminhos, ocorrências e atributos)"""
+        try:
+            summary_result = self._retrieve_summary(xml_id)
+            if not summary_result["success"]:
+                return summary_result
+            
+            document = summary_result["data"]
+            summary = document.get("path_summary")
+            if not summary:
+                return {"success": False, "error": "Resumo estrutural indisponível (XML mal formado)"}
+            
+            return {
+                "success": True,
+                "data": {
+                    "xml_id": document["_id"],
+                    "filename": document.get("filename", ""),
+                    "size": document.get("size", 0),
+                    "element_count": summary["element_count"],
+                    "max_depth": summary["max_depth"],
+                    "truncated": summary["truncated"],
+                    "paths": summary["paths"]
+                }
+            }
+        
+        except Exception as e:
+            logger.error(f"Erro ao descrever XML: {e}")
+            return {"success": False, "error": str(e)}
+    
     def query_xml_xpath(self, xml_id, xpath_expression):
         """Executa consulta XPath sobre XML armazenado"""
         try:
-            # Recuperar XML
-            xml_result = self.retrieve_xml(xml_id)
-            if not xml_result["success"]:
-                return xml_result
-            
-            xml_content = xml_result["data"]["content"]
+            # Expressão inválida é rejeitada sem ler o documento
+            success, result = self.xml_converter.check_xpath(xpath_expression)
             
-            # Executar XPath
-            success, result = self.xml_converter.query_xml_xpath(xml_content, xpath_expression)
+            if success:
+                # Recuperar XML e executar XPath (ou responder pelo resumo estrutural)
+                xml_result, outcome = self._run_on_source('query_xml_xpath', xml_id, xpath_expression)
+                if not xml_result["success"]:
+                    return xml_result
+                success, result = outcome
             
             if success:
                 # Log da consulta
@@ -297,7 +827,7 @@ class XMLRPCServerHandler:
                     "success": False,
                     "error": f"Erro na consulta XPath: {result}"
                 }
-                
+        
         except Exception as e:
             logger.error(f"Erro no processo de consulta XPath: {e}")
             return {"success": False, "error": str(e)}
@@ -305,15 +835,11 @@ class XMLRPCServerHandler:
     def query_xml_xquery(self, xml_id, xquery_expression):
         """Executa consulta XQuery sobre XML armazenado"""
         try:
-            # Recuperar XML
-            xml_result = self.retrieve_xml(xml_id)
+            # Recuperar XML e executar XQuery
+            xml_result, outcome = self._run_on_source('query_xml_xquery', xml_id, xquery_expression)
             if not xml_result["success"]:
                 return xml_result
-            
-            xml_content = xml_result["data"]["content"]
-            
-            # Executar XQuery
-            success, result = self.xml_converter.query_xml_xquery(xml_content, xquery_expression)
+            success, result = outcome
             
             if success:
                 # Log da consulta
@@ -332,54 +858,151 @@ class XMLRPCServerHandler:
                     "success": False,
                     "error": f"Erro na consulta XQuery: {result}"
                 }
-                
+        
         except Exception as e:
             logger.error(f"Erro no processo de consulta XQuery: {e}")
             return {"success": False, "error": str(e)}
     
+    def submit_job(self, job_type, params=None, csv_content=None, transfer=None):
+        """Cria um trabalho assíncrono (csv_to_xml com o CSV em csv_content, ou validate_xml) - devolve o job_id
+        
+        params: filename, root_element, row_element (csv_to_xml); xml_ids, schema_filename (validate_xml)
+        """
+        try:
+            params = dict(params or {})
+            if params.get('schema_filename'):
+                params['schema_path'] = os.path.join(self.xml_converter.xml_schemas_path, params['schema_filename'])
+            
+            chunks = ()
+            if csv_content:
+                chunks = (_decode_payload(csv_content, transfer).encode('utf-8'),)
+            job_id = self.core.submit_job(job_type, params, chunks)
+            
+            return {"success": True, "job_id": job_id, "message": "Trabalho criado"}
+        
+        except ServiceError as e:
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Erro ao criar trabalho: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def get_job_status(self, job_id):
+        """Estado, progresso (processed/total, eta_seconds) e resultado de um trabalho"""
+        try:
+            return dict(self.core.job_status(job_id), success=True)
+        
+        except ServiceError as e:
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Erro ao obter estado do trabalho: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _run_on_source(self, method, xml_id, *args):
+        """Recupera o documento e executa converter.<method> sobre ele - devolve (resultado da recuperação, (success, result))
+        
+        Pedidos concorrentes idênticos partilham a recuperação, o parsing e o resultado (XMLServiceCore).
+        """
+        if not self.db:
+            return {"success": False, "error": "Conexão com base de dados não disponível"}, None
+        
+        outcome = self.core.run_on_document(method, xml_id, *args)
+        if outcome is None:
+            return {"success": False, "error": f"XML com ID {xml_id} não encontrado"}, None
+        return {"success": True}, outcome
+    
+    def _retrieve_summary(self, xml_id):
+        """Recupera os metadados e o resumo estrutural do documento, sem o conteúdo"""
+        try:
+            if not self.db:
+                return {"success": False, "error": "Conexão com base de dados não disponível"}
+            
+            document = self.db.retrieve_path_summary(xml_id)
+            
+            if document is None:
+                return {"success": False, "error": f"XML com ID {xml_id} não encontrado"}
+            
+            return {"success": True, "data": document}
+        
+        except Exception as e:
+            logger.error(f"Erro ao recuperar resumo estrutural: {e}")
+            return {"success": False, "error": str(e)}
+    
     def _log_conversion(self, xml_data_id, conversion_type, status, error_message=None):
         """Registra log de conversão no MongoDB"""
         try:
-            if self.db:
-                self.db.log_conversion(xml_data_id, conversion_type, status, error_message)
-                
+            self.core.log_conversion(xml_data_id, conversion_type, status, error_message)
+        
         except Exception as e:
             logger.error(f"Erro ao registrar log: {e}")
 
-def create_server():
-    """Cria e configura o servidor XML-RPC"""
+def create_server(core=None, admission=None):
+    """Cria e configura o servidor XML-RPC
+    
+    Com core, o handler usa esse núcleo (partilhado com outro front-end); com
+    admission, os métodos ficam sujeitos a esse controlo de admissão.
+    """
     server_host = "0.0.0.0"
-    server_port = 8000
+    server_port = XMLRPC_PORT
     
-    server = SimpleXMLRPCServer((server_host, server_port), allow_none=True)
+    if XMLRPC_WORKERS > 0:
+        server = PooledXMLRPCServer((server_host, server_port), allow_none=True)
+        logger.info(f"Servidor concorrente: {XMLRPC_WORKERS} threads, keep-alive {XMLRPC_KEEPALIVE_TIMEOUT}s")
+    else:
+        server = SimpleXMLRPCServer((server_host, server_port), requestHandler=GzipRequestHandler, allow_none=True)
     server.register_introspection_functions()
+    # system.multicall: várias chamadas num só pedido HTTP
+    server.register_multicall_functions()
     
     # Registrar handler
-    handler = XMLRPCServerHandler()
+    handler = XMLRPCServerHandler(core)
+    
+    def register(function, name):
+        method_class = XMLRPC_METHOD_CLASSES.get(name)
+        if admission and method_class:
+            function = _admitted(function, method_class, admission)
+        server.register_function(function, name)
     
     # Registrar métodos
-    server.register_function(handler.ping, "ping")
-    server.register_function(handler.get_server_status, "get_server_status")
-    server.register_function(handler.store_xml, "store_xml")
-    server.register_function(handler.retrieve_xml, "retrieve_xml")
-    server.register_function(handler.list_xml_files, "list_xml_files")
-    server.register_function(handler.convert_xml_to_json, "convert_xml_to_json")
-    server.register_function(handler.convert_json_to_xml, "convert_json_to_xml")
-    server.register_function(handler.validate_xml_content, "validate_xml_content")
+    register(handler.ping, "ping")
+    register(handler.ready, "ready")
+    register(handler.get_server_status, "get_server_status")
+    register(handler.store_xml, "store_xml")
+    register(handler.store_xml_batch, "store_xml_batch")
+    register(handler.retrieve_xml, "retrieve_xml")
+    register(handler.update_xml, "update_xml")
+    register(handler.retrieve_xml_version, "retrieve_xml_version")
+    register(handler.list_xml_versions, "list_xml_versions")
+    register(handler.list_xml_files, "list_xml_files")
+    register(handler.convert_xml_to_json, "convert_xml_to_json")
+    register(handler.convert_json_to_xml, "convert_json_to_xml")
+    register(handler.validate_xml_content, "validate_xml_content")
     # Novos métodos do pipeline completo
-    server.register_function(handler.convert_csv_to_xml, "convert_csv_to_xml")
-    server.register_function(handler.generate_xsd_schema, "generate_xsd_schema")
-    server.register_function(handler.query_xml_xpath, "query_xml_xpath")
-    server.register_function(handler.query_xml_xquery, "query_xml_xquery")
+    register(handler.convert_csv_to_xml, "convert_csv_to_xml")
+    register(handler.generate_xsd_schema, "generate_xsd_schema")
+    register(handler.ingest_csv, "ingest_csv")
+    register(handler.describe_xml, "describe_xml")
+    register(handler.query_xml_xpath, "query_xml_xpath")
+    register(handler.query_xml_xquery, "query_xml_xquery")
+    register(handler.submit_job, "submit_job")
+    register(handler.get_job_status, "get_job_status")
+    
+    # Guardado para permitir encerrar a conexão no fim
+    server.handler = handler
     
     return server
 
 if __name__ == "__main__":
     logger.info("Iniciando servidor XML-RPC...")
     
-    server = create_server()
+    server = create_server(admission=AdmissionController() if ADMISSION_ENABLED else None)
+    
+    # SIGTERM (docker stop) termina o servidor como um Ctrl+C
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    
+    signal.signal(signal.SIGTERM, handle_sigterm)
     
-    logger.info("Servidor XML-RPC iniciado em http://0.0.0.0:8000")
+    logger.info(f"Servidor XML-RPC iniciado em http://0.0.0.0:{XMLRPC_PORT}")
     logger.info("Pressione Ctrl+C para parar o servidor")
     
     try:
@@ -389,4 +1012,7 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Erro no servidor: {e}")
     finally:
+        # Espera pelos pedidos em curso antes de fechar a base de dados
+        server.server_close()
+        server.handler.close()
         logger.info("Servidor XML-RPC parado")
\ No newline at end of file
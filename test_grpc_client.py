@@ -87,7 +87,7 @@ def test_grpc_server():
         
         # 6. Testar listagem de XMLs
         print("6. Testando listagem de XMLs...")
-        list_response = stub.ListXMLs(pb2.Empty())
+        list_response = stub.ListXMLs(pb2.ListXMLsRequest(include_count=True))
         print(f"   Sucesso: {list_response.success}")
         print(f"   Total de XMLs: {list_response.count}")
         for i, file_info in enumerate(list_response.files[:3], 1):